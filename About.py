@@ -1,6 +1,6 @@
 # app.py
 import streamlit as st
-from utils import get_data # Menggunakan fungsi terpusat
+from utils import get_data, prewarm_models, show_diagnostics # Menggunakan fungsi terpusat
 
 # --- KONFIGURASI HALAMAN ---
 # Dijalankan pertama kali untuk mengatur tab browser dan layout
@@ -10,11 +10,20 @@ st.set_page_config(
     layout="wide",
 )
 
+# --- DIAGNOSTIK (TERSEMBUNYI) ---
+# Dibuka lewat URL ?diagnostik=1; tidak tampil di navigasi
+if st.query_params.get("diagnostik") == "1":
+    show_diagnostics()
+    st.stop()
+
 # --- MEMUAT DATA ---
-# Memanggil get_data() akan memastikan data dimuat ke session_state
+# Memanggil get_data() akan memastikan data dimuat (sekali per proses)
 # saat aplikasi pertama kali dijalankan.
 df = get_data()
 
+# Opsional (PREWARM_MODEL=1): model demo mulai dimuat di latar belakang sekarang
+prewarm_models()
+
 # --- KONTEN HALAMAN ---
 st.title("Selamat Datang di SentimenSignal Dashboard 👋")
 st.markdown("Platform untuk menganalisis sentimen dan mengekstrak topik utama dari ulasan pengguna secara otomatis.")
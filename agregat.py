@@ -0,0 +1,138 @@
+# agregat.py
+"""
+Kubus agregat jumlah ulasan: sentimen x topik x bucket skor kepercayaan.
+
+Kubus dibangun sekali per versi dataset, lalu halaman-halaman dashboard
+cukup membaca jumlah dari kubus ini (O(topik)) alih-alih menjalankan
+value_counts atas seluruh baris (O(baris)) pada setiap rerun.
+"""
+
+import numpy as np
+import pandas as pd
+
+JUMLAH_BUCKET_DEFAULT = 10
+
+class KubusAgregat:
+    """
+    Tensor jumlah berdimensi (sentimen, topik, bucket_keyakinan).
+
+    Urutan sentimen dan topik mengikuti urutan kemunculan pertama di dataset,
+    sama seperti Series.unique().
+    """
+
+    def __init__(self, sentimen, topik, batas_bucket, jumlah):
+        self.sentimen = list(sentimen)
+        self.topik = list(topik)
+        self.batas_bucket = np.asarray(batas_bucket, dtype=np.float64)
+        self.jumlah = np.asarray(jumlah, dtype=np.int64)
+
+    @classmethod
+    def dari_dataframe(cls, df, jumlah_bucket=JUMLAH_BUCKET_DEFAULT):
+        batas_bucket = np.linspace(0.0, 1.0, jumlah_bucket + 1)
+        kubus = cls([], [], batas_bucket, np.zeros((0, 0, jumlah_bucket)))
+        kubus.tambah(df)
+        return kubus
+
+    def salin(self):
+        """Salinan kubus; menambah baris ke salinan tidak mengubah kubus asal."""
+        return KubusAgregat(self.sentimen, self.topik, self.batas_bucket, self.jumlah.copy())
+
+    def _kode(self, nilai, daftar):
+        """Kode integer setiap nilai terhadap `daftar`; nilai baru ditambahkan ke akhir daftar."""
+        kode, unik = pd.factorize(nilai, use_na_sentinel=True)
+        posisi = {label: i for i, label in enumerate(daftar)}
+        for label in unik:
+            if label not in posisi:
+                posisi[label] = len(daftar)
+                daftar.append(label)
+        peta = np.array([posisi[label] for label in unik] + [-1], dtype=np.int64)
+        return peta[kode]  # kode -1 (NaN) dipetakan ke elemen terakhir, yaitu -1
+
+    def tambah(self, df):
+        """Menambahkan jumlah dari baris-baris `df` ke kubus (in place)."""
+        kode_sentimen = self._kode(df['sentimen'], self.sentimen)
+        kode_topik = self._kode(df['deskripsi_topik'], self.topik)
+        jumlah_bucket = len(self.batas_bucket) - 1
+        if 'confidence_score' in df.columns:
+            skor = df['confidence_score'].to_numpy(dtype=np.float64, na_value=0.0)
+            kode_bucket = np.clip(np.searchsorted(self.batas_bucket, skor, side='right') - 1, 0, jumlah_bucket - 1)
+        else:
+            kode_bucket = np.zeros(len(df), dtype=np.int64)
+
+        # Perbesar tensor jika ada sentimen/topik baru
+        bentuk = (len(self.sentimen), len(self.topik), jumlah_bucket)
+        if self.jumlah.shape != bentuk:
+            jumlah = np.zeros(bentuk, dtype=np.int64)
+            jumlah[:self.jumlah.shape[0], :self.jumlah.shape[1]] = self.jumlah
+            self.jumlah = jumlah
+
+        valid = (kode_sentimen >= 0) & (kode_topik >= 0)
+        indeks = np.ravel_multi_index((kode_sentimen[valid], kode_topik[valid], kode_bucket[valid]), bentuk)
+        self.jumlah += np.bincount(indeks, minlength=self.jumlah.size).reshape(bentuk)
+        return self
+
+    @property
+    def total(self):
+        return int(self.jumlah.sum())
+
+    def jumlah_sentimen(self, topik=None):
+        """Jumlah ulasan per sentimen (opsional untuk satu topik), urut menurun seperti value_counts."""
+        jumlah = self.jumlah if topik is None else self.jumlah[:, [self.topik.index(topik)]]
+        hasil = pd.Series(jumlah.sum(axis=(1, 2)), index=pd.Index(self.sentimen, name='sentimen'), name='count')
+        return hasil[hasil > 0].sort_values(ascending=False, kind='stable')
+
+    def jumlah_topik(self, sentimen=None):
+        """Jumlah ulasan per topik (opsional untuk satu sentimen), urut menurun seperti value_counts."""
+        jumlah = self.jumlah if sentimen is None else self.jumlah[[self.sentimen.index(sentimen)]]
+        hasil = pd.Series(jumlah.sum(axis=(0, 2)), index=pd.Index(self.topik, name='deskripsi_topik'), name='count')
+        return hasil[hasil > 0].sort_values(ascending=False, kind='stable')
+
+    def jumlah_per_sentimen(self, sentimen):
+        """Jumlah ulasan untuk satu label sentimen (0 jika label tidak ada)."""
+        return int(self.jumlah[self.sentimen.index(sentimen)].sum()) if sentimen in self.sentimen else 0
+
+    def distribusi_keyakinan(self, sentimen=None):
+        """Jumlah ulasan per bucket skor kepercayaan (opsional untuk satu sentimen)."""
+        jumlah = self.jumlah if sentimen is None else self.jumlah[[self.sentimen.index(sentimen)]]
+        label = [f"{a:.1f}–{b:.1f}" for a, b in zip(self.batas_bucket[:-1], self.batas_bucket[1:])]
+        return pd.Series(jumlah.sum(axis=(0, 1)), index=pd.Index(label, name='bucket_keyakinan'), name='count')
+
+JUMLAH_BIN_SKOR = 50
+NAMA_KUANTIL = ['min', 'q1', 'median', 'q3', 'max']
+
+class RingkasanSkor:
+    """
+    Histogram dan ringkasan lima angka (min, q1, median, q3, max) skor
+    kepercayaan per sentimen.
+
+    Dihitung sekali per versi dataset sehingga grafik distribusi skor cukup
+    menerima jumlah per bin dan lima kuantil per sentimen; ukurannya tetap
+    berapa pun jumlah ulasannya. Urutan sentimen mengikuti kemunculan pertama.
+    """
+
+    def __init__(self, sentimen, batas_bin, jumlah, kuantil):
+        self.sentimen = list(sentimen)
+        self.batas_bin = np.asarray(batas_bin, dtype=np.float64)
+        self.jumlah = np.asarray(jumlah, dtype=np.int64)
+        self.kuantil = np.asarray(kuantil, dtype=np.float64)
+
+    @classmethod
+    def dari_dataframe(cls, df, jumlah_bin=JUMLAH_BIN_SKOR, kolom_skor='confidence_score'):
+        batas_bin = np.linspace(0.0, 1.0, jumlah_bin + 1)
+        kode, sentimen = pd.factorize(df['sentimen'])
+        skor = df[kolom_skor].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = (kode >= 0) & ~np.isnan(skor)
+        kode, skor = kode[valid], skor[valid]
+
+        kode_bin = np.clip(np.searchsorted(batas_bin, skor, side='right') - 1, 0, jumlah_bin - 1)
+        jumlah = np.bincount(kode * jumlah_bin + kode_bin, minlength=len(sentimen) * jumlah_bin)
+        kuantil = np.full((len(sentimen), len(NAMA_KUANTIL)), np.nan)
+        for i in range(len(sentimen)):
+            skor_sentimen = skor[kode == i]
+            if len(skor_sentimen):
+                kuantil[i] = np.quantile(skor_sentimen, [0.0, 0.25, 0.5, 0.75, 1.0])
+        return cls(sentimen, batas_bin, jumlah.reshape(len(sentimen), jumlah_bin), kuantil)
+
+    def tabel_kuantil(self):
+        """DataFrame sentimen x (min, q1, median, q3, max)."""
+        return pd.DataFrame(self.kuantil, index=pd.Index(self.sentimen, name='sentimen'), columns=NAMA_KUANTIL)
@@ -0,0 +1,227 @@
+# aspek.py
+"""
+Penilaian per pecahan kalimat dan ringkasan aspek per ulasan.
+
+Setiap ulasan dipecah menjadi pecahan kalimat dengan aturan yang mendekati
+kolom pecahan_kalimat pada CSV hasil analisis (sama persis untuk 4.948 dari
+4.966 ulasan di hasil_terstruktur_diperbaiki.csv; sisanya berbeda karena
+heuristik singkatan dan angka pada pemecah kalimat aslinya). Semua pecahan dari satu batch ulasan dipra-proses
+sekali lalu dinilai bersama: satu pemanggilan LSTM per `ukuran_batch` pecahan
+dan satu inferensi LDA batch. Hasilnya diringkas per id_ulasan menjadi
+sentimen dominan, proporsi sentimen, dan daftar topik (aspek) beserta
+sentimennya, dengan operasi groupby/bincount tanpa loop per ulasan.
+
+    python aspek.py ulasan.csv -o hasil_terstruktur.csv --ringkasan ringkasan_ulasan.csv
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from prediksi import TOPIK_TIDAK_RELEVAN
+
+# Kalimat berakhir setelah deretan titik, kecuali satu titik yang langsung
+# diikuti huruf/angka (mis. '20.000', 'stnk.nya'). '?' dan '!' bukan akhir kalimat.
+POLA_AKHIR_KALIMAT = r'(?:(?<=\.\.)|(?<=\.)(?![A-Za-z0-9]))(?!\.)\s*'
+# Karakter selain huruf/angka ASCII dan titik diganti spasi; deretan titik menjadi satu
+POLA_BUKAN_KATA = r'[^A-Za-z0-9\s.]+'
+POLA_DERET_TITIK = r'\.+'
+URUTAN_SENTIMEN = ['Positif', 'Netral', 'Negatif']
+POLARITAS_SENTIMEN = {'Positif': 1.0, 'Netral': 0.0, 'Negatif': -1.0}
+UKURAN_BATCH_ULASAN = 1000
+# Urutan kolom CSV hasil analisis dashboard; kolom tambahan ditulis sesudahnya
+KOLOM_DASHBOARD = ['id', 'id_ulasan', 'ulasan_lengkap', 'pecahan_kalimat', 'deskripsi_topik',
+                   'detail_topik', 'sentimen', 'skor_sentimen']
+
+def pecah_kalimat(teks):
+    """Daftar pecahan kalimat dari satu ulasan."""
+    return pecah_dataframe(pd.DataFrame({'id_ulasan': [0], 'ulasan_lengkap': [teks]}))['pecahan_kalimat'].tolist()
+
+def pecah_dataframe(df, kolom_id='id_ulasan', kolom_teks='ulasan_lengkap'):
+    """
+    Satu baris per pecahan kalimat dengan kolom id_ulasan, ulasan_lengkap,
+    pecahan_kalimat, dan urutan_pecahan (0, 1, ...). Titik penutup kalimat
+    tetap ada di pecahannya (deretan titik menjadi satu). Ulasan kosong tidak
+    menghasilkan baris.
+    """
+    teks = df[kolom_teks].fillna('').astype(str)
+    bagian = teks.str.split(POLA_AKHIR_KALIMAT, regex=True)
+    jumlah_bagian = bagian.str.len().to_numpy()
+    hasil = pd.DataFrame({
+        'id_ulasan': np.repeat(df[kolom_id].to_numpy(), jumlah_bagian),
+        'ulasan_lengkap': np.repeat(teks.to_numpy(), jumlah_bagian),
+        'pecahan_kalimat': bagian.explode().to_numpy(),
+    })
+
+    pecahan = (hasil['pecahan_kalimat'].str.replace(POLA_BUKAN_KATA, ' ', regex=True)
+               .str.replace(POLA_DERET_TITIK, '.', regex=True).str.split().str.join(' '))
+    hasil['pecahan_kalimat'] = pecahan
+    hasil = hasil[pecahan.to_numpy() != ''].reset_index(drop=True)
+    hasil['urutan_pecahan'] = hasil.groupby('id_ulasan', sort=False).cumcount()
+    return hasil
+
+# ==============================================================================
+# PENILAIAN PECAHAN
+# ==============================================================================
+
+def nilai_pecahan(df_pecahan, model_sentimen, model_lda, aset_prep, ukuran_batch=None, cache=None):
+    """
+    Menilai sentimen dan topik setiap pecahan kalimat. Pra-pemrosesan dilakukan
+    sekali untuk kedua model. Menambahkan kolom sentimen, skor_sentimen,
+    deskripsi_topik, detail_topik, dan probabilitas_topik.
+    """
+    import prediksi
+
+    ukuran_batch = ukuran_batch or prediksi.UKURAN_BATCH_DEFAULT
+    model, tokenizer, label_encoder = model_sentimen
+    lda, dictionary = model_lda
+    hasil_prep = aset_prep.pipeline.proses_batch(df_pecahan['pecahan_kalimat'].tolist())
+
+    teks_lstm = [p.teks_lstm for p in hasil_prep]
+    sentimen = []
+    for i in range(0, len(teks_lstm), ukuran_batch):
+        sentimen.extend(prediksi.prediksi_sentimen_teks_bersih(teks_lstm[i:i + ukuran_batch], model, tokenizer,
+                                                               label_encoder, ukuran_batch, cache))
+    topik = prediksi.prediksi_topik_token([p.token_lda for p in hasil_prep], lda, dictionary,
+                                          aset_prep.label_topik, cache)
+
+    df = df_pecahan.copy()
+    df['sentimen'] = [label for label, _ in sentimen]
+    df['skor_sentimen'] = np.round([skor for _, skor in sentimen], 3)
+    df['deskripsi_topik'] = [deskripsi for deskripsi, _, _ in topik]
+    df['detail_topik'] = [detail for _, detail, _ in topik]
+    df['probabilitas_topik'] = np.round([p for _, _, p in topik], 3)
+    return df
+
+# ==============================================================================
+# RINGKASAN PER ULASAN
+# ==============================================================================
+
+def _label_dominan(kode_grup, jumlah_grup, kode_label, jumlah_label, bobot):
+    """
+    Kode label terbanyak untuk setiap grup; jika jumlahnya sama, label dengan
+    total `bobot` terbesar, lalu urutan kode label. Mengembalikan (kode label, matriks jumlah grup x label).
+    """
+    indeks = kode_grup * jumlah_label + kode_label
+    jumlah = np.bincount(indeks, minlength=jumlah_grup * jumlah_label).reshape(jumlah_grup, jumlah_label)
+    total_bobot = np.bincount(indeks, weights=bobot, minlength=jumlah_grup * jumlah_label).reshape(jumlah_grup, jumlah_label)
+    # Total bobot per sel tidak pernah melebihi jumlahnya (bobot <= 1), sehingga hanya memutus seri
+    skala = jumlah.max() + 1 if jumlah.size else 1
+    return (jumlah * skala + np.minimum(total_bobot, skala - 1)).argmax(axis=1), jumlah
+
+def _kode_sentimen(sentimen):
+    label = URUTAN_SENTIMEN + [s for s in pd.unique(sentimen) if s not in URUTAN_SENTIMEN]
+    return pd.Categorical(sentimen, categories=label).codes.astype(np.int64), label
+
+def ringkasan_aspek(df_nilai):
+    """
+    Satu baris per (id_ulasan, topik) relevan: jumlah pecahan, sentimen dominan
+    aspek tersebut, skor sentimen rata-rata, dan polaritas rata-rata
+    (Positif = 1, Netral = 0, Negatif = -1).
+    """
+    relevan = df_nilai[df_nilai['deskripsi_topik'] != TOPIK_TIDAK_RELEVAN]
+    kode_aspek, aspek = pd.factorize(pd.MultiIndex.from_arrays([relevan['id_ulasan'], relevan['deskripsi_topik']]))
+    kode_sentimen, label = _kode_sentimen(relevan['sentimen'])
+    skor = relevan['skor_sentimen'].to_numpy(dtype=np.float64)
+    dominan, jumlah = _label_dominan(kode_aspek, len(aspek), kode_sentimen, len(label), skor)
+
+    jumlah_pecahan = jumlah.sum(axis=1)
+    polaritas = np.array([POLARITAS_SENTIMEN.get(s, 0.0) for s in label])
+    return pd.DataFrame({
+        'id_ulasan': aspek.get_level_values(0),
+        'deskripsi_topik': aspek.get_level_values(1),
+        'jumlah_pecahan': jumlah_pecahan,
+        # dtype str juga saat kosong, agar dapat digabung dengan deskripsi_topik
+        'sentimen': pd.Series(np.asarray(label, dtype=object)[dominan], dtype=str),
+        'skor_sentimen': np.round(np.bincount(kode_aspek, weights=skor, minlength=len(aspek)) / np.maximum(jumlah_pecahan, 1), 3),
+        'polaritas': np.round(jumlah @ polaritas / np.maximum(jumlah_pecahan, 1), 3),
+    })
+
+def ringkasan_ulasan(df_nilai):
+    """
+    Satu baris per id_ulasan: jumlah pecahan, sentimen dominan, proporsi setiap
+    sentimen, polaritas, topik utama, jumlah topik, dan kolom 'aspek' berupa
+    "topik (sentimen); ..." untuk setiap topik relevan dalam ulasan tersebut.
+    """
+    kode_ulasan, id_ulasan = pd.factorize(df_nilai['id_ulasan'])
+    kode_sentimen, label = _kode_sentimen(df_nilai['sentimen'])
+    skor = df_nilai['skor_sentimen'].to_numpy(dtype=np.float64)
+    dominan, jumlah = _label_dominan(kode_ulasan, len(id_ulasan), kode_sentimen, len(label), skor)
+    jumlah_pecahan = jumlah.sum(axis=1)
+
+    hasil = pd.DataFrame({
+        'id_ulasan': id_ulasan,
+        'ulasan_lengkap': df_nilai['ulasan_lengkap'].to_numpy()[np.unique(kode_ulasan, return_index=True)[1]],
+        'jumlah_pecahan': jumlah_pecahan,
+        'sentimen_dominan': np.asarray(label, dtype=object)[dominan],
+    })
+    for i, s in enumerate(label):
+        hasil[f'proporsi_{s.lower()}'] = np.round(jumlah[:, i] / jumlah_pecahan, 3)
+    polaritas = np.array([POLARITAS_SENTIMEN.get(s, 0.0) for s in label])
+    hasil['polaritas'] = np.round(jumlah @ polaritas / jumlah_pecahan, 3)
+
+    # Topik: aspek diurutkan menurut jumlah pecahan, lalu kemunculan pertama
+    aspek = ringkasan_aspek(df_nilai)
+    aspek = aspek.sort_values(['id_ulasan', 'jumlah_pecahan'], ascending=[True, False], kind='stable')
+    per_ulasan = aspek.groupby('id_ulasan', sort=False)
+    utama = per_ulasan['deskripsi_topik'].first()
+    teks_aspek = (aspek['deskripsi_topik'] + ' (' + aspek['sentimen'] + ')').groupby(aspek['id_ulasan'], sort=False).agg('; '.join)
+    hasil['topik_utama'] = hasil['id_ulasan'].map(utama).fillna(TOPIK_TIDAK_RELEVAN)
+    hasil['jumlah_topik'] = hasil['id_ulasan'].map(per_ulasan.size()).fillna(0).astype(np.int64)
+    hasil['aspek'] = hasil['id_ulasan'].map(teks_aspek).fillna('')
+    return hasil
+
+# ==============================================================================
+# PIPELINE CSV
+# ==============================================================================
+
+def nilai_ulasan_dataframe(df, model_sentimen, model_lda, aset_prep, ukuran_batch=None, cache=None):
+    """Memecah, menilai, dan meringkas ulasan. Mengembalikan (df_pecahan_dinilai, df_ringkasan)."""
+    df_nilai = nilai_pecahan(pecah_dataframe(df), model_sentimen, model_lda, aset_prep, ukuran_batch, cache)
+    return df_nilai, ringkasan_ulasan(df_nilai)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Memecah ulasan menjadi kalimat, menilai setiap pecahan, lalu meringkas aspek per ulasan.")
+    parser.add_argument("input", help="CSV berisi kolom ulasan_lengkap (dan opsional id_ulasan).")
+    parser.add_argument("-o", "--output", help="CSV per pecahan kalimat (default: <input>_pecahan.csv).")
+    parser.add_argument("--ringkasan", help="CSV ringkasan per ulasan (default: <input>_ringkasan.csv).")
+    parser.add_argument("--ukuran-batch", type=int, default=None, help="Jumlah pecahan per pemanggilan LSTM.")
+    parser.add_argument("--ukuran-chunk", type=int, default=UKURAN_BATCH_ULASAN, help="Jumlah ulasan per batch.")
+    parser.add_argument("--tanpa-cache", action="store_true",
+                        help="Nilai semua pecahan dengan model tanpa memakai cache hasil prediksi.")
+    args = parser.parse_args(argv)
+
+    import prediksi
+
+    dasar = os.path.splitext(args.input)[0]
+    path_output = args.output or f"{dasar}_pecahan.csv"
+    path_ringkasan = args.ringkasan or f"{dasar}_ringkasan.csv"
+    aset_prep = prediksi.muat_aset_pra_pemrosesan()
+    model_sentimen = prediksi.muat_model_sentimen()
+    model_lda = prediksi.muat_model_lda()
+    cache = None if args.tanpa_cache else prediksi.cache_prediksi()
+
+    mulai = time.perf_counter()
+    jumlah_ulasan = jumlah_pecahan = 0
+    for i, chunk in enumerate(pd.read_csv(args.input, chunksize=args.ukuran_chunk)):
+        if 'id_ulasan' not in chunk.columns:
+            chunk['id_ulasan'] = np.arange(jumlah_ulasan + 1, jumlah_ulasan + len(chunk) + 1)
+        df_nilai, ringkasan = nilai_ulasan_dataframe(chunk, model_sentimen, model_lda, aset_prep,
+                                                     args.ukuran_batch, cache)
+        df_nilai.insert(0, 'id', np.arange(jumlah_pecahan + 1, jumlah_pecahan + len(df_nilai) + 1))
+        df_nilai = df_nilai[KOLOM_DASHBOARD + [k for k in df_nilai.columns if k not in KOLOM_DASHBOARD]]
+        df_nilai.to_csv(path_output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        ringkasan.to_csv(path_ringkasan, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        jumlah_ulasan += len(chunk)
+        jumlah_pecahan += len(df_nilai)
+        print(f"{jumlah_ulasan:,} ulasan ({jumlah_pecahan:,} pecahan) dinilai "
+              f"({jumlah_ulasan / (time.perf_counter() - mulai):,.1f} ulasan/detik)", file=sys.stderr)
+    print(f"Pecahan: {path_output}\nRingkasan: {path_ringkasan}")
+
+if __name__ == "__main__":
+    main()
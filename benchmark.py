@@ -0,0 +1,358 @@
+# benchmark.py
+"""
+Benchmark tahap-tahap utama aplikasi: pemuatan data, pra-pemrosesan,
+inferensi model, agregat dashboard, dan pencarian.
+
+Berjalan offline atas hasil_terstruktur_diperbaiki.csv dan korpus sintetis
+yang diperbesar (mis. 10x, 100x, 1000x). Setiap baris sintetis adalah baris
+asli dengan beberapa kata acak dari kosakata korpus ditambahkan, sehingga
+teksnya tidak identik dengan aslinya. Tahap model (normalisasi sampai LDA)
+dijalankan atas paling banyak `--maks-baris-model` baris per skala; tahap
+data (muat, agregat, cari) atas seluruh baris.
+
+    python benchmark.py                               # skala 1, 10, 100
+    python benchmark.py --skala 1 10 100 1000
+    python benchmark.py --simpan-baseline             # simpan hasil sebagai baseline
+    python benchmark.py --bandingkan                  # bandingkan dengan baseline
+
+Hasil ditulis sebagai JSON. Dengan --bandingkan, proses keluar dengan kode 1
+jika ada tahap yang lebih lambat dari baseline melebihi toleransi.
+
+Baseline tidak disertakan di repositori karena waktu eksekusi bergantung pada
+mesin. Buat sekali di mesin yang sama sebelum memakai --bandingkan, misalnya
+dari commit acuan:
+
+    python benchmark.py --simpan-baseline             # menulis assets/benchmark/baseline.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from berkas import tulis_atomik
+
+DIR_BENCHMARK = "assets/benchmark"
+PATH_HASIL_BENCHMARK = os.path.join(DIR_BENCHMARK, "hasil_terakhir.json")
+PATH_BASELINE_BENCHMARK = os.path.join(DIR_BENCHMARK, "baseline.json")
+SKALA_DEFAULT = [1, 10, 100]
+MAKS_BARIS_MODEL = 20000
+ULANG_DEFAULT = 3
+TOLERANSI_REGRESI = 0.25
+# Selisih di bawah ambang ini (detik) dianggap derau pengukuran, bukan regresi
+AMBANG_REGRESI_DETIK = 0.005
+KATA_TAMBAHAN_SINTETIS = 2
+KUERI_CARI = ['pajak', 'stnk', 'bayar pajak', 'lama', 'samsat online', 'apl']
+VERSI_FORMAT = 1
+
+TAHAP = ['muat_csv', 'muat_parquet', 'normalisasi', 'stem', 'tokenisasi', 'lstm', 'doc2bow', 'lda',
+         'agregat', 'indeks_cari', 'cari']
+
+# ==============================================================================
+# KORPUS SINTETIS
+# ==============================================================================
+
+def korpus_sintetis(df, skala, seed=0):
+    """
+    Korpus `skala` kali lebih besar dari `df`. Salinan pertama identik dengan
+    `df`; salinan berikutnya mendapat id baru dan beberapa kata acak tambahan
+    pada ulasan_lengkap dan pecahan_kalimat.
+    """
+    if skala <= 1:
+        return df.reset_index(drop=True)
+    rng = np.random.default_rng(seed)
+    kosakata = np.unique(np.concatenate(
+        df['pecahan_kalimat'].fillna('').astype(str).str.lower().str.split().to_numpy()))
+    n = len(df)
+    hasil = pd.concat([df] * skala, ignore_index=True)
+    salinan = np.repeat(np.arange(skala), n)
+    tambahan = salinan > 0
+
+    if 'id' in hasil.columns:
+        hasil['id'] = np.arange(1, len(hasil) + 1)
+    if 'id_ulasan' in hasil.columns:
+        hasil['id_ulasan'] = hasil['id_ulasan'].to_numpy() + salinan * (int(df['id_ulasan'].max()) + 1)
+    for kolom in ('ulasan_lengkap', 'pecahan_kalimat'):
+        if kolom not in hasil.columns:
+            continue
+        teks = hasil.loc[tambahan, kolom].fillna('').astype(str)
+        for _ in range(KATA_TAMBAHAN_SINTETIS):
+            teks = teks + ' ' + kosakata[rng.integers(0, len(kosakata), len(teks))]
+        hasil.loc[tambahan, kolom] = teks
+    return hasil
+
+# ==============================================================================
+# PENGUKURAN
+# ==============================================================================
+
+def _ukur(fungsi, ulang):
+    """Menjalankan `fungsi` sebanyak `ulang` kali. Mengembalikan (daftar durasi, hasil terakhir)."""
+    durasi = []
+    hasil = None
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        hasil = fungsi()
+        durasi.append(time.perf_counter() - mulai)
+    return durasi, hasil
+
+def _ringkas(durasi, baris):
+    median = statistics.median(durasi)
+    return {'baris': baris, 'detik_min': min(durasi), 'detik_median': median,
+            'baris_per_detik': baris / median if median else None}
+
+class AsetBenchmark:
+    """Aset model yang dimuat sekali; aset yang gagal dimuat dicatat dan tahapnya dilewati."""
+
+    def __init__(self, backend_sentimen=None):
+        import prediksi
+
+        self.prediksi = prediksi
+        self.galat = {}
+        self.aset_prep = prediksi.muat_aset_pra_pemrosesan()
+        self.enkoder = self._coba('tokenisasi', prediksi.muat_enkoder_teks)
+        self.model_sentimen = self._coba('lstm', lambda: prediksi.muat_model_sentimen(backend_sentimen))
+        self.model_lda = self._coba('lda', prediksi.muat_model_lda)
+        if self.model_lda is None:
+            self.galat['doc2bow'] = self.galat['lda']
+
+    def _coba(self, tahap, fungsi):
+        try:
+            return fungsi()
+        except Exception as e:
+            self.galat[tahap] = f"{type(e).__name__}: {e}"
+            return None
+
+    def pipeline_baru(self):
+        """Pipeline dengan cache stem kosong (tanpa cache disk), agar setiap ulangan diukur dari kondisi dingin."""
+        from pra_pemrosesan import PipelinePraPemrosesan
+
+        p = self.aset_prep.pipeline
+        return PipelinePraPemrosesan(p.stemmer, p.stopword_remover, p.kamus_norm, self.aset_prep.custom_stopwords)
+
+def _tahap_model(aset, teks, ulang, ukuran_batch, ukuran_batch_lda):
+    """Tahap normalisasi sampai LDA atas `teks`. Mengembalikan {tahap: ringkasan}."""
+    prediksi = aset.prediksi
+    n = len(teks)
+    hasil = {}
+
+    durasi, token = _ukur(lambda: aset.pipeline_baru().normalisasi_batch(teks), ulang)
+    hasil['normalisasi'] = _ringkas(durasi, n)
+
+    def stem():
+        pipeline = aset.pipeline_baru()
+        return [pipeline.untuk_lstm(t) for t in token], [pipeline.untuk_lda(t) for t in token]
+    durasi, (teks_lstm, token_lda) = _ukur(stem, ulang)
+    hasil['stem'] = _ringkas(durasi, n)
+
+    padded = None
+    if aset.enkoder is not None:
+        maxlen = aset.model_sentimen[0].input_shape[1] if aset.model_sentimen else 100
+        durasi, padded = _ukur(lambda: aset.enkoder.enkode_batch(teks_lstm, maxlen), ulang)
+        hasil['tokenisasi'] = _ringkas(durasi, n)
+
+    if aset.model_sentimen is not None and padded is not None:
+        model = aset.model_sentimen[0]
+
+        def lstm():
+            # Batch berukuran tetap seperti prediksi._hitung_sentimen
+            batch = np.zeros((ukuran_batch, padded.shape[1]), dtype=np.int32)
+            for i in range(0, n, ukuran_batch):
+                bagian = padded[i:i + ukuran_batch]
+                batch[:len(bagian)] = bagian
+                batch[len(bagian):] = 0
+                model.predict_on_batch(batch)
+        durasi, _ = _ukur(lstm, ulang)
+        hasil['lstm'] = _ringkas(durasi, n)
+
+    if aset.model_lda is not None:
+        model_lda, dictionary = aset.model_lda
+        durasi, matriks = _ukur(lambda: prediksi.matriks_dokumen_kata(token_lda, dictionary), ulang)
+        hasil['doc2bow'] = _ringkas(durasi, n)
+
+        def lda():
+            for i in range(0, n, ukuran_batch_lda):
+                prediksi.inferensi_topik_batch(matriks[i:i + ukuran_batch_lda], model_lda)
+        durasi, _ = _ukur(lda, ulang)
+        hasil['lda'] = _ringkas(durasi, n)
+    return hasil
+
+def _tahap_data(df_mentah, ulang, direktori):
+    """Tahap muat CSV/Parquet, agregat, dan pencarian atas seluruh baris."""
+    from agregat import KubusAgregat
+    from indeks import IndeksFaset, IndeksTeks
+    from penyimpanan import baca_data, konversi_ke_parquet
+
+    n = len(df_mentah)
+    hasil = {}
+    path_csv = os.path.join(direktori, 'korpus.csv')
+    path_parquet = os.path.join(direktori, 'korpus.parquet')
+    df_mentah.to_csv(path_csv, index=False)
+
+    durasi, df = _ukur(lambda: baca_data(path_csv, path_parquet, tulis_cache=False), ulang)
+    hasil['muat_csv'] = _ringkas(durasi, n)
+    try:
+        konversi_ke_parquet(path_csv, path_parquet)
+    except ImportError:
+        pass  # pyarrow tidak tersedia; tahap muat_parquet dilewati
+    else:
+        durasi, df = _ukur(lambda: baca_data(path_csv, path_parquet, tulis_cache=False), ulang)
+        hasil['muat_parquet'] = _ringkas(durasi, n)
+
+    durasi, _ = _ukur(lambda: KubusAgregat.dari_dataframe(df), ulang)
+    hasil['agregat'] = _ringkas(durasi, n)
+
+    durasi, indeks = _ukur(lambda: IndeksTeks(df['ulasan_lengkap']), ulang)
+    hasil['indeks_cari'] = _ringkas(durasi, n)
+    faset = IndeksFaset(df, ['sentimen', 'deskripsi_topik'])
+    sentimen = faset.nilai['sentimen'][0] if faset.nilai['sentimen'] else None
+
+    def cari():
+        # Sama dengan halaman Tabel Ulasan: faset lalu pencarian awalan
+        for kueri in KUERI_CARI:
+            faset.saring({'sentimen': sentimen}) & indeks.bitmap(kueri)
+    durasi, _ = _ukur(cari, ulang)
+    hasil['cari'] = _ringkas(durasi, n)
+    return hasil
+
+def jalankan_benchmark(path_csv, daftar_skala, aset, ulang=ULANG_DEFAULT, maks_baris_model=MAKS_BARIS_MODEL,
+                       ukuran_batch=None, ukuran_batch_lda=None, seed=0, log=print):
+    """Menjalankan semua tahap untuk setiap skala. Mengembalikan dict hasil yang siap ditulis sebagai JSON."""
+    ukuran_batch = ukuran_batch or aset.prediksi.UKURAN_BATCH_DEFAULT
+    ukuran_batch_lda = ukuran_batch_lda or aset.prediksi.UKURAN_BATCH_LDA_DEFAULT
+    df_asli = pd.read_csv(path_csv)
+    hasil = {}
+    for skala in daftar_skala:
+        df = korpus_sintetis(df_asli, skala, seed)
+        rng = np.random.default_rng(seed)
+        sampel = np.sort(rng.choice(len(df), min(len(df), maks_baris_model), replace=False))
+        teks = df['pecahan_kalimat'].fillna('').astype(str).to_numpy()[sampel].tolist()
+
+        log(f"Skala {skala}x: {len(df):,} baris ({len(teks):,} baris untuk tahap model)")
+        direktori = tempfile.mkdtemp(prefix='benchmark_')
+        try:
+            tahap = _tahap_model(aset, teks, ulang, ukuran_batch, ukuran_batch_lda)
+            tahap.update(_tahap_data(df, ulang, direktori))
+        finally:
+            shutil.rmtree(direktori, ignore_errors=True)
+        for nama, galat in aset.galat.items():
+            tahap.setdefault(nama, {'dilewati': galat})
+        hasil[str(skala)] = {nama: tahap[nama] for nama in TAHAP if nama in tahap}
+        for nama, ringkasan in hasil[str(skala)].items():
+            log(f"  {_format_baris(nama, ringkasan)}")
+
+    return {
+        'versi': VERSI_FORMAT,
+        'waktu': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'lingkungan': _lingkungan(aset),
+        'pengaturan': {'csv': path_csv, 'ulang': ulang, 'maks_baris_model': maks_baris_model,
+                       'ukuran_batch': ukuran_batch, 'ukuran_batch_lda': ukuran_batch_lda, 'seed': seed},
+        'hasil': hasil,
+    }
+
+def _lingkungan(aset):
+    model = aset.model_sentimen[0] if aset.model_sentimen else None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'prosesor': platform.processor() or platform.machine(),
+        'jumlah_cpu': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'backend_sentimen': None if model is None else type(model).__name__,
+    }
+
+def _format_baris(nama, ringkasan):
+    if 'dilewati' in ringkasan:
+        return f"{nama:<13} dilewati ({ringkasan['dilewati']})"
+    return (f"{nama:<13} {ringkasan['detik_median'] * 1000:>10.1f} ms  "
+            f"{ringkasan['baris_per_detik'] or 0:>12,.0f} baris/detik")
+
+# ==============================================================================
+# BASELINE
+# ==============================================================================
+
+def bandingkan_dengan_baseline(hasil, baseline, toleransi=TOLERANSI_REGRESI):
+    """
+    Membandingkan waktu tercepat (detik_min, paling tidak terpengaruh derau)
+    setiap tahap dengan baseline. Mengembalikan list (skala, tahap,
+    detik_baseline, detik_sekarang, rasio, regresi) untuk tahap yang ada di
+    keduanya; regresi berarti rasio > 1 + toleransi dan selisihnya melebihi
+    AMBANG_REGRESI_DETIK.
+    """
+    perbandingan = []
+    for skala, daftar_tahap in hasil['hasil'].items():
+        for tahap, ringkasan in daftar_tahap.items():
+            dasar = baseline.get('hasil', {}).get(skala, {}).get(tahap, {})
+            if 'detik_min' not in ringkasan or 'detik_min' not in dasar:
+                continue
+            # Dinormalisasi per baris, karena jumlah baris bisa berbeda jika CSV bertambah
+            lama = dasar['detik_min'] * max(ringkasan['baris'], 1) / max(dasar['baris'], 1)
+            sekarang = ringkasan['detik_min']
+            rasio = sekarang / lama if lama else float('inf')
+            regresi = rasio > 1 + toleransi and sekarang - lama > AMBANG_REGRESI_DETIK
+            perbandingan.append((skala, tahap, lama, sekarang, rasio, regresi))
+    return perbandingan
+
+def simpan_json(data, path):
+    with tulis_atomik(path) as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark pra-pemrosesan, inferensi model, dan agregat dashboard.")
+    parser.add_argument("--csv", default="hasil_terstruktur_diperbaiki.csv", help="CSV hasil analisis sebagai korpus dasar.")
+    parser.add_argument("--skala", type=int, nargs='+', default=SKALA_DEFAULT, help="Faktor pembesaran korpus.")
+    parser.add_argument("--ulang", type=int, default=ULANG_DEFAULT, help="Jumlah pengulangan setiap tahap.")
+    parser.add_argument("--maks-baris-model", type=int, default=MAKS_BARIS_MODEL,
+                        help="Jumlah baris maksimal untuk tahap pra-pemrosesan dan model per skala.")
+    parser.add_argument("--backend-sentimen", choices=['keras', 'numpy', 'otomatis'], default=None,
+                        help="Backend model sentimen (default: prediksi.BACKEND_SENTIMEN).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default=PATH_HASIL_BENCHMARK, help="File JSON hasil benchmark.")
+    parser.add_argument("--baseline", default=PATH_BASELINE_BENCHMARK, help="File JSON baseline.")
+    parser.add_argument("--simpan-baseline", action="store_true", help="Simpan hasil juga sebagai baseline.")
+    parser.add_argument("--bandingkan", action="store_true", help="Bandingkan hasil dengan baseline (buat dulu dengan --simpan-baseline).")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI_REGRESI,
+                        help="Perlambatan relatif yang masih diterima sebelum dianggap regresi.")
+    args = parser.parse_args(argv)
+    if args.bandingkan and not args.simpan_baseline and not os.path.exists(args.baseline):
+        parser.error(f"baseline {args.baseline} belum ada. Buat dulu di mesin ini dengan "
+                     f"'python benchmark.py --simpan-baseline' (atau pilih file lain dengan --baseline).")
+
+    aset = AsetBenchmark(args.backend_sentimen)
+    hasil = jalankan_benchmark(args.csv, args.skala, aset, args.ulang, args.maks_baris_model, seed=args.seed)
+    simpan_json(hasil, args.output)
+    print(f"Hasil disimpan di {args.output}")
+    if args.simpan_baseline:
+        simpan_json(hasil, args.baseline)
+        print(f"Baseline disimpan di {args.baseline}")
+
+    if args.bandingkan:
+        try:
+            with open(args.baseline, encoding='utf-8') as f:
+                baseline = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Baseline tidak dapat dibaca: {e}", file=sys.stderr)
+            sys.exit(2)
+        if baseline.get('lingkungan', {}).get('jumlah_cpu') != hasil['lingkungan']['jumlah_cpu']:
+            print("Peringatan: baseline dibuat di mesin dengan jumlah CPU berbeda.", file=sys.stderr)
+        perbandingan = bandingkan_dengan_baseline(hasil, baseline, args.toleransi)
+        print(f"\n{'skala':>6} {'tahap':<13} {'baseline':>11} {'sekarang':>11} {'rasio':>7}")
+        for skala, tahap, lama, sekarang, rasio, regresi in perbandingan:
+            print(f"{skala + 'x':>6} {tahap:<13} {lama * 1000:>9.1f}ms {sekarang * 1000:>9.1f}ms "
+                  f"{rasio:>6.2f}x{'  REGRESI' if regresi else ''}")
+        jumlah_regresi = sum(p[-1] for p in perbandingan)
+        if jumlah_regresi:
+            print(f"\n{jumlah_regresi} tahap melambat lebih dari {args.toleransi:.0%} dibanding baseline.", file=sys.stderr)
+            sys.exit(1)
+        print("\nTidak ada regresi dibanding baseline.")
+
+if __name__ == "__main__":
+    main()
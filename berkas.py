@@ -0,0 +1,52 @@
+# berkas.py
+"""
+Penulisan file secara atomik untuk cache, model, dan status yang dibaca
+proses lain.
+
+Isi ditulis ke path sementara di samping tujuan lalu dipindahkan dengan
+os.replace, sehingga pembaca hanya pernah melihat versi lama atau versi baru
+yang lengkap. Jika penulisan gagal, path sementara dihapus dan tujuan tidak
+berubah.
+"""
+
+import os
+import shutil
+from contextlib import contextmanager
+
+def _hapus(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path, ignore_errors=True)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+@contextmanager
+def path_atomik(path):
+    """
+    Menghasilkan path sementara untuk menulis `path`. Setelah blok selesai
+    tanpa galat, path sementara menggantikan `path`. Direktori juga didukung:
+    direktori lama dipindahkan ke samping dulu, lalu dihapus setelah diganti.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    sementara = f"{path}.{os.getpid()}.tmp"
+    _hapus(sementara)
+    try:
+        yield sementara
+        if os.path.isdir(sementara) and os.path.isdir(path):
+            lama = f"{path}.{os.getpid()}.lama"
+            os.replace(path, lama)
+            os.replace(sementara, path)
+            shutil.rmtree(lama, ignore_errors=True)
+        else:
+            os.replace(sementara, path)
+    except BaseException:
+        _hapus(sementara)
+        raise
+
+@contextmanager
+def tulis_atomik(path, mode='w', encoding=None):
+    """Seperti path_atomik, tetapi langsung membuka file sementara dengan `mode`."""
+    if encoding is None and 'b' not in mode:
+        encoding = 'utf-8'
+    with path_atomik(path) as sementara:
+        with open(sementara, mode, encoding=encoding) as f:
+            yield f
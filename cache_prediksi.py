@@ -0,0 +1,168 @@
+# cache_prediksi.py
+"""
+Cache hasil prediksi sentimen dan topik.
+
+Ulasan aplikasi sangat berulang ("mantap", "sangat membantu", ...). Hasil
+prediksi disimpan dengan kunci hash dari teks yang sudah dipra-proses
+(dinormalisasi dan di-stem) beserta versi model, sehingga teks yang sama
+cukup dicari di dict alih-alih dijalankan ulang melalui LSTM/LDA. Cache di
+memori berupa LRU berukuran terbatas dan dapat didukung oleh file SQLite
+agar tetap hangat setelah aplikasi di-restart.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+UKURAN_CACHE_PREDIKSI = 100000
+PATH_CACHE_PREDIKSI = "assets/cache/prediksi_cache.sqlite"
+
+def sidik_file(*paths):
+    """Hash isi file-file model; file yang tidak ada dicatat namanya saja."""
+    h = hashlib.sha1()
+    for path in paths:
+        h.update(path.encode())
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                for blok in iter(lambda: f.read(1 << 20), b''):
+                    h.update(blok)
+    return h.hexdigest()[:16]
+
+class CachePrediksi:
+    """
+    Cache LRU hasil prediksi, opsional didukung SQLite.
+
+    `versi` memetakan jenis prediksi (mis. 'sentimen', 'topik') ke versi model
+    yang menghasilkannya. Versi ikut menjadi bagian kunci, sehingga hasil dari
+    model lama tidak pernah terpakai; baris SQLite milik versi lain dihapus saat
+    koneksi pertama kali dibuka. Hasil yang baru dihitung ditulis ke disk
+    sekaligus lewat simpan().
+    """
+
+    def __init__(self, versi, ukuran_maks=UKURAN_CACHE_PREDIKSI, path=None):
+        self.versi = dict(versi)
+        self.ukuran_maks = ukuran_maks
+        self.path = path
+        self._memori = OrderedDict()
+        self._tertunda = {}
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.hits_disk = 0
+        self.misses = 0
+
+    def _koneksi(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS hasil (kunci TEXT PRIMARY KEY, versi TEXT NOT NULL, nilai TEXT NOT NULL)")
+            versi = sorted(set(self.versi.values()))
+            conn.execute(f"DELETE FROM hasil WHERE versi NOT IN ({', '.join('?' * len(versi))})", versi)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def kunci(self, jenis, teks):
+        """Kunci cache untuk teks (yang sudah dipra-proses) dan jenis prediksi tertentu."""
+        return hashlib.sha1(f"{self.versi[jenis]}\x00{jenis}\x00{teks}".encode('utf-8')).hexdigest()
+
+    def ambil_banyak(self, jenis, daftar_teks):
+        """Hasil tersimpan untuk setiap teks, atau None untuk teks yang belum ada di cache."""
+        daftar_kunci = [self.kunci(jenis, teks) for teks in daftar_teks]
+        hasil = []
+        dari_disk = []
+        with self._lock:
+            for kunci in daftar_kunci:
+                nilai = self._memori.get(kunci)
+                if nilai is not None:
+                    self._memori.move_to_end(kunci)
+                hasil.append(nilai)
+            hilang = [i for i, nilai in enumerate(hasil) if nilai is None]
+            if hilang and self.path:
+                kunci_hilang = list({daftar_kunci[i] for i in hilang})
+                conn = self._koneksi()
+                for awal in range(0, len(kunci_hilang), 500):
+                    bagian = kunci_hilang[awal:awal + 500]
+                    dari_disk.extend(conn.execute(
+                        f"SELECT kunci, nilai FROM hasil WHERE kunci IN ({', '.join('?' * len(bagian))})", bagian))
+            tersimpan = {kunci: tuple(json.loads(nilai)) for kunci, nilai in dari_disk}
+            for i in hilang:
+                nilai = tersimpan.get(daftar_kunci[i])
+                if nilai is not None:
+                    hasil[i] = nilai
+                    self._masukkan(daftar_kunci[i], nilai)
+                    self.hits_disk += 1
+            jumlah_hilang = sum(nilai is None for nilai in hasil)
+            self.misses += jumlah_hilang
+            self.hits += len(hasil) - jumlah_hilang
+        return hasil
+
+    def simpan_banyak(self, jenis, daftar_teks, daftar_hasil):
+        """Menyimpan hasil prediksi untuk setiap teks."""
+        with self._lock:
+            for teks, nilai in zip(daftar_teks, daftar_hasil):
+                kunci = self.kunci(jenis, teks)
+                nilai = tuple(nilai)
+                self._masukkan(kunci, nilai)
+                if self.path:
+                    self._tertunda[kunci] = (self.versi[jenis], json.dumps(nilai, ensure_ascii=False))
+
+    def _masukkan(self, kunci, nilai):
+        self._memori[kunci] = nilai
+        self._memori.move_to_end(kunci)
+        while len(self._memori) > self.ukuran_maks:
+            self._memori.popitem(last=False)
+
+    def simpan(self):
+        """Menulis hasil yang masih tertunda ke disk dalam satu transaksi."""
+        with self._lock:
+            if not self._tertunda:
+                return
+            conn = self._koneksi()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO hasil VALUES (?, ?, ?)",
+                                 [(kunci, versi, nilai) for kunci, (versi, nilai) in self._tertunda.items()])
+            self._tertunda.clear()
+
+    def statistik(self):
+        """Statistik cache: hits (termasuk dari disk), misses, ukuran, dan hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'hits_disk': self.hits_disk,
+                'misses': self.misses,
+                'ukuran': len(self._memori),
+                'ukuran_maks': self.ukuran_maks,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+def hasil_dengan_cache(cache, jenis, daftar_item, kunci_teks, hitung):
+    """
+    Hasil prediksi untuk setiap item. Item yang hasilnya sudah ada di `cache`
+    tidak dihitung ulang; sisanya dihitung sekali per teks unik dengan
+    `hitung(daftar_item)` lalu disimpan. `kunci_teks(item)` memberikan teks
+    yang menjadi kunci cache. Tanpa cache, `hitung` dipanggil untuk semua item.
+    """
+    daftar_item = list(daftar_item)
+    if cache is None:
+        return hitung(daftar_item)
+    daftar_teks = [kunci_teks(item) for item in daftar_item]
+    hasil = cache.ambil_banyak(jenis, daftar_teks)
+
+    posisi_hilang = {}
+    for i, nilai in enumerate(hasil):
+        if nilai is None:
+            posisi_hilang.setdefault(daftar_teks[i], []).append(i)
+    if posisi_hilang:
+        item_unik = [daftar_item[posisi[0]] for posisi in posisi_hilang.values()]
+        hasil_baru = hitung(item_unik)
+        cache.simpan_banyak(jenis, list(posisi_hilang), hasil_baru)
+        for posisi, nilai in zip(posisi_hilang.values(), hasil_baru):
+            for i in posisi:
+                hasil[i] = tuple(nilai)
+        cache.simpan()
+    return hasil
@@ -0,0 +1,187 @@
+# enkoder_teks.py
+"""
+Enkoder teks untuk model sentimen, pengganti Tokenizer Keras + pad_sequences.
+
+Dibangun dari `word_index` Tokenizer Keras (assets/models/tokenizer.pkl) dan
+menghasilkan sekuens yang identik: filter karakter, lowercase, split, batas
+`num_words`, dan token OOV mengikuti Tokenizer.texts_to_sequences. Satu batch
+teks langsung ditulis ke matriks int32 (batch, maxlen) dengan padding dan
+pemotongan di belakang ('post'). Hanya membutuhkan NumPy; kosakata disimpan
+sebagai JSON sehingga Keras tidak perlu diimpor saat inferensi.
+
+Mengekspor tokenizer dan memeriksa kesamaan hasilnya dengan Keras:
+
+    python enkoder_teks.py
+    python enkoder_teks.py --csv hasil_terstruktur_diperbaiki.csv
+"""
+
+import argparse
+import copy
+import json
+import pickle
+import sys
+
+import numpy as np
+
+from berkas import tulis_atomik
+from cache_prediksi import sidik_file
+
+VERSI_FORMAT = 1
+
+class EnkoderTeks:
+    """
+    Pemetaan kata -> indeks dengan semantik Tokenizer Keras (char_level=False).
+    Kata dengan indeks >= num_words dan kata yang tidak dikenal menjadi indeks
+    OOV, atau dibuang jika tokenizer tidak memakai token OOV.
+    """
+
+    def __init__(self, word_index, num_words=None, oov_token=None, lower=True,
+                 filters='!"#$%&()*+,-./:;<=>?@[\\]^_`{|}~\t\n', split=' ', sidik_sumber=None):
+        self.word_index = dict(word_index)
+        self.num_words = num_words
+        self.oov_token = oov_token
+        self.lower = lower
+        self.filters = filters
+        self.split = split
+        self.sidik_sumber = sidik_sumber
+
+        self._indeks_oov = self.word_index.get(oov_token) if oov_token is not None else None
+        self._tabel = str.maketrans({c: split for c in filters})
+        # Batas num_words dilipat ke dalam kamus sehingga setiap kata cukup satu kali lookup
+        self._kosakata = {}
+        for kata, indeks in self.word_index.items():
+            if not num_words or indeks < num_words:
+                self._kosakata[kata] = indeks
+            elif self._indeks_oov is not None:
+                self._kosakata[kata] = self._indeks_oov
+
+    @classmethod
+    def dari_tokenizer_keras(cls, tokenizer, sidik_sumber=None):
+        """Membuat enkoder dari objek Tokenizer Keras (legacy preprocessing.text)."""
+        if getattr(tokenizer, 'char_level', False) or getattr(tokenizer, 'analyzer', None) is not None:
+            raise ValueError("Tokenizer dengan char_level atau analyzer khusus belum didukung.")
+        return cls(tokenizer.word_index, tokenizer.num_words, tokenizer.oov_token, tokenizer.lower,
+                   tokenizer.filters, tokenizer.split, sidik_sumber)
+
+    def _kode(self, teks):
+        if self.lower:
+            teks = teks.lower()
+        kata = teks.translate(self._tabel).split(self.split)
+        ambil = self._kosakata.get
+        if self._indeks_oov is None:
+            return [i for i in map(ambil, kata) if i is not None]
+        oov = self._indeks_oov
+        return [ambil(k, oov) for k in kata if k]
+
+    def texts_to_sequences(self, daftar_teks):
+        """Sama dengan Tokenizer.texts_to_sequences."""
+        return [self._kode(teks) for teks in daftar_teks]
+
+    def enkode_batch(self, daftar_teks, maxlen, out=None):
+        """
+        Mengenkode teks ke matriks int32 (len(daftar_teks), maxlen), sama dengan
+        pad_sequences(..., padding='post', truncating='post'). Jika `out` diberikan,
+        baris-baris awalnya ditimpa dan `out` dikembalikan; baris sisanya tidak diubah.
+        """
+        jumlah = len(daftar_teks)
+        if out is None:
+            out = np.zeros((jumlah, maxlen), dtype=np.int32)
+        elif out.shape[0] < jumlah or out.shape[1] != maxlen:
+            raise ValueError(f"Matriks output {out.shape} tidak cukup untuk {jumlah} teks dengan maxlen {maxlen}.")
+        panjang = np.empty(jumlah, dtype=np.intp)
+        semua = []
+        for i, teks in enumerate(daftar_teks):
+            kode = self._kode(teks)[:maxlen]
+            panjang[i] = len(kode)
+            semua.extend(kode)
+        bagian = out[:jumlah]
+        bagian[...] = 0
+        # Mask boolean ditulis berurutan per baris, sehingga indeks jatuh di awal setiap baris
+        bagian[np.arange(maxlen) < panjang[:, np.newaxis]] = semua
+        return out
+
+    def konfigurasi(self):
+        return {'versi': VERSI_FORMAT, 'num_words': self.num_words, 'oov_token': self.oov_token,
+                'lower': self.lower, 'filters': self.filters, 'split': self.split,
+                'sidik_sumber': self.sidik_sumber, 'word_index': self.word_index}
+
+def simpan_enkoder(enkoder, path):
+    """Menyimpan enkoder sebagai JSON secara atomik."""
+    with tulis_atomik(path) as f:
+        json.dump(enkoder.konfigurasi(), f, ensure_ascii=False)
+
+def muat_enkoder(path):
+    """Memuat enkoder dari JSON. Melempar ValueError jika formatnya tidak dikenal."""
+    with open(path, encoding='utf-8') as f:
+        konfigurasi = json.load(f)
+    if konfigurasi.pop('versi', None) != VERSI_FORMAT:
+        raise ValueError(f"Versi format enkoder teks tidak dikenal di {path}")
+    return EnkoderTeks(**konfigurasi)
+
+def cek_identitas(tokenizer_keras, enkoder, daftar_teks, maxlen):
+    """
+    Membandingkan texts_to_sequences + pad_sequences Keras dengan enkoder.
+    Mengembalikan (jumlah teks berbeda, contoh teks pertama yang berbeda atau None).
+    """
+    from keras.utils import pad_sequences
+
+    daftar_teks = list(daftar_teks)
+    harapan = pad_sequences(tokenizer_keras.texts_to_sequences(daftar_teks), maxlen=maxlen,
+                            padding='post', truncating='post')
+    hasil = enkoder.enkode_batch(daftar_teks, maxlen)
+    berbeda = np.flatnonzero((harapan != hasil).any(axis=1))
+    return len(berbeda), (daftar_teks[berbeda[0]] if len(berbeda) else None)
+
+def _teks_uji(tokenizer, path_csv=None):
+    """Kasus tepi, kosakata tokenizer itu sendiri, dan (opsional) teks dari CSV."""
+    kata = list(tokenizer.word_index)
+    teks = ['', ' ', '   ', '!!!', 'kata_tak_dikenal_xyz', 'Aplikasi SANGAT membantu!!', 'tab\tdan\nbaris baru',
+            'a,b.c;d', ' '.join(kata), ' '.join(reversed(kata[:300])), ' '.join(kata[:5]) + ' zzz ' * 3]
+    teks += [' '.join(kata[i:i + 7]) for i in range(0, len(kata), 7)]
+    if path_csv:
+        import pandas as pd
+        import prediksi
+
+        kolom = 'pecahan_kalimat' if 'pecahan_kalimat' in pd.read_csv(path_csv, nrows=0).columns else 'ulasan_lengkap'
+        mentah = pd.read_csv(path_csv, usecols=[kolom])[kolom].fillna('').astype(str).unique().tolist()
+        pipeline = prediksi.muat_aset_pra_pemrosesan().pipeline
+        teks += mentah + [p.teks_lstm for p in pipeline.proses_batch(mentah)]
+    return teks
+
+def main(argv=None):
+    import prediksi
+
+    parser = argparse.ArgumentParser(
+        description="Mengekspor Tokenizer Keras ke enkoder teks JSON dan memeriksa kesamaan hasilnya.")
+    parser.add_argument("--tokenizer", default=prediksi.PATH_TOKENIZER, help="File pickle Tokenizer Keras.")
+    parser.add_argument("-o", "--output", default=prediksi.PATH_ENKODER_TEKS, help="File JSON enkoder.")
+    parser.add_argument("--maxlen", type=int, default=100, help="Panjang input model sentimen.")
+    parser.add_argument("--csv", default=None, help="CSV ulasan yang juga dipakai sebagai teks uji.")
+    args = parser.parse_args(argv)
+
+    with open(args.tokenizer, 'rb') as f:
+        tokenizer = pickle.load(f)
+    enkoder = EnkoderTeks.dari_tokenizer_keras(tokenizer, sidik_file(args.tokenizer))
+    teks = _teks_uji(tokenizer, args.csv)
+
+    # Juga diperiksa dengan num_words kecil agar cabang kata di luar batas ikut teruji
+    tokenizer_kecil = copy.copy(tokenizer)
+    tokenizer_kecil.num_words = min(100, len(tokenizer.word_index))
+    gagal = False
+    for nama, tok, enk in [('tokenizer', tokenizer, enkoder),
+                           (f'num_words={tokenizer_kecil.num_words}', tokenizer_kecil,
+                            EnkoderTeks.dari_tokenizer_keras(tokenizer_kecil))]:
+        for maxlen in (args.maxlen, 5):
+            berbeda, contoh = cek_identitas(tok, enk, teks, maxlen)
+            print(f"{nama}, maxlen={maxlen}: {len(teks):,} teks, {berbeda:,} berbeda")
+            if berbeda:
+                print(f"  contoh: {contoh[:200]!r}", file=sys.stderr)
+                gagal = True
+    if gagal:
+        print("Hasil enkoder tidak identik dengan Keras; enkoder tidak disimpan.", file=sys.stderr)
+        sys.exit(1)
+    simpan_enkoder(enkoder, args.output)
+    print(f"Enkoder teks disimpan di {args.output}")
+
+if __name__ == "__main__":
+    main()
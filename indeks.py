@@ -0,0 +1,152 @@
+# indeks.py
+"""
+Indeks terbalik (inverted index) tingkat token untuk pencarian ulasan.
+
+Postings disimpan dalam format CSR: satu array posisi baris (int32, terurut
+per token) dan array offset per token pada kosakata yang terurut. Karena
+kosakata terurut, semua token dengan awalan yang sama menempati satu irisan
+yang bersebelahan, sehingga pencarian awalan cukup dengan dua searchsorted.
+Hasil pencarian berupa bitmap (array boolean) yang bisa langsung di-AND
+dengan filter lain.
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Sama dengan TextNormalizer Sastrawi: selain huruf dan angka dianggap pemisah
+POLA_TOKEN = re.compile(r'[a-z0-9]+')
+
+def tokenisasi(teks):
+    """Memecah teks menjadi token huruf kecil."""
+    return POLA_TOKEN.findall(str(teks).lower())
+
+def _bangun_csr(kode_token, baris, jumlah_token):
+    """Membangun (offset, baris) terurut dan tanpa duplikat dari pasangan (token, baris)."""
+    n_baris = int(baris.max()) + 1 if len(baris) else 1
+    kunci = np.unique(kode_token.astype(np.int64) * n_baris + baris)
+    kode_token, baris = np.divmod(kunci, n_baris)
+    offset = np.zeros(jumlah_token + 1, dtype=np.int64)
+    np.cumsum(np.bincount(kode_token, minlength=jumlah_token), out=offset[1:])
+    return offset, baris.astype(np.int32)
+
+class IndeksTeks:
+    """
+    Indeks terbalik atas sebuah kolom teks.
+
+    `fungsi_stem` (opsional) dipakai untuk pencarian berdasarkan bentuk dasar
+    kata; indeks stem baru dibangun saat pertama kali dibutuhkan.
+    """
+
+    def __init__(self, daftar_teks, fungsi_stem=None):
+        teks = pd.Series(daftar_teks, dtype=object).fillna('').astype(str).str.lower()
+        token = teks.reset_index(drop=True).str.findall(POLA_TOKEN).explode().dropna()
+
+        self.jumlah_baris = len(teks)
+        kode, kosakata = pd.factorize(token.to_numpy(dtype=object), sort=True)
+        self.kosakata = np.asarray(kosakata, dtype=object)
+        self.offset, self.baris = _bangun_csr(kode, token.index.to_numpy(np.int64), len(self.kosakata))
+
+        self.fungsi_stem = fungsi_stem
+        self._indeks_stem = None
+        self._lock = threading.Lock()
+
+    def _indeks_stem_siap(self):
+        """(kosakata_stem, offset, baris) untuk stem dari setiap token, dibangun sekali."""
+        with self._lock:
+            if self._indeks_stem is None:
+                stem = [self.fungsi_stem(token) or token for token in self.kosakata]
+                kode_stem, kosakata_stem = pd.factorize(np.asarray(stem, dtype=object), sort=True)
+                kode_per_posting = np.repeat(kode_stem, np.diff(self.offset))
+                offset, baris = _bangun_csr(kode_per_posting, self.baris.astype(np.int64), len(kosakata_stem))
+                self._indeks_stem = (np.asarray(kosakata_stem, dtype=object), offset, baris)
+            return self._indeks_stem
+
+    @staticmethod
+    def _irisan(kosakata, offset, token, awalan):
+        """Rentang (awal, akhir) pada array baris untuk token (atau semua token berawalan `token`)."""
+        kiri = np.searchsorted(kosakata, token, side='left')
+        if awalan:
+            kanan = np.searchsorted(kosakata, token + '\uffff', side='left')
+        else:
+            kanan = kiri + 1 if kiri < len(kosakata) and kosakata[kiri] == token else kiri
+        return offset[kiri], offset[kanan]
+
+    def bitmap(self, query, awalan=True, stem=False):
+        """
+        Bitmap baris yang memuat SEMUA token pada `query` (AND).
+        Query kosong menghasilkan bitmap yang seluruhnya True.
+        """
+        hasil = np.ones(self.jumlah_baris, dtype=bool)
+        for token in tokenisasi(query):
+            if stem and self.fungsi_stem is not None:
+                kosakata, offset, baris = self._indeks_stem_siap()
+                token = self.fungsi_stem(token) or token
+            else:
+                kosakata, offset, baris = self.kosakata, self.offset, self.baris
+            awal, akhir = self._irisan(kosakata, offset, token, awalan)
+            cocok = np.zeros(self.jumlah_baris, dtype=bool)
+            cocok[baris[awal:akhir]] = True
+            hasil &= cocok
+        return hasil
+
+    def cari(self, query, awalan=True, stem=False):
+        """Posisi baris (terurut) yang cocok dengan `query`."""
+        return np.flatnonzero(self.bitmap(query, awalan=awalan, stem=stem))
+
+    def postings(self, token):
+        """Posting list (posisi baris terurut) untuk satu token persis."""
+        awal, akhir = self._irisan(self.kosakata, self.offset, token.lower(), awalan=False)
+        return self.baris[awal:akhir]
+
+class IndeksFaset:
+    """
+    Indeks faset untuk kolom kategori (mis. 'sentimen', 'deskripsi_topik').
+
+    Untuk setiap kolom disimpan kode integer per baris, satu bitmap per nilai,
+    dan jumlah baris per nilai. Menggabungkan filter cukup dengan AND antar
+    bitmap, dan jumlah per faset dihitung dengan bincount atas kode baris
+    yang lolos filter, tanpa memindai ulang dataframe.
+    """
+
+    SEMUA = 'Semua'
+
+    def __init__(self, df, kolom):
+        self.jumlah_baris = len(df)
+        self.nilai = {}
+        self.kode = {}
+        self.bitmap_nilai = {}
+        self.jumlah = {}
+        for nama in kolom:
+            kode, nilai = pd.factorize(df[nama])
+            self.nilai[nama] = list(nilai)
+            self.kode[nama] = kode.astype(np.int32)
+            self.bitmap_nilai[nama] = {v: kode == i for i, v in enumerate(self.nilai[nama])}
+            self.jumlah[nama] = np.bincount(kode[kode >= 0], minlength=len(self.nilai[nama]))
+
+    def bitmap(self, kolom, nilai):
+        """Bitmap baris dengan `kolom == nilai`; None jika filter tidak dipakai ('Semua'/None)."""
+        if nilai in (None, self.SEMUA):
+            return None
+        kosong = np.zeros(self.jumlah_baris, dtype=bool)
+        return self.bitmap_nilai[kolom].get(nilai, kosong)
+
+    def saring(self, pilihan, mask=None):
+        """AND dari bitmap setiap pasangan kolom -> nilai pada `pilihan` (dan `mask` awal, jika ada)."""
+        hasil = np.ones(self.jumlah_baris, dtype=bool) if mask is None else mask.copy()
+        for kolom, nilai in pilihan.items():
+            bitmap = self.bitmap(kolom, nilai)
+            if bitmap is not None:
+                hasil &= bitmap
+        return hasil
+
+    def hitung(self, kolom, mask=None):
+        """Jumlah baris per nilai pada `kolom`, hanya untuk baris di `mask` (jika diberikan)."""
+        if mask is None:
+            jumlah = self.jumlah[kolom]
+        else:
+            kode = self.kode[kolom][mask]
+            jumlah = np.bincount(kode[kode >= 0], minlength=len(self.nilai[kolom]))
+        return dict(zip(self.nilai[kolom], jumlah.tolist()))
@@ -0,0 +1,194 @@
+# ingesti.py
+"""
+Ingesti inkremental ulasan baru ke dataset dashboard.
+
+Memantau sebuah file JSONL (append-only) atau direktori berisi file *.jsonl.
+Setiap baris berisi satu ulasan:
+
+    {"id_ulasan": 4967, "ulasan_lengkap": "...", "pecahan_kalimat": ["...", "..."]}
+
+'pecahan_kalimat' bersifat opsional; tanpa kolom itu ulasan dipecah per
+kalimat dengan aspek.pecah_kalimat. Hanya id_ulasan yang belum ada di CSV yang dinilai
+dengan model sentimen dan topik, lalu hasilnya ditambahkan ke akhir CSV.
+Dashboard yang sedang berjalan membaca baris tambahan tersebut dan
+memperbarui agregatnya tanpa memuat ulang atau menilai ulang seluruh data.
+
+    python ingesti.py masuk/ --csv hasil_terstruktur_diperbaiki.csv
+
+Posisi baca setiap file sumber disimpan di assets/cache/ sehingga proses
+yang dihentikan dapat dilanjutkan tanpa membaca ulang dari awal.
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from aspek import nilai_pecahan, pecah_kalimat
+from berkas import tulis_atomik
+from penyimpanan import DIR_CACHE, awal_baris
+
+INTERVAL_DEFAULT = 2.0
+
+def path_status_untuk(path_csv):
+    """Lokasi file posisi baca sumber JSONL untuk sebuah file CSV."""
+    nama = os.path.splitext(os.path.basename(path_csv))[0]
+    return os.path.join(DIR_CACHE, f"ingesti_{nama}.json")
+
+def muat_status(path_status):
+    try:
+        with open(path_status, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def simpan_status(path_status, status):
+    with tulis_atomik(path_status) as f:
+        json.dump(status, f, indent=2)
+
+def daftar_sumber(sumber):
+    """File JSONL yang dipantau: `sumber` itu sendiri, atau semua *.jsonl di dalam direktori `sumber`."""
+    if os.path.isdir(sumber):
+        return sorted(glob.glob(os.path.join(sumber, '*.jsonl')))
+    return [sumber] if os.path.exists(sumber) else []
+
+def baca_rekaman_baru(sumber, status):
+    """
+    Membaca baris JSON lengkap yang ditambahkan ke file-file sumber sejak
+    posisi yang tercatat di `status`. Mengembalikan (daftar rekaman, status baru).
+    """
+    status = dict(status)
+    rekaman = []
+    for path in daftar_sumber(sumber):
+        kunci = os.path.abspath(path)
+        offset = status.get(kunci, 0)
+        if os.path.getsize(path) < offset:
+            offset = 0  # File diganti atau dipotong; baca dari awal (id lama tetap dilewati)
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        akhir = data.rfind(b'\n') + 1
+        for nomor, baris in enumerate(data[:akhir].splitlines(), start=1):
+            if not baris.strip():
+                continue
+            try:
+                rekaman.append(json.loads(baris))
+            except ValueError as e:
+                print(f"Baris JSON tidak valid di {path} (baris baru ke-{nomor}) dilewati: {e}", file=sys.stderr)
+        status[kunci] = offset + akhir
+    return rekaman, status
+
+def rekaman_ke_dataframe(rekaman):
+    """Satu baris per pecahan kalimat, dengan kolom id_ulasan, ulasan_lengkap, dan pecahan_kalimat."""
+    baris = []
+    for r in rekaman:
+        if r.get('id_ulasan') is None or not r.get('ulasan_lengkap'):
+            continue
+        pecahan = r.get('pecahan_kalimat') or pecah_kalimat(r['ulasan_lengkap']) or [r['ulasan_lengkap']]
+        if isinstance(pecahan, str):
+            pecahan = [pecahan]
+        for kalimat in pecahan:
+            baris.append({'id_ulasan': r['id_ulasan'], 'ulasan_lengkap': r['ulasan_lengkap'],
+                          'pecahan_kalimat': kalimat})
+    return pd.DataFrame(baris, columns=['id_ulasan', 'ulasan_lengkap', 'pecahan_kalimat'])
+
+class IngestiUlasan:
+    """
+    Menilai ulasan baru dan menambahkannya ke akhir CSV hasil analisis.
+
+    Model dimuat sekali saat objek dibuat. Himpunan id_ulasan yang sudah ada
+    dibaca sekali dari CSV lalu diperbarui di memori setiap kali baris ditambahkan.
+    """
+
+    def __init__(self, path_csv, ukuran_batch=None):
+        import prediksi
+
+        self.path_csv = path_csv
+        self.ukuran_batch = ukuran_batch or prediksi.UKURAN_BATCH_DEFAULT
+        self.kolom = list(pd.read_csv(path_csv, nrows=0).columns)
+        tersimpan = pd.read_csv(path_csv, usecols=['id', 'id_ulasan'])
+        self.id_dikenal = set(tersimpan['id_ulasan'].tolist())
+        self.id_berikutnya = int(tersimpan['id'].max()) + 1 if len(tersimpan) else 1
+
+        self.prediksi = prediksi
+        self.aset_prep = prediksi.muat_aset_pra_pemrosesan()
+        self.model_sentimen = prediksi.muat_model_sentimen()
+        self.versi_lda = prediksi.versi_lda_aktif()
+        self.model_lda = prediksi.muat_model_lda(self.versi_lda)
+        self.cache = prediksi.cache_prediksi(self.versi_lda)
+
+    def nilai(self, df):
+        """Menilai sentimen dan topik setiap pecahan kalimat pada `df` (pra-pemrosesan sekali untuk kedua model)."""
+        # Versi model LDA yang baru diterbitkan dipakai mulai batch berikutnya
+        versi = self.prediksi.versi_lda_aktif()
+        if versi != self.versi_lda:
+            self.model_lda = self.prediksi.muat_model_lda(versi)
+            self.cache = self.prediksi.cache_prediksi(versi)
+            self.versi_lda = versi
+        return nilai_pecahan(df, self.model_sentimen, self.model_lda, self.aset_prep,
+                             ukuran_batch=self.ukuran_batch, cache=self.cache)
+
+    def tambahkan(self, rekaman):
+        """Menilai rekaman dengan id_ulasan yang belum dikenal lalu menambahkannya ke CSV. Mengembalikan jumlah baris."""
+        # Jika id_ulasan yang sama muncul lebih dari sekali, hanya kemunculan pertama yang dipakai
+        baru = {}
+        for r in rekaman:
+            if r.get('id_ulasan') not in self.id_dikenal:
+                baru.setdefault(r.get('id_ulasan'), r)
+        df = rekaman_ke_dataframe(baru.values())
+        if df.empty:
+            return 0
+
+        df = self.nilai(df.reset_index(drop=True))
+        df.insert(0, 'id', range(self.id_berikutnya, self.id_berikutnya + len(df)))
+        teks = df.reindex(columns=self.kolom).to_csv(index=False, header=False)
+
+        # Ditulis dalam satu kali write agar pembaca hampir tidak pernah melihat baris setengah jadi
+        ukuran = os.path.getsize(self.path_csv)
+        if ukuran and awal_baris(self.path_csv, ukuran) != ukuran:
+            teks = '\n' + teks
+        with open(self.path_csv, 'a', encoding='utf-8', newline='') as f:
+            f.write(teks)
+
+        self.id_dikenal.update(df['id_ulasan'].tolist())
+        self.id_berikutnya += len(df)
+        return len(df)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menilai ulasan baru dari JSONL dan menambahkannya ke CSV hasil analisis.")
+    parser.add_argument("sumber", help="File JSONL atau direktori berisi file *.jsonl.")
+    parser.add_argument("--csv", default="hasil_terstruktur_diperbaiki.csv", help="CSV hasil analisis yang ditambah.")
+    parser.add_argument("--interval", type=float, default=INTERVAL_DEFAULT, help="Jeda (detik) antar pemeriksaan sumber.")
+    parser.add_argument("--sekali", action="store_true", help="Proses data yang ada sekali lalu berhenti.")
+    parser.add_argument("--ukuran-batch", type=int, default=None, help="Ukuran batch prediksi LSTM.")
+    args = parser.parse_args(argv)
+
+    path_status = path_status_untuk(args.csv)
+    ingesti = IngestiUlasan(args.csv, args.ukuran_batch)
+    status = muat_status(path_status)
+    print(f"Memantau {args.sumber} -> {args.csv} ({len(ingesti.id_dikenal):,} id_ulasan sudah ada)")
+    try:
+        while True:
+            rekaman, status_baru = baca_rekaman_baru(args.sumber, status)
+            if rekaman:
+                mulai = time.perf_counter()
+                jumlah = ingesti.tambahkan(rekaman)
+                print(f"{len(rekaman):,} ulasan dibaca, {jumlah:,} baris baru ditambahkan "
+                      f"({time.perf_counter() - mulai:.2f} detik)")
+            # Posisi baca disimpan setelah CSV ditulis; jika proses berhenti di tengah,
+            # rekaman dibaca ulang dan id_ulasan yang sudah tersimpan dilewati.
+            if status_baru != status:
+                simpan_status(path_status, status_baru)
+                status = status_baru
+            if args.sekali:
+                break
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+# instrumentasi.py
+"""
+Instrumentasi ringan untuk jalur-jalur utama: latensi per tahap (histogram),
+jumlah pemanggilan, hit rate cache, dan RSS proses.
+
+Nonaktif secara default; biayanya saat nonaktif hanya satu pemeriksaan flag
+per pemanggilan. Aktifkan dengan variabel lingkungan INSTRUMENTASI=1 atau
+aktifkan(True). Dengan INSTRUMENTASI_DUMP=path, ringkasan ditulis berkala
+(setiap INSTRUMENTASI_DUMP_INTERVAL detik) ke file JSON, atau teks
+Prometheus jika path berakhiran .prom, agar bisa dibaca scraper lokal.
+
+    @ukur('prediksi_sentimen')
+    def prediksi_sentimen(...): ...
+
+    with blok('render_grafik'):
+        ...
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+from berkas import tulis_atomik
+
+AKTIF = os.environ.get('INSTRUMENTASI', '').lower() in ('1', 'true', 'ya')
+PATH_DUMP = os.environ.get('INSTRUMENTASI_DUMP') or None
+INTERVAL_DUMP = float(os.environ.get('INSTRUMENTASI_DUMP_INTERVAL', 15))
+PREFIKS_METRIK = 'sentimensignal'
+
+# Batas atas bucket histogram latensi (detik), seperti histogram Prometheus
+BATAS_HISTOGRAM = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class _Histogram:
+    __slots__ = ('jumlah', 'total', 'minimum', 'maks', 'bucket')
+
+    def __init__(self):
+        self.jumlah = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maks = 0.0
+        self.bucket = [0] * (len(BATAS_HISTOGRAM) + 1)  # bucket terakhir: > batas terbesar
+
+    def tambah(self, detik):
+        self.jumlah += 1
+        self.total += detik
+        self.minimum = min(self.minimum, detik)
+        self.maks = max(self.maks, detik)
+        self.bucket[bisect.bisect_left(BATAS_HISTOGRAM, detik)] += 1
+
+    def kuantil(self, q):
+        """Perkiraan kuantil dengan interpolasi linear di dalam bucket (seperti histogram_quantile)."""
+        if not self.jumlah:
+            return None
+        target = q * self.jumlah
+        kumulatif = 0
+        for i, n in enumerate(self.bucket):
+            if n and kumulatif + n >= target:
+                bawah = BATAS_HISTOGRAM[i - 1] if i else 0.0
+                atas = BATAS_HISTOGRAM[i] if i < len(BATAS_HISTOGRAM) else self.maks
+                nilai = bawah + (atas - bawah) * (target - kumulatif) / n
+                return min(max(nilai, self.minimum), self.maks)
+            kumulatif += n
+        return self.maks
+
+_lock = threading.Lock()
+_histogram = {}
+_sumber_cache = {}
+_dumper = None
+
+def aktifkan(aktif=True):
+    """Mengaktifkan atau menonaktifkan pencatatan untuk seluruh proses."""
+    global AKTIF
+    AKTIF = bool(aktif)
+
+def aktif():
+    return AKTIF
+
+def catat(nama, detik):
+    """Mencatat satu durasi (detik) untuk tahap `nama`."""
+    with _lock:
+        histogram = _histogram.get(nama)
+        if histogram is None:
+            histogram = _histogram[nama] = _Histogram()
+        histogram.tambah(detik)
+    if PATH_DUMP and _dumper is None:
+        mulai_dump_berkala()
+
+def ukur(nama):
+    """Dekorator: mencatat durasi setiap pemanggilan fungsi sebagai tahap `nama` (jika aktif)."""
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            if not AKTIF:
+                return fungsi(*args, **kwargs)
+            mulai = time.perf_counter()
+            try:
+                return fungsi(*args, **kwargs)
+            finally:
+                catat(nama, time.perf_counter() - mulai)
+        return pembungkus
+    return dekorator
+
+@contextlib.contextmanager
+def _blok_aktif(nama):
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        catat(nama, time.perf_counter() - mulai)
+
+_BLOK_KOSONG = contextlib.nullcontext()
+
+def blok(nama):
+    """Context manager: mencatat durasi blok `with` sebagai tahap `nama` (jika aktif)."""
+    return _blok_aktif(nama) if AKTIF else _BLOK_KOSONG
+
+def daftarkan_cache(nama, fungsi_statistik):
+    """
+    Mendaftarkan sumber statistik cache. `fungsi_statistik()` mengembalikan dict
+    dengan 'hits', 'misses', dan 'hit_rate' (mis. CachePrediksi.statistik).
+    Pendaftaran ulang dengan nama yang sama menggantikan sumber sebelumnya.
+    """
+    with _lock:
+        _sumber_cache[nama] = fungsi_statistik
+
+def rss():
+    """(RSS saat ini, RSS puncak) proses dalam byte; None jika tidak dapat dibaca."""
+    sekarang = puncak = None
+    try:
+        with open('/proc/self/status') as f:
+            for baris in f:
+                if baris.startswith('VmRSS:'):
+                    sekarang = int(baris.split()[1]) * 1024
+                elif baris.startswith('VmHWM:'):
+                    puncak = int(baris.split()[1]) * 1024
+    except OSError:
+        pass
+    if puncak is None:
+        try:
+            import resource
+            maks = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            puncak = maks if sys.platform == 'darwin' else maks * 1024  # macOS: byte, Linux: KB
+        except (ImportError, OSError):
+            pass
+    return sekarang, puncak
+
+def ringkasan():
+    """Semua metrik dalam satu dict yang siap ditulis sebagai JSON."""
+    with _lock:
+        histogram = {nama: (h.jumlah, h.total, h.maks, list(h.bucket), h.kuantil(0.5), h.kuantil(0.9), h.kuantil(0.99))
+                     for nama, h in _histogram.items()}
+        sumber_cache = dict(_sumber_cache)
+    tahap = {}
+    for nama, (jumlah, total, maks, bucket, p50, p90, p99) in sorted(histogram.items()):
+        tahap[nama] = {
+            'jumlah': jumlah, 'total_detik': total, 'rata_rata_detik': total / jumlah if jumlah else None,
+            'p50_detik': p50, 'p90_detik': p90, 'p99_detik': p99, 'maks_detik': maks,
+            'bucket': dict(zip([str(b) for b in BATAS_HISTOGRAM] + ['+Inf'], bucket)),
+        }
+    cache = {}
+    for nama, fungsi in sorted(sumber_cache.items()):
+        try:
+            cache[nama] = fungsi()
+        except Exception as e:
+            cache[nama] = {'galat': str(e)}
+    rss_sekarang, rss_puncak = rss()
+    return {'aktif': AKTIF, 'waktu': time.time(), 'pid': os.getpid(), 'rss_byte': rss_sekarang,
+            'rss_puncak_byte': rss_puncak, 'tahap': tahap, 'cache': cache}
+
+def _label(nilai):
+    return str(nilai).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_prometheus(data=None):
+    """Ringkasan dalam format teks eksposisi Prometheus."""
+    data = data or ringkasan()
+    p = PREFIKS_METRIK
+    baris = [f"# TYPE {p}_tahap_detik histogram"]
+    for nama, tahap in data['tahap'].items():
+        kumulatif = 0
+        for batas, n in tahap['bucket'].items():
+            kumulatif += n
+            baris.append(f'{p}_tahap_detik_bucket{{tahap="{_label(nama)}",le="{batas}"}} {kumulatif}')
+        baris.append(f'{p}_tahap_detik_sum{{tahap="{_label(nama)}"}} {tahap["total_detik"]}')
+        baris.append(f'{p}_tahap_detik_count{{tahap="{_label(nama)}"}} {tahap["jumlah"]}')
+    for jenis, kunci, tipe in (('hits_total', 'hits', 'counter'), ('misses_total', 'misses', 'counter'),
+                               ('hit_rate', 'hit_rate', 'gauge')):
+        baris.append(f"# TYPE {p}_cache_{jenis} {tipe}")
+        for nama, statistik in data['cache'].items():
+            if kunci in statistik:
+                baris.append(f'{p}_cache_{jenis}{{cache="{_label(nama)}"}} {statistik[kunci]}')
+    for nama, kunci in (('rss_byte', 'rss_byte'), ('rss_puncak_byte', 'rss_puncak_byte')):
+        if data[kunci] is not None:
+            baris += [f"# TYPE {p}_{nama} gauge", f"{p}_{nama} {data[kunci]}"]
+    return '\n'.join(baris) + '\n'
+
+def tulis_dump(path):
+    """Menulis ringkasan ke `path` secara atomik: teks Prometheus untuk *.prom, selain itu JSON."""
+    data = ringkasan()
+    isi = format_prometheus(data) if path.endswith('.prom') else json.dumps(data, indent=2)
+    with tulis_atomik(path) as f:
+        f.write(isi)
+
+def mulai_dump_berkala(path=None, interval=None):
+    """Memulai thread yang menulis dump setiap `interval` detik (sekali per proses)."""
+    global _dumper
+    path = path or PATH_DUMP
+    interval = interval or INTERVAL_DUMP
+    with _lock:
+        if _dumper is not None or not path:
+            return
+        def jalankan():
+            while True:
+                time.sleep(interval)
+                try:
+                    tulis_dump(path)
+                except OSError:
+                    pass  # Dicoba lagi pada interval berikutnya
+        _dumper = threading.Thread(target=jalankan, name="instrumentasi-dump", daemon=True)
+        _dumper.start()
+
+def reset():
+    """Menghapus semua histogram yang sudah tercatat."""
+    with _lock:
+        _histogram.clear()
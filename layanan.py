@@ -0,0 +1,287 @@
+# layanan.py
+"""
+Layanan HTTP/JSON lokal untuk prediksi sentimen dan topik.
+
+Model dimuat sekali saat layanan dimulai. Permintaan yang datang bersamaan
+dikumpulkan menjadi micro-batch (maksimal `ukuran_batch` teks, menunggu
+paling lama `tunggu_maks_ms` sejak permintaan pertama), lalu dinilai dengan
+satu kali pemanggilan LSTM dan satu kali inferensi LDA batch. Versi model
+LDA yang baru diterbitkan (lihat pelatihan_lda.py) dimuat di antara batch
+tanpa perlu me-restart layanan.
+
+    python layanan.py --port 8502
+
+Endpoint:
+    POST /prediksi   {"teks": "..."} atau {"teks": ["...", "..."]}
+    GET  /metrik     jumlah permintaan, throughput, latensi p50/p99, ukuran batch, cache
+    GET  /kesehatan  {"status": "ok"}
+    GET  /diagnostik             latensi per tahap, cache, dan RSS (lihat instrumentasi.py)
+    GET  /diagnostik/prometheus  sama, dalam format teks Prometheus
+"""
+
+import argparse
+import json
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+import instrumentasi
+from instrumentasi import ukur
+
+UKURAN_BATCH_LAYANAN = 32
+TUNGGU_MAKS_MS = 5.0
+JUMLAH_SAMPEL_LATENSI = 10000
+INTERVAL_CEK_VERSI_LDA = 5.0
+
+class StatistikLayanan:
+    """Penghitung permintaan dan latensi (jendela sampel terbaru) yang aman dipakai antar thread."""
+
+    def __init__(self, jumlah_sampel=JUMLAH_SAMPEL_LATENSI):
+        self._lock = threading.Lock()
+        self._latensi = deque(maxlen=jumlah_sampel)
+        self._waktu = deque(maxlen=jumlah_sampel)
+        self.mulai = time.monotonic()
+        self.jumlah_permintaan = 0
+        self.jumlah_teks = 0
+        self.jumlah_batch = 0
+        self.jumlah_galat = 0
+
+    def catat_permintaan(self, latensi, jumlah_teks):
+        with self._lock:
+            self._latensi.append(latensi)
+            self._waktu.append(time.monotonic())
+            self.jumlah_permintaan += 1
+            self.jumlah_teks += jumlah_teks
+
+    def catat_batch(self):
+        with self._lock:
+            self.jumlah_batch += 1
+
+    def catat_galat(self):
+        with self._lock:
+            self.jumlah_galat += 1
+
+    def ringkasan(self):
+        with self._lock:
+            latensi = np.array(self._latensi) * 1000
+            waktu = np.array(self._waktu)
+            sekarang = time.monotonic()
+            durasi = sekarang - self.mulai
+            # Throughput terkini: permintaan dalam 10 detik terakhir
+            terkini = int((waktu >= sekarang - 10).sum()) / min(10.0, max(durasi, 1e-9))
+            return {
+                'jumlah_permintaan': self.jumlah_permintaan,
+                'jumlah_teks': self.jumlah_teks,
+                'jumlah_batch': self.jumlah_batch,
+                'jumlah_galat': self.jumlah_galat,
+                'rata_rata_teks_per_batch': self.jumlah_teks / self.jumlah_batch if self.jumlah_batch else 0.0,
+                'permintaan_per_detik': self.jumlah_permintaan / durasi if durasi else 0.0,
+                'permintaan_per_detik_10s': terkini,
+                'latensi_p50_ms': float(np.percentile(latensi, 50)) if len(latensi) else None,
+                'latensi_p99_ms': float(np.percentile(latensi, 99)) if len(latensi) else None,
+                'waktu_aktif_detik': durasi,
+            }
+
+class PenilaiMicroBatch:
+    """
+    Mengumpulkan teks dari banyak permintaan menjadi micro-batch dan menilainya
+    di satu thread pekerja. `nilai(daftar_teks)` dapat dipanggil dari thread
+    mana pun dan menunggu hingga hasilnya tersedia.
+
+    Jika `versi_lda` diberikan, versi aktif model LDA diperiksa berkala dan
+    versi baru dimuat oleh thread pekerja di antara dua batch.
+    """
+
+    def __init__(self, aset_prep, model_sentimen, model_lda, ukuran_batch=UKURAN_BATCH_LAYANAN,
+                 tunggu_maks_ms=TUNGGU_MAKS_MS, statistik=None, cache=None, versi_lda=None):
+        self.aset_prep = aset_prep
+        self.model_sentimen = model_sentimen
+        self.model_lda = model_lda
+        self.ukuran_batch = ukuran_batch
+        self.tunggu_maks = tunggu_maks_ms / 1000
+        self.statistik = statistik or StatistikLayanan()
+        self.cache = cache
+        self.versi_lda = versi_lda
+        self._cek_versi_terakhir = time.monotonic()
+        self._antrean = queue.Queue()
+        self._pekerja = threading.Thread(target=self._jalankan, name="penilai-micro-batch", daemon=True)
+        self._pekerja.start()
+
+    def nilai(self, daftar_teks):
+        """Hasil penilaian untuk setiap teks (list dict), dengan urutan yang sama seperti input."""
+        futures = []
+        for teks in daftar_teks:
+            future = Future()
+            self._antrean.put((str(teks), future))
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _ambil_batch(self):
+        batch = [self._antrean.get()]
+        batas_waktu = time.monotonic() + self.tunggu_maks
+        while len(batch) < self.ukuran_batch:
+            sisa = batas_waktu - time.monotonic()
+            try:
+                batch.append(self._antrean.get(timeout=sisa) if sisa > 0 else self._antrean.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _jalankan(self):
+        while True:
+            batch = self._ambil_batch()
+            self._periksa_versi_lda()
+            try:
+                hasil = self._nilai_batch([teks for teks, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), item in zip(batch, hasil):
+                    future.set_result(item)
+            self.statistik.catat_batch()
+
+    def _periksa_versi_lda(self):
+        if self.versi_lda is None or time.monotonic() - self._cek_versi_terakhir < INTERVAL_CEK_VERSI_LDA:
+            return
+        self._cek_versi_terakhir = time.monotonic()
+        import prediksi
+
+        # Model LDA kecil (hitungan milidetik untuk dimuat), sehingga cukup dimuat
+        # di thread pekerja tanpa perlu sinkronisasi dengan batch yang sedang berjalan
+        try:
+            versi = prediksi.versi_lda_aktif()
+            if versi == self.versi_lda:
+                return
+            self.model_lda = prediksi.muat_model_lda(versi)
+        except Exception as e:
+            print(f"Gagal memuat model LDA versi baru, versi {self.versi_lda} tetap dipakai: {e}", file=sys.stderr)
+            return
+        if self.cache is not None:
+            self.cache = prediksi.cache_prediksi(versi)
+        self.versi_lda = versi
+
+    @ukur('layanan_batch')
+    def _nilai_batch(self, daftar_teks):
+        import prediksi
+
+        model, tokenizer, label_encoder = self.model_sentimen
+        model_lda, dictionary_lda = self.model_lda
+        hasil_prep = self.aset_prep.pipeline.proses_batch(daftar_teks)
+        # Ukuran batch LSTM selalu sama (ukuran_batch) agar bentuk input model tetap
+        sentimen = prediksi.prediksi_sentimen_teks_bersih([p.teks_lstm for p in hasil_prep], model, tokenizer,
+                                                          label_encoder, self.ukuran_batch, self.cache)
+        topik = prediksi.prediksi_topik_token([p.token_lda for p in hasil_prep], model_lda, dictionary_lda,
+                                              self.aset_prep.label_topik, self.cache)
+        return [{'sentimen': label, 'skor_sentimen': round(skor, 3),
+                 'deskripsi_topik': deskripsi, 'detail_topik': detail, 'probabilitas_topik': round(p, 3)}
+                for (label, skor), (deskripsi, detail, p) in zip(sentimen, topik)]
+
+class _PenanganHTTP(BaseHTTPRequestHandler):
+    penilai = None  # diisi oleh buat_server
+
+    def _kirim(self, status, data, tipe):
+        self.send_response(status)
+        self.send_header('Content-Type', tipe)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _kirim_json(self, status, isi):
+        self._kirim(status, json.dumps(isi, ensure_ascii=False).encode('utf-8'), 'application/json; charset=utf-8')
+
+    def do_GET(self):
+        if self.path == '/kesehatan':
+            self._kirim_json(200, {'status': 'ok'})
+        elif self.path == '/metrik':
+            metrik = self.penilai.statistik.ringkasan()
+            metrik['versi_lda'] = self.penilai.versi_lda
+            if self.penilai.cache is not None:
+                metrik['cache'] = self.penilai.cache.statistik()
+            self._kirim_json(200, metrik)
+        elif self.path == '/diagnostik':
+            self._kirim_json(200, instrumentasi.ringkasan())
+        elif self.path == '/diagnostik/prometheus':
+            self._kirim(200, instrumentasi.format_prometheus().encode('utf-8'), 'text/plain; version=0.0.4; charset=utf-8')
+        else:
+            self._kirim_json(404, {'galat': f"Endpoint tidak dikenal: {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/prediksi':
+            self._kirim_json(404, {'galat': f"Endpoint tidak dikenal: {self.path}"})
+            return
+        mulai = time.perf_counter()
+        try:
+            isi = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            teks = isi['teks']
+            if not (isinstance(teks, str) or isinstance(teks, list) and all(isinstance(t, str) for t in teks)):
+                raise TypeError("'teks' harus berupa string atau list string")
+        except (ValueError, KeyError, TypeError):
+            self.penilai.statistik.catat_galat()
+            self._kirim_json(400, {'galat': 'Body harus berupa JSON {"teks": "..."} atau {"teks": ["...", ...]}.'})
+            return
+
+        tunggal = isinstance(teks, str)
+        try:
+            hasil = self.penilai.nilai([teks] if tunggal else teks)
+        except Exception as e:
+            self.penilai.statistik.catat_galat()
+            self._kirim_json(500, {'galat': f"Terjadi kesalahan saat prediksi: {e}"})
+            return
+        self._kirim_json(200, {'hasil': hasil[0] if tunggal else hasil})
+        self.penilai.statistik.catat_permintaan(time.perf_counter() - mulai, len(hasil))
+
+    def log_message(self, format, *args):
+        pass  # Log per permintaan dimatikan; ringkasan tersedia di /metrik
+
+class _ServerLayanan(ThreadingHTTPServer):
+    # Antrean koneksi default (5) terlalu kecil untuk ratusan klien bersamaan
+    request_queue_size = 256
+
+def buat_server(penilai, host='127.0.0.1', port=8502):
+    """ThreadingHTTPServer yang meneruskan permintaan ke `penilai` (PenilaiMicroBatch)."""
+    penangan = type('PenanganHTTP', (_PenanganHTTP,), {'penilai': penilai})
+    return _ServerLayanan((host, port), penangan)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Layanan HTTP lokal untuk prediksi sentimen dan topik.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--ukuran-batch", type=int, default=UKURAN_BATCH_LAYANAN,
+                        help="Jumlah teks maksimal per micro-batch.")
+    parser.add_argument("--tunggu-maks-ms", type=float, default=TUNGGU_MAKS_MS,
+                        help="Waktu tunggu maksimal (ms) untuk mengisi micro-batch.")
+    parser.add_argument("--tanpa-cache", action="store_true",
+                        help="Nilai semua teks dengan model tanpa memakai cache hasil prediksi.")
+    parser.add_argument("--instrumentasi", action="store_true",
+                        help="Catat latensi per tahap (sama dengan INSTRUMENTASI=1).")
+    args = parser.parse_args(argv)
+    if args.instrumentasi:
+        instrumentasi.aktifkan(True)
+
+    import prediksi
+
+    mulai = time.perf_counter()
+    versi_lda = prediksi.versi_lda_aktif()
+    penilai = PenilaiMicroBatch(prediksi.muat_aset_pra_pemrosesan(), prediksi.muat_model_sentimen(),
+                                prediksi.muat_model_lda(versi_lda), args.ukuran_batch, args.tunggu_maks_ms,
+                                cache=None if args.tanpa_cache else prediksi.cache_prediksi(versi_lda),
+                                versi_lda=versi_lda)
+    server = buat_server(penilai, args.host, args.port)
+    print(f"Model dimuat dalam {time.perf_counter() - mulai:.1f} detik. "
+          f"Layanan berjalan di http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
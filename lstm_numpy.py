@@ -0,0 +1,316 @@
+# lstm_numpy.py
+"""
+Runtime inferensi NumPy untuk model sentimen Stacked Bi-LSTM.
+
+Model Keras (.h5) dikonversi sekali menjadi direktori berisi bobot (*.npy)
+dan spesifikasi lapisan (JSON). Inferensi kemudian hanya membutuhkan NumPy,
+tanpa mengimpor TensorFlow, sehingga jauh lebih ringan untuk proses pekerja.
+Lapisan yang didukung: Embedding (termasuk mask_zero), LSTM, Bidirectional(LSTM),
+Dense, serta Dropout/SpatialDropout1D (identitas saat inferensi).
+
+Mengonversi model dan memeriksa kesamaan hasilnya dengan Keras:
+
+    python lstm_numpy.py
+    python lstm_numpy.py --csv hasil_terstruktur_diperbaiki.csv
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from berkas import path_atomik
+from cache_prediksi import sidik_file
+
+DIR_MODEL_NUMPY = "assets/models/model_sentimen_lstm_numpy"
+NAMA_SPESIFIKASI = "spesifikasi.json"
+VERSI_FORMAT = 1
+TOLERANSI_PARITAS = 1e-4
+
+# ==============================================================================
+# FUNGSI AKTIVASI
+# ==============================================================================
+
+def _sigmoid(x):
+    return 0.5 * (np.tanh(0.5 * x) + 1.0)
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+AKTIVASI = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'tanh': np.tanh,
+    'sigmoid': _sigmoid,
+    'hard_sigmoid': lambda x: np.clip(x / 6.0 + 0.5, 0.0, 1.0),
+    'softmax': _softmax,
+}
+
+def _aktivasi(nama):
+    if nama not in AKTIVASI:
+        raise ValueError(f"Aktivasi '{nama}' belum didukung oleh runtime NumPy.")
+    return AKTIVASI[nama]
+
+# ==============================================================================
+# LAPISAN
+# ==============================================================================
+
+def _lstm(x, mask, bobot, konfigurasi):
+    """
+    Satu lapisan LSTM atas x (batch, waktu, fitur). Mengikuti Keras: urutan gerbang
+    i, f, c, o; langkah yang di-mask tidak mengubah state.
+    """
+    kernel, kernel_rekuren, bias = bobot
+    unit = konfigurasi['units']
+    aktivasi = _aktivasi(konfigurasi['activation'])
+    aktivasi_rekuren = _aktivasi(konfigurasi['recurrent_activation'])
+    mundur = konfigurasi['go_backwards']
+
+    if mundur:
+        x = x[:, ::-1]
+        mask = None if mask is None else mask[:, ::-1]
+    jumlah_batch, jumlah_waktu, _ = x.shape
+    # Proyeksi input untuk semua langkah waktu sekaligus
+    proyeksi = x @ kernel + bias
+    h = np.zeros((jumlah_batch, unit), dtype=x.dtype)
+    c = np.zeros((jumlah_batch, unit), dtype=x.dtype)
+    keluaran = np.empty((jumlah_batch, jumlah_waktu, unit), dtype=x.dtype) if konfigurasi['return_sequences'] else None
+
+    for t in range(jumlah_waktu):
+        z = proyeksi[:, t] + h @ kernel_rekuren
+        i = aktivasi_rekuren(z[:, :unit])
+        f = aktivasi_rekuren(z[:, unit:2 * unit])
+        c_baru = f * c + i * aktivasi(z[:, 2 * unit:3 * unit])
+        o = aktivasi_rekuren(z[:, 3 * unit:])
+        h_baru = o * aktivasi(c_baru)
+        if mask is None:
+            h, c = h_baru, c_baru
+            if keluaran is not None:
+                keluaran[:, t] = h
+        else:
+            m = mask[:, t, np.newaxis]
+            h = np.where(m, h_baru, h)
+            c = np.where(m, c_baru, c)
+            if keluaran is not None:
+                keluaran[:, t] = np.where(m, h_baru, 0.0) if konfigurasi['zero_output_for_mask'] else h
+
+    # Seperti Keras, keluaran go_backwards tetap dalam urutan pemrosesan (terbalik)
+    return h if keluaran is None else keluaran
+
+def _bidirectional(x, mask, bobot, konfigurasi):
+    maju = _lstm(x, mask, bobot[:3], konfigurasi['forward'])
+    mundur = _lstm(x, mask, bobot[3:], konfigurasi['backward'])
+    if konfigurasi['backward']['return_sequences']:
+        mundur = mundur[:, ::-1]  # Kembalikan ke urutan waktu asli
+    mode = konfigurasi['merge_mode']
+    if mode == 'concat':
+        return np.concatenate([maju, mundur], axis=-1)
+    if mode == 'sum':
+        return maju + mundur
+    if mode == 'mul':
+        return maju * mundur
+    if mode == 'ave':
+        return (maju + mundur) / 2
+    raise ValueError(f"merge_mode '{mode}' belum didukung oleh runtime NumPy.")
+
+def _dense(x, bobot, konfigurasi):
+    y = x @ bobot[0]
+    if konfigurasi['use_bias']:
+        y = y + bobot[1]
+    return _aktivasi(konfigurasi['activation'])(y)
+
+# ==============================================================================
+# MODEL
+# ==============================================================================
+
+class ModelLSTMNumpy:
+    """
+    Pengganti model Keras untuk inferensi: menyediakan `input_shape` dan
+    `predict_on_batch` seperti keras.Model, sehingga bisa langsung dipakai
+    oleh prediksi.prediksi_sentimen_teks_bersih.
+    """
+
+    def __init__(self, spesifikasi, bobot):
+        self.spesifikasi = spesifikasi
+        self.bobot = bobot
+        self.input_shape = (None, spesifikasi['maxlen'])
+
+    def predict_on_batch(self, x):
+        x = np.asarray(x)
+        mask = None
+        for i, lapisan in enumerate(self.spesifikasi['lapisan']):
+            jenis, konfigurasi = lapisan['jenis'], lapisan['konfigurasi']
+            bobot = self.bobot[i]
+            if jenis == 'Embedding':
+                mask = (x != 0) if konfigurasi['mask_zero'] else None
+                x = bobot[0][x]
+            elif jenis == 'LSTM':
+                x = _lstm(x, mask, bobot, konfigurasi)
+                mask = mask if konfigurasi['return_sequences'] else None
+            elif jenis == 'Bidirectional':
+                x = _bidirectional(x, mask, bobot, konfigurasi)
+                mask = mask if konfigurasi['forward']['return_sequences'] else None
+            elif jenis == 'Dense':
+                x = _dense(x, bobot, konfigurasi)
+            # Dropout/SpatialDropout1D: identitas saat inferensi
+        return x
+
+    predict = predict_on_batch
+
+# ==============================================================================
+# KONVERSI, SIMPAN, MUAT
+# ==============================================================================
+
+LAPISAN_IDENTITAS = {'InputLayer', 'Dropout', 'SpatialDropout1D'}
+
+def _konfigurasi_lstm(lapisan):
+    konfigurasi = lapisan.get_config()
+    if not konfigurasi.get('use_bias', True):
+        raise ValueError("LSTM tanpa bias belum didukung oleh runtime NumPy.")
+    return {
+        'units': konfigurasi['units'],
+        'activation': konfigurasi['activation'],
+        'recurrent_activation': konfigurasi['recurrent_activation'],
+        'return_sequences': konfigurasi['return_sequences'],
+        'go_backwards': konfigurasi['go_backwards'],
+        'zero_output_for_mask': bool(getattr(lapisan, 'zero_output_for_mask', False)),
+    }
+
+def konversi_model_keras(model):
+    """Mengubah model Keras menjadi (spesifikasi, bobot) untuk ModelLSTMNumpy."""
+    daftar_lapisan = []
+    bobot = []
+    for lapisan in model.layers:
+        jenis = type(lapisan).__name__
+        if jenis in LAPISAN_IDENTITAS:
+            continue
+        if jenis == 'Embedding':
+            konfigurasi = {'mask_zero': bool(lapisan.get_config().get('mask_zero', False))}
+        elif jenis == 'LSTM':
+            konfigurasi = _konfigurasi_lstm(lapisan)
+        elif jenis == 'Bidirectional':
+            if type(lapisan.forward_layer).__name__ != 'LSTM':
+                raise ValueError(f"Bidirectional({type(lapisan.forward_layer).__name__}) belum didukung.")
+            konfigurasi = {'forward': _konfigurasi_lstm(lapisan.forward_layer),
+                           'backward': _konfigurasi_lstm(lapisan.backward_layer),
+                           'merge_mode': lapisan.merge_mode}
+        elif jenis == 'Dense':
+            konfigurasi = {'activation': lapisan.get_config()['activation'],
+                           'use_bias': lapisan.get_config().get('use_bias', True)}
+        else:
+            raise ValueError(f"Lapisan {jenis} ('{lapisan.name}') belum didukung oleh runtime NumPy.")
+        daftar_lapisan.append({'jenis': jenis, 'nama': lapisan.name, 'konfigurasi': konfigurasi})
+        bobot.append([np.asarray(w, dtype=np.float32) for w in lapisan.get_weights()])
+
+    spesifikasi = {'versi': VERSI_FORMAT, 'maxlen': int(model.input_shape[1]), 'lapisan': daftar_lapisan}
+    return spesifikasi, bobot
+
+def simpan_model_numpy(spesifikasi, bobot, direktori=DIR_MODEL_NUMPY):
+    """Menyimpan bobot (satu file .npy per tensor) dan spesifikasi JSON secara atomik."""
+    spesifikasi = dict(spesifikasi)
+    spesifikasi['berkas_bobot'] = []
+    with path_atomik(direktori) as sementara:
+        os.makedirs(sementara)
+        for i, bobot_lapisan in enumerate(bobot):
+            nama_berkas = []
+            for j, w in enumerate(bobot_lapisan):
+                nama = f"lapisan{i:02d}_{j}.npy"
+                np.save(os.path.join(sementara, nama), w)
+                nama_berkas.append(nama)
+            spesifikasi['berkas_bobot'].append(nama_berkas)
+        with open(os.path.join(sementara, NAMA_SPESIFIKASI), 'w', encoding='utf-8') as f:
+            json.dump(spesifikasi, f, indent=2)
+
+def baca_spesifikasi(direktori=DIR_MODEL_NUMPY):
+    with open(os.path.join(direktori, NAMA_SPESIFIKASI), encoding='utf-8') as f:
+        return json.load(f)
+
+def muat_model_numpy(direktori=DIR_MODEL_NUMPY, mmap=False):
+    """
+    Memuat model hasil konversi. Melempar ValueError jika formatnya tidak dikenal.
+    Dengan `mmap`, bobot dibuka sebagai memmap read-only: halaman file dibagi
+    bersama oleh semua proses yang memuat model yang sama dan baru dibaca dari
+    disk saat disentuh.
+    """
+    spesifikasi = baca_spesifikasi(direktori)
+    if spesifikasi.get('versi') != VERSI_FORMAT:
+        raise ValueError(f"Versi format model NumPy tidak dikenal: {spesifikasi.get('versi')}")
+    bobot = [[np.load(os.path.join(direktori, nama), mmap_mode='r' if mmap else None, allow_pickle=False)
+              for nama in berkas]
+             for berkas in spesifikasi['berkas_bobot']]
+    return ModelLSTMNumpy(spesifikasi, bobot)
+
+# ==============================================================================
+# PEMERIKSAAN PARITAS
+# ==============================================================================
+
+def cek_paritas(model_keras, model_numpy, input_batch, ukuran_batch=256):
+    """
+    Membandingkan probabilitas keluaran kedua model untuk input yang sama.
+    Mengembalikan dict berisi selisih absolut maksimum dan persentase label yang sama.
+    """
+    input_batch = np.asarray(input_batch, dtype=np.int32)
+    selisih_maks = 0.0
+    label_sama = 0
+    for i in range(0, len(input_batch), ukuran_batch):
+        batch = input_batch[i:i + ukuran_batch]
+        keras_prob = np.asarray(model_keras.predict_on_batch(batch))
+        numpy_prob = model_numpy.predict_on_batch(batch)
+        selisih_maks = max(selisih_maks, float(np.abs(keras_prob - numpy_prob).max()))
+        label_sama += int((keras_prob.argmax(axis=1) == numpy_prob.argmax(axis=1)).sum())
+    return {'jumlah': len(input_batch), 'selisih_maks': selisih_maks,
+            'label_sama': label_sama / len(input_batch) if len(input_batch) else 1.0}
+
+def _input_uji(model, tokenizer, path_csv=None, jumlah_acak=512, seed=0):
+    """Input uji: sekuens acak (termasuk panjang 0 dan maksimum) dan, opsional, teks dari CSV."""
+    maxlen = model.input_shape[1]
+    jumlah_kata = min(tokenizer.num_words or len(tokenizer.word_index) + 1, len(tokenizer.word_index) + 1)
+    rng = np.random.default_rng(seed)
+    panjang = rng.integers(0, maxlen + 1, jumlah_acak)
+    panjang[:2] = [0, maxlen]
+    acak = np.zeros((jumlah_acak, maxlen), dtype=np.int32)
+    for i, n in enumerate(panjang):
+        acak[i, :n] = rng.integers(1, jumlah_kata, n)
+    if not path_csv:
+        return acak
+
+    import pandas as pd
+    import prediksi
+
+    aset_prep = prediksi.muat_aset_pra_pemrosesan()
+    kolom = 'pecahan_kalimat' if 'pecahan_kalimat' in pd.read_csv(path_csv, nrows=0).columns else 'ulasan_lengkap'
+    teks = pd.read_csv(path_csv, usecols=[kolom])[kolom].fillna('').astype(str).unique()
+    teks_bersih = [p.teks_lstm for p in aset_prep.pipeline.proses_batch(teks)]
+    return np.concatenate([acak, tokenizer.enkode_batch(teks_bersih, maxlen)])
+
+def main(argv=None):
+    import prediksi
+
+    parser = argparse.ArgumentParser(
+        description="Mengonversi model sentimen Keras ke runtime NumPy dan memeriksa kesamaan hasilnya.")
+    parser.add_argument("--model", default=prediksi.PATH_MODEL_SENTIMEN, help="File model Keras (.h5).")
+    parser.add_argument("-o", "--output", default=DIR_MODEL_NUMPY, help="Direktori model NumPy.")
+    parser.add_argument("--csv", default=None, help="CSV ulasan yang juga dipakai sebagai input uji paritas.")
+    parser.add_argument("--toleransi", type=float, default=TOLERANSI_PARITAS,
+                        help="Selisih probabilitas maksimum yang diizinkan.")
+    args = parser.parse_args(argv)
+
+    model_keras, tokenizer, _ = prediksi.muat_model_sentimen(backend='keras', path_model=args.model)
+    spesifikasi, bobot = konversi_model_keras(model_keras)
+    spesifikasi['sidik_sumber'] = sidik_file(args.model)
+    model_numpy = ModelLSTMNumpy(spesifikasi, bobot)
+
+    hasil = cek_paritas(model_keras, model_numpy, _input_uji(model_keras, tokenizer, args.csv))
+    print(f"Paritas atas {hasil['jumlah']:,} input: selisih maksimum {hasil['selisih_maks']:.2e}, "
+          f"label sama {hasil['label_sama']:.2%}")
+    if hasil['selisih_maks'] > args.toleransi:
+        print(f"Selisih melebihi toleransi {args.toleransi:g}; model NumPy tidak disimpan.", file=sys.stderr)
+        sys.exit(1)
+    simpan_model_numpy(spesifikasi, bobot, args.output)
+    print(f"Model NumPy disimpan di {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+# memori_model.py
+"""
+Mengukur memori per proses pekerja yang memuat model yang sama.
+
+N proses (spawn, seperti proses pekerja Streamlit/layanan) memuat model
+sentimen dan LDA lewat prediksi.muat_model_*, menjalankan satu prediksi, lalu
+membaca semua bobot sekali agar seluruh halamannya resident (kondisi pekerja
+yang sudah lama berjalan). Pengukuran dilakukan setelah semua pekerja selesai
+memuat, sehingga halaman bersama benar-benar terbagi. Untuk setiap pekerja
+dilaporkan RSS dan PSS (RSS dengan halaman bersama dibagi rata antarproses),
+total dan bagian yang berasal dari file model yang di-mmap.
+
+Dengan mmap, PSS file model per pekerja turun menjadi sekitar ukuran_bobot / N
+dan total PSS semua pekerja hanya memuat satu salinan bobot:
+
+    python memori_model.py --pekerja 4
+    python memori_model.py --pekerja 4 --bandingkan   # dengan dan tanpa mmap
+    python memori_model.py --pekerja 4 --cek          # exit 1 jika bobot tidak terbagi
+
+Membutuhkan /proc/<pid>/smaps (Linux).
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+import numpy as np
+
+TOLERANSI_BERBAGI = 0.1
+
+def baca_smaps(awalan_path=()):
+    """
+    Memori proses ini dari /proc/self/smaps dalam byte: {'rss', 'pss'} untuk
+    seluruh proses dan {'rss_model', 'pss_model'} untuk mapping file yang
+    path-nya diawali salah satu `awalan_path`.
+    """
+    hasil = {'rss': 0, 'pss': 0, 'rss_model': 0, 'pss_model': 0}
+    cocok = False
+    with open('/proc/self/smaps') as f:
+        for baris in f:
+            bagian = baris.split()
+            if not bagian[0].endswith(':'):
+                # Baris judul mapping: alamat izin offset perangkat inode [path]
+                cocok = len(bagian) >= 6 and bagian[5].startswith(awalan_path) if awalan_path else False
+            elif bagian[0] in ('Rss:', 'Pss:'):
+                kunci = bagian[0][:-1].lower()
+                nilai = int(bagian[1]) * 1024
+                hasil[kunci] += nilai
+                if cocok:
+                    hasil[f'{kunci}_model'] += nilai
+    return hasil
+
+def _bobot_array(model_sentimen, model_lda):
+    model, _, _ = model_sentimen
+    lda, _ = model_lda
+    array = [w for lapisan in getattr(model, 'bobot', []) for w in lapisan]
+    return array + [lda.expElogbeta]
+
+def _pekerja(mmap, path_model_numpy, backend, awalan_path, siap, selesai, antrean):
+    import prediksi
+
+    prediksi.MMAP_MODEL = mmap
+    if path_model_numpy:
+        prediksi.PATH_MODEL_SENTIMEN_NUMPY = path_model_numpy
+    model_sentimen = prediksi.muat_model_sentimen(backend)
+    model_lda = prediksi.muat_model_lda()
+    model, tokenizer, label_encoder = model_sentimen
+    lda, dictionary = model_lda
+    prediksi.prediksi_sentimen_teks_bersih(["aplikasi bantu bayar pajak"], model, tokenizer, label_encoder, 1)
+    prediksi.prediksi_topik_token([["bayar", "pajak"]], lda, dictionary, prediksi.LABEL_TOPIK)
+    # Menyentuh setiap halaman bobot, seperti pekerja yang sudah melayani banyak teks
+    ukuran_bobot = 0
+    for w in _bobot_array(model_sentimen, model_lda):
+        float(np.sum(w))
+        ukuran_bobot += w.nbytes
+
+    siap.wait(timeout=600)
+    antrean.put(dict(baca_smaps(awalan_path), pid=os.getpid(), ukuran_bobot=ukuran_bobot,
+                     backend=type(model).__name__))
+    selesai.wait()
+
+def ukur_pekerja(jumlah_pekerja, mmap=True, path_model_numpy=None, backend=None):
+    """Menjalankan `jumlah_pekerja` proses pemuat model; list hasil baca_smaps per pekerja."""
+    import prediksi
+
+    awalan_path = tuple(os.path.abspath(p) for p in (
+        path_model_numpy or prediksi.PATH_MODEL_SENTIMEN_NUMPY, prediksi.DIR_MODEL_LDA,
+        os.path.dirname(prediksi.PATH_MODEL_LDA)))
+    konteks = multiprocessing.get_context('spawn')
+    siap = konteks.Barrier(jumlah_pekerja)
+    selesai = konteks.Barrier(jumlah_pekerja + 1)
+    antrean = konteks.Queue()
+    proses = [konteks.Process(target=_pekerja, args=(mmap, path_model_numpy, backend, awalan_path,
+                                                     siap, selesai, antrean))
+              for _ in range(jumlah_pekerja)]
+    for p in proses:
+        p.start()
+    try:
+        hasil = [antrean.get(timeout=600) for _ in proses]
+    finally:
+        # Pekerja baru keluar setelah semua hasil diterima agar halaman tetap terbagi saat diukur
+        selesai.wait(timeout=600)
+        for p in proses:
+            p.join()
+    return sorted(hasil, key=lambda h: h['pid'])
+
+def _mb(n):
+    return f"{n / 2**20:8.1f}"
+
+def _kb(n):
+    return f"{n / 2**10:10.0f}"
+
+def tampilkan(hasil, mmap):
+    print(f"\nmmap={'ya' if mmap else 'tidak'}, backend sentimen {hasil[0]['backend']}, "
+          f"bobot {hasil[0]['ukuran_bobot'] / 2**10:,.0f} KB per pekerja")
+    print(f"{'pid':>8} {'RSS MB':>8} {'PSS MB':>8} {'RSS model KB':>13} {'PSS model KB':>13}")
+    for h in hasil:
+        print(f"{h['pid']:>8} {_mb(h['rss'])} {_mb(h['pss'])}    {_kb(h['rss_model'])}    {_kb(h['pss_model'])}")
+    print(f"{'total':>8} {_mb(sum(h['rss'] for h in hasil))} {_mb(sum(h['pss'] for h in hasil))}    "
+          f"{_kb(sum(h['rss_model'] for h in hasil))}    {_kb(sum(h['pss_model'] for h in hasil))}")
+
+def cek_berbagi(hasil, toleransi=TOLERANSI_BERBAGI):
+    """
+    True jika halaman file model terbagi: total PSS model semua pekerja tidak
+    lebih dari satu salinan (RSS model terbesar) ditambah `toleransi`.
+    """
+    satu_salinan = max(h['rss_model'] for h in hasil)
+    return satu_salinan > 0 and sum(h['pss_model'] for h in hasil) <= satu_salinan * (1 + toleransi)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mengukur RSS/PSS per proses pekerja yang memuat model.")
+    parser.add_argument("--pekerja", type=int, default=4, help="Jumlah proses pekerja.")
+    parser.add_argument("--tanpa-mmap", action="store_true", help="Muat bobot penuh ke memori setiap pekerja.")
+    parser.add_argument("--bandingkan", action="store_true", help="Ukur dengan dan tanpa mmap.")
+    parser.add_argument("--backend-sentimen", choices=['keras', 'numpy', 'otomatis'], default=None,
+                        help="Backend model sentimen (default: BACKEND_SENTIMEN).")
+    parser.add_argument("--model-numpy", default=None, help="Direktori model sentimen NumPy.")
+    parser.add_argument("--cek", action="store_true",
+                        help="Exit 1 jika dengan mmap halaman file model tidak terbagi antarpekerja.")
+    args = parser.parse_args(argv)
+    if not os.path.exists('/proc/self/smaps'):
+        parser.error("Pengukuran membutuhkan /proc/self/smaps (Linux).")
+
+    daftar_mode = [True, False] if args.bandingkan else [not args.tanpa_mmap]
+    hasil_mode = {}
+    for mmap in daftar_mode:
+        hasil_mode[mmap] = ukur_pekerja(args.pekerja, mmap, args.model_numpy, args.backend_sentimen)
+        tampilkan(hasil_mode[mmap], mmap)
+    if args.bandingkan:
+        selisih = sum(h['pss'] for h in hasil_mode[False]) - sum(h['pss'] for h in hasil_mode[True])
+        print(f"\nmmap menghemat {selisih / 2**20:,.1f} MB PSS total untuk {args.pekerja} pekerja.")
+    if args.cek and True in hasil_mode:
+        if not cek_berbagi(hasil_mode[True]):
+            print("Halaman file model tidak terbagi antarpekerja.", file=sys.stderr)
+            sys.exit(1)
+        print("Halaman file model terbagi antarpekerja.")
+
+if __name__ == "__main__":
+    main()
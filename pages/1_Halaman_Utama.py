@@ -2,7 +2,7 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils import get_data # Standar impor
+from utils import get_data, get_aggregates, follow_dataset_updates # Standar impor
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -18,20 +18,25 @@ st.markdown("---")
 
 # --- MEMUAT DATA ---
 df = get_data()
+cube = get_aggregates()
 
 # --- VALIDASI DATA ---
 if df is None or df.empty:
     st.warning("Data tidak tersedia. Tidak dapat menampilkan ringkasan. Silakan periksa file data Anda.")
     st.stop() # Menghentikan eksekusi jika tidak ada data
 
+# Halaman dijalankan ulang otomatis saat ulasan baru masuk ke dataset
+follow_dataset_updates()
+
 # --- METRIK UTAMA ---
 st.header("Metrik Utama")
 col1, col2, col3, col4 = st.columns(4)
 
+# Jumlah dibaca dari kubus agregat, bukan dihitung ulang dari seluruh baris
 total_reviews = len(df)
-positif_count = int(df[df['sentimen'] == 'Positif'].shape[0])
-netral_count = int(df[df['sentimen'] == 'Netral'].shape[0])
-negatif_count = int(df[df['sentimen'] == 'Negatif'].shape[0])
+positif_count = cube.jumlah_per_sentimen('Positif')
+netral_count = cube.jumlah_per_sentimen('Netral')
+negatif_count = cube.jumlah_per_sentimen('Negatif')
 
 col1.metric("Total Ulasan", f"{total_reviews:,}")
 col2.metric("Sentimen Positif", f"{positif_count:,}", f"{positif_count/total_reviews:.1%}")
@@ -48,7 +53,7 @@ with col1:
     st.subheader("Distribusi Sentimen")
     # --- PERBAIKAN DI SINI ---
     # Biarkan pandas menamai kolomnya secara otomatis ('sentimen' dan 'count')
-    sentiment_counts = df['sentimen'].value_counts().reset_index()
+    sentiment_counts = cube.jumlah_sentimen().reset_index()
     
     # Gunakan nama kolom 'count' yang benar untuk parameter 'values'
     fig_pie = px.pie(sentiment_counts,
@@ -62,7 +67,7 @@ with col1:
 with col2:
     st.subheader("Topik Paling Umum")
     # Kode ini sudah benar, kita hanya standarisasi nama kolom untuk konsistensi
-    top_topics = df['deskripsi_topik'].value_counts().nlargest(10).reset_index()
+    top_topics = cube.jumlah_topik().nlargest(10).reset_index()
     fig_bar = px.bar(top_topics,
                      x='count', # <-- Menggunakan nama kolom yang benar
                      y='deskripsi_topik',
@@ -2,9 +2,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from wordcloud import WordCloud
-import matplotlib.pyplot as plt
-from utils import get_data # Standar impor
+import numpy as np
+from utils import get_data, get_aggregates, get_facet_index, get_dataset_version, get_wordcloud_png, follow_dataset_updates # Standar impor
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -20,38 +19,39 @@ st.markdown("---")
 
 # --- MEMUAT DATA ---
 df = get_data()
+cube = get_aggregates()
+facets = get_facet_index()
 
 # --- VALIDASI DATA ---
 if df is None or df.empty:
     st.warning("Data tidak tersedia. Tidak dapat menampilkan analisis topik.")
     st.stop()
 
+# Halaman dijalankan ulang otomatis saat ulasan baru masuk ke dataset
+follow_dataset_updates()
+
 # --- ANALISIS SENTIMEN PER TOPIK ---
 st.header("Distribusi Sentimen per Topik")
-all_topics = df['deskripsi_topik'].unique().tolist()
+all_topics = cube.topik
 selected_topic = st.selectbox("Pilih Topik Utama untuk dianalisis:", options=all_topics)
 
 if selected_topic:
-    df_topic = df[df['deskripsi_topik'] == selected_topic]
-    
     col1, col2 = st.columns([2, 1])
 
     with col1:
         st.subheader(f"Word Cloud untuk Topik: '{selected_topic}'")
-        text = " ".join(ulasan for ulasan in df_topic['Topik_Gabungan'].astype(str).dropna())
+        # Gambar PNG dari cache; dirender dari frekuensi kata per topik yang sudah dihitung
+        wordcloud_png = get_wordcloud_png(selected_topic, get_dataset_version(), width=800, height=400)
         
-        if text:
-            wordcloud = WordCloud(width=800, height=400, background_color='white', colormap='viridis', collocations=False).generate(text)
-            fig_wc, ax = plt.subplots(figsize=(10, 5))
-            ax.imshow(wordcloud, interpolation='bilinear')
-            ax.axis('off')
-            st.pyplot(fig_wc)
+        if wordcloud_png:
+            st.image(wordcloud_png, use_container_width=True)
         else:
             st.info("Tidak ada kata kunci yang cukup untuk membuat Word Cloud pada topik ini.")
 
     with col2:
         st.subheader("Distribusi Sentimen")
-        sentiment_counts_topic = df_topic['sentimen'].value_counts(normalize=True).mul(100).rename('persentase').reset_index()
+        sentiment_counts_topic = cube.jumlah_sentimen(selected_topic)
+        sentiment_counts_topic = sentiment_counts_topic.div(sentiment_counts_topic.sum()).mul(100).rename('persentase').reset_index()
         fig_pie_topic = px.pie(sentiment_counts_topic,
                                names='sentimen',
                                values='persentase',
@@ -62,4 +62,5 @@ if selected_topic:
         st.plotly_chart(fig_pie_topic, use_container_width=True)
 
     st.subheader("Contoh Ulasan Terkait")
-    st.dataframe(df_topic[['ulasan_lengkap', 'sentimen', 'detail_topik']].head(10))
\ No newline at end of file
+    example_rows = np.flatnonzero(facets.bitmap('deskripsi_topik', selected_topic))[:10]
+    st.dataframe(df.iloc[example_rows][['ulasan_lengkap', 'sentimen', 'detail_topik']])
\ No newline at end of file
@@ -2,7 +2,8 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-from utils import get_data # Standar impor
+from utils import get_data, get_aggregates, get_score_summary, follow_dataset_updates # Standar impor
+from visualisasi import figur_distribusi_skor
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -18,18 +19,22 @@ st.markdown("---")
 
 # --- MEMUAT DATA ---
 df = get_data()
+cube = get_aggregates()
 
 # --- VALIDASI DATA ---
 if df is None or df.empty:
     st.warning("Data tidak tersedia. Tidak dapat menampilkan analisis sentimen.")
     st.stop()
 
+# Halaman dijalankan ulang otomatis saat ulasan baru masuk ke dataset
+follow_dataset_updates()
+
 # --- VISUALISASI UTAMA ---
 col1, col2 = st.columns(2)
 
 with col1:
     st.subheader("Distribusi Sentimen Keseluruhan")
-    sentiment_counts = df['sentimen'].value_counts().reset_index()
+    sentiment_counts = cube.jumlah_sentimen().reset_index()
     sentiment_counts.columns = ['sentimen', 'jumlah']
 
     # --- PERBAIKAN DI SINI ---
@@ -54,11 +59,13 @@ with col1:
 
 with col2:
     st.subheader("Distribusi Skor Kepercayaan")
-    if 'confidence_score' in df.columns:
-        fig_hist = px.histogram(df, x="confidence_score", color="sentimen",
-                                title="Distribusi Skor Kepercayaan berdasarkan Sentimen",
-                                marginal="box",
-                                color_discrete_map={'Positif':'#28a745', 'Negatif':'#dc3545', 'Netral':'#ffc107'})
+    score_summary = get_score_summary()
+    if score_summary is not None:
+        # Histogram dan box plot dari bin & kuantil yang dihitung di server,
+        # sehingga ukuran grafik tidak bergantung pada jumlah ulasan
+        fig_hist = figur_distribusi_skor(score_summary,
+                                         warna={'Positif':'#28a745', 'Negatif':'#dc3545', 'Netral':'#ffc107'},
+                                         judul="Distribusi Skor Kepercayaan berdasarkan Sentimen")
         st.plotly_chart(fig_hist, use_container_width=True)
     else:
         st.info("Kolom 'confidence_score' atau 'skor_sentimen' tidak tersedia untuk analisis ini.")
@@ -74,10 +81,10 @@ selected_sentiment = st.selectbox(
 
 if selected_sentiment:
     st.subheader(f"Topik yang Paling Sering Muncul untuk Sentimen '{selected_sentiment}'")
-    df_sentiment = df[df['sentimen'] == selected_sentiment]
+    topic_counts_sentiment = cube.jumlah_topik(selected_sentiment) if selected_sentiment in cube.sentimen else None
     
-    if not df_sentiment.empty:
-        top_topics_sentiment = df_sentiment['deskripsi_topik'].value_counts().nlargest(10).reset_index()
+    if topic_counts_sentiment is not None and not topic_counts_sentiment.empty:
+        top_topics_sentiment = topic_counts_sentiment.nlargest(10).reset_index()
         top_topics_sentiment.columns = ['Topik', 'Jumlah']
         
         fig_bar_sentiment = px.bar(top_topics_sentiment,
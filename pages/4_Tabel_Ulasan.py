@@ -1,7 +1,9 @@
 # pages/4_Tabel_Ulasan.py
 import streamlit as st
 import pandas as pd
-from utils import get_data # Standar impor
+import numpy as np
+from utils import get_data, get_search_index, get_facet_index, sort_rows, show_memory_usage, follow_dataset_updates # Standar impor
+from penyimpanan import ekspor_csv, ekspor_xlsx
 
 # --- KONFIGURASI HALAMAN ---
 st.set_page_config(
@@ -23,42 +25,79 @@ if df is None or df.empty:
     st.warning("Data tidak tersedia. Tidak dapat menampilkan tabel ulasan.")
     st.stop()
 
+# Halaman dijalankan ulang otomatis saat ulasan baru masuk ke dataset
+follow_dataset_updates()
+
 # --- OPSI FILTER DI SIDEBAR ---
 st.sidebar.header("Opsi Filter")
+facets = get_facet_index()
+search_index = get_search_index()
+
+# Nilai filter saat ini (sudah diperbarui Streamlit sebelum rerun) dipakai untuk
+# menghitung jumlah ulasan per pilihan; setiap faset dihitung dengan filter
+# lain yang sedang aktif, tanpa memindai ulang dataframe.
+current_sentiment = st.session_state.get('filter_sentiment', 'Semua')
+current_topic = st.session_state.get('filter_topic', 'Semua')
+search_query = st.session_state.get('filter_query', '')
+use_stemming = st.session_state.get('filter_stemming', False)
+
+search_mask = search_index.bitmap(search_query, stem=use_stemming) if search_query else None
+sentiment_counts = facets.hitung('sentimen', facets.saring({'deskripsi_topik': current_topic}, search_mask))
+topic_counts = facets.hitung('deskripsi_topik', facets.saring({'sentimen': current_sentiment}, search_mask))
 
 # Filter berdasarkan Sentimen
-sentiments_options = ['Semua'] + df['sentimen'].unique().tolist()
-selected_sentiment = st.sidebar.selectbox("Filter berdasarkan Sentimen:", options=sentiments_options)
+sentiments_options = ['Semua'] + facets.nilai['sentimen']
+selected_sentiment = st.sidebar.selectbox(
+    "Filter berdasarkan Sentimen:", options=sentiments_options, key='filter_sentiment',
+    format_func=lambda v: v if v == 'Semua' else f"{v} ({sentiment_counts[v]:,})")
 
 # Filter berdasarkan Topik
-topics_options = ['Semua'] + df['deskripsi_topik'].unique().tolist()
-selected_topic = st.sidebar.selectbox("Filter berdasarkan Topik:", options=topics_options)
+topics_options = ['Semua'] + facets.nilai['deskripsi_topik']
+selected_topic = st.sidebar.selectbox(
+    "Filter berdasarkan Topik:", options=topics_options, key='filter_topic',
+    format_func=lambda v: v if v == 'Semua' else f"{v} ({topic_counts[v]:,})")
 
 # Pencarian teks
-search_query = st.sidebar.text_input("Cari kata kunci dalam ulasan:")
+search_query = st.sidebar.text_input("Cari kata kunci dalam ulasan:", key='filter_query')
+use_stemming = st.sidebar.checkbox("Cocokkan juga bentuk dasar kata (mis. 'membayar' → 'bayar')", key='filter_stemming')
 
 # --- LOGIKA FILTER ---
-df_selection = df.copy() # Mulai dengan semua data
-
-if selected_sentiment != 'Semua':
-    df_selection = df_selection[df_selection['sentimen'] == selected_sentiment]
-
-if selected_topic != 'Semua':
-    df_selection = df_selection[df_selection['deskripsi_topik'] == selected_topic]
-
-if search_query:
-    df_selection = df_selection[df_selection['ulasan_lengkap'].str.contains(search_query, case=False, na=False)]
+# Filter sentimen/topik adalah AND antar bitmap faset; pencarian memakai indeks terbalik.
+# Hasilnya berupa posisi baris, bukan salinan dataframe.
+selection_mask = facets.saring({'sentimen': selected_sentiment, 'deskripsi_topik': selected_topic}, search_mask)
+selected_rows = np.flatnonzero(selection_mask)
 
 # --- TAMPILKAN HASIL ---
-st.info(f"Menampilkan {len(df_selection)} dari {len(df)} total ulasan berdasarkan filter Anda.")
+st.info(f"Menampilkan {len(selected_rows)} dari {len(df)} total ulasan berdasarkan filter Anda.")
+show_memory_usage(selected_rows)
 
-# Tampilkan tabel data yang sudah difilter
 columns_to_display = ['ulasan_lengkap', 'sentimen', 'deskripsi_topik', 'detail_topik']
-if 'confidence_score' in df_selection.columns:
+if 'confidence_score' in df.columns:
     columns_to_display.append('confidence_score')
 
+# Opsi urutan dan paginasi: hanya satu halaman yang dikirim ke browser
+SORT_OPTIONS = {
+    'Urutan asli': None,
+    'Skor Kepercayaan': 'confidence_score',
+    'Sentimen': 'sentimen',
+    'Topik': 'deskripsi_topik',
+    'Ulasan': 'ulasan_lengkap',
+}
+col_sort, col_dir, col_size, col_page = st.columns([2, 1, 1, 1])
+sort_label = col_sort.selectbox("Urutkan berdasarkan:", options=[k for k, v in SORT_OPTIONS.items() if v is None or v in df.columns])
+sort_ascending = col_dir.radio("Arah:", options=['Naik', 'Turun'], horizontal=True) == 'Naik'
+page_size = col_size.selectbox("Baris per halaman:", options=[25, 50, 100, 250], index=1)
+total_pages = max(1, -(-len(selected_rows) // page_size))
+page_number = col_page.number_input(f"Halaman (dari {total_pages:,}):", min_value=1, max_value=total_pages, value=1, step=1)
+
+if SORT_OPTIONS[sort_label] is not None:
+    selected_rows = sort_rows(selected_rows, SORT_OPTIONS[sort_label], ascending=sort_ascending)
+page_start = (page_number - 1) * page_size
+page_rows = selected_rows[page_start:page_start + page_size]
+
+# Tampilkan tabel data yang sudah difilter (hanya halaman yang dipilih)
 st.dataframe(
-    df_selection[columns_to_display],
+    df.iloc[page_rows][columns_to_display],
     use_container_width=True,
     hide_index=True,
     column_config={
@@ -69,4 +108,22 @@ st.dataframe(
             max_value=1,
         ),
     }
-)
\ No newline at end of file
+)
+st.caption(f"Baris {page_start + 1 if len(page_rows) else 0:,}–{page_start + len(page_rows):,} dari {len(selected_rows):,}")
+
+# --- EKSPOR ---
+# File ekspor baru dibuat (per chunk) saat tombol diklik, bukan pada setiap rerun
+export_rows = selected_rows
+col_csv, col_xlsx = st.columns(2)
+col_csv.download_button(
+    "⬇️ Unduh hasil filter (CSV)",
+    data=lambda: ekspor_csv(df, export_rows, columns_to_display),
+    file_name="ulasan_terfilter.csv",
+    mime="text/csv",
+)
+col_xlsx.download_button(
+    "⬇️ Unduh hasil filter (XLSX)",
+    data=lambda: ekspor_xlsx(df, export_rows, columns_to_display),
+    file_name="ulasan_terfilter.xlsx",
+    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+)
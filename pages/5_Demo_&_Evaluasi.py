@@ -4,146 +4,36 @@ import streamlit as st
 import time
 import os
 import re
-import pandas as pd
-import numpy as np
-import pickle
-import gensim
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing.sequence import pad_sequences
-from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
-from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
-from utils import load_text_file
+from utils import load_text_file, get_model_loader
 
 # ==============================================================================
-# FUNGSI-FUNGSI UNTUK MEMUAT ASET (DENGAN CACHING)
+# STATUS PEMUATAN ASET (DI LATAR BELAKANG)
 # ==============================================================================
-
-@st.cache_resource
-def muat_aset_pra_pemrosesan():
-    """
-    Memuat semua komponen yang dibutuhkan untuk pra-pemrosesan teks.
-    Fungsi ini menggunakan cache agar tidak dimuat berulang kali.
-    """
-    try:
-        # Sastrawi
-        stemmer_factory = StemmerFactory()
-        stemmer = stemmer_factory.create_stemmer()
-        stopword_factory = StopWordRemoverFactory()
-        stopword_remover = stopword_factory.create_stop_word_remover()
-
-        # Kamus Normalisasi
-        kamus_df = pd.read_excel("assets/kamuskatabaku.xlsx")
-        kamus_norm = dict(zip(kamus_df['tidak_baku'], kamus_df['kata_baku']))
-        
-        # Custom Stopwords untuk LDA
-        custom_stopwords = [
-            'aman', 'aneh', 'bagus', 'baik', 'bingung', 'buruk', 'cepat', 'cocok', 'enak', 'efisien',
-            'gagal', 'gercep', 'hebat', 'hemat', 'jelek', 'jelas', 'kecewa', 'keren', 'lancar',
-            'lambat', 'lemot', 'lumayan', 'mahal', 'malas', 'mantap', 'mantul', 'membantu',
-            'mending', 'mudah', 'nyaman', 'ok', 'paham', 'parah', 'praktis', 'puas', 'pusing',
-            'repot', 'ribet', 'rumit', 'salah', 'sesuai', 'sip', 'sukses', 'sulit', 'super',
-            'susah', 'takut', 'terbantu', 'top', 'admin', 'anda', 'bro', 'gan', 'kak', 'kakak',
-            'kamu', 'min', 'saya', 'sis', 'aja', 'banget', 'bolak', 'coba', 'deh', 'dgn', 'dll',
-            'dong', 'ga', 'gak', 'gk', 'enggak', 'kalo', 'kalau', 'kah', 'kayak', 'kok', 'krn',
-            'line', 'nggak', 'nih', 'on', 'sih', 'yg', 'alhamdulillah', 'app', 'aplikasi', 'apk',
-            'jadi', 'kesah', 'mohon', 'moga', 'semoga', 'terima_kasih', 'thanks', 'tolong', 'ulang',
-            'amanah', 'simpel', 'banyak', 'hasil', 'metode', 'terima', 'kasih'
-        ]
-
-        # Kamus Label Topik Deskriptif
-        label_topik = {
-            0: "Keluhan Lamanya Proses Aplikasi", 1: "Urusan di Kantor Samsat",
-            2: "Layanan dari Rumah (Anti Antri)", 3: "Pembayaran Pajak Kendaraan",
-            4: "Pilihan Metode Layanan (Online/Pos)", 5: "Pengiriman Dokumen Fisik",
-            6: "Lama Proses & Layanan Antar Kota", 7: "Fitur Cetak Bukti & Notifikasi",
-            8: "Bantuan Pendaftaran Akun", 9: "Perpanjang STNK (Luar Daerah)",
-            10: "Urusan Kendaraan & Saran Pengguna", 11: "Bantuan CS & Live Chat"
-        }
-
-        return stemmer, stopword_remover, kamus_norm, custom_stopwords, label_topik
-    except Exception as e:
-        st.error(f"Gagal memuat aset pra-pemrosesan: {e}")
-        return None, None, None, None, None
-
-@st.cache_resource
-def muat_model_sentimen():
-    """Memuat model sentimen, tokenizer, dan label encoder."""
-    try:
-        model = load_model("assets/models/model_sentimen_lstm.h5")
-        with open("assets/models/tokenizer.pkl", 'rb') as f: tokenizer = pickle.load(f)
-        with open("assets/models/label_encoder.pkl", 'rb') as f: label_encoder = pickle.load(f)
-        return model, tokenizer, label_encoder
-    except Exception as e:
-        st.error(f"Gagal memuat model sentimen dari 'assets/': {e}")
-        return None, None, None
-
-@st.cache_resource
-def muat_model_lda():
-    """Memuat model LDA dan dictionary 12 topik."""
-    try:
-        model = gensim.models.LdaModel.load("assets/models/model_lda_terbaik_12topik.model")
-        dictionary = gensim.corpora.Dictionary.load("assets/models/model_lda_terbaik_12topik.dict")
-        return model, dictionary
-    except Exception as e:
-        st.error(f"Gagal memuat model LDA 12 topik dari 'assets/models': {e}")
-        return None, None
+# TensorFlow, gensim, dan Sastrawi dimuat oleh thread latar belakang (lihat
+# pemuat_model.py), sehingga bagian evaluasi statis langsung tampil.
+
+PESAN_GAGAL_ASET = {
+    'pra_pemrosesan': "Gagal memuat aset pra-pemrosesan",
+    'sentimen': "Gagal memuat model sentimen dari 'assets/'",
+    'lda': "Gagal memuat model LDA 12 topik dari 'assets/models'",
+}
+NAMA_ASET = {'pra_pemrosesan': "Aset pra-pemrosesan", 'sentimen': "Model sentimen (LSTM)", 'lda': "Model topik (LDA)"}
+
+@st.fragment(run_every=1)
+def tampilkan_status_pemuatan(pemuat):
+    """Menampilkan status pemuatan dan menjalankan ulang halaman begitu selesai."""
+    if pemuat.selesai():
+        st.rerun()
+    st.info("⏳ Model sedang dimuat di latar belakang. Demo akan tersedia otomatis; "
+            "bagian evaluasi di bawah sudah bisa dilihat.")
+    for nama, (status, durasi, _) in pemuat.status().items():
+        keterangan = f" ({durasi:.1f} detik)" if durasi is not None else ""
+        st.caption(f"{NAMA_ASET[nama]}: {status}{keterangan}")
 
 # ==============================================================================
 # FUNGSI-FUNGSI PEMROSESAN DAN PREDIKSI
 # ==============================================================================
 
-def pra_pemrosesan_lstm(teks, kamus_norm, stemmer_obj, stopword_remover_obj):
-    teks = teks.lower()
-    words = teks.split()
-    normalized_words = [kamus_norm.get(word, word) for word in words]
-    teks = ' '.join(normalized_words)
-    teks = stopword_remover_obj.remove(teks)
-    teks = stemmer_obj.stem(teks)
-    return teks
-
-def pra_pemrosesan_lda(teks, kamus_norm, stemmer_obj, custom_stopwords_list):
-    teks = teks.lower()
-    words = teks.split()
-    normalized_words = [kamus_norm.get(word, word) for word in words]
-    teks = ' '.join(normalized_words)
-    words = [word for word in teks.split() if word not in custom_stopwords_list]
-    teks = ' '.join(words)
-    teks = stemmer_obj.stem(teks)
-    return teks
-
-def prediksi_sentimen(teks, model, tokenizer, label_encoder, aset_prep):
-    """
-    Memprediksi sentimen dan mengembalikan label beserta skor keyakinannya.
-    """
-    stemmer, stopword, kamus, _, _ = aset_prep
-    teks_bersih = pra_pemrosesan_lstm(teks, kamus, stemmer, stopword)
-    if not teks_bersih: return "Netral", 0.5  # Kembalikan skor netral jika teks kosong
-    
-    maxlen = model.input_shape[1]
-    sekuens = tokenizer.texts_to_sequences([teks_bersih])
-    padded = pad_sequences(sekuens, maxlen=maxlen, padding='post', truncating='post')
-    
-    prediksi_prob = model.predict(padded, verbose=0)
-    skor_keyakinan = np.max(prediksi_prob)
-    prediksi_kelas = np.argmax(prediksi_prob, axis=1)
-    label_prediksi = label_encoder.inverse_transform(prediksi_kelas)[0]
-    
-    return label_prediksi, skor_keyakinan
-
-def prediksi_topik_lda(teks, model, dictionary, aset_prep):
-    stemmer, _, kamus, custom_stopwords, label_topik_map = aset_prep
-    teks_bersih = pra_pemrosesan_lda(teks, kamus, stemmer, custom_stopwords)
-    if not teks_bersih: return "Topik Tidak Relevan", "Teks kosong setelah pra-pemrosesan.", 0.0
-    tokens = teks_bersih.split()
-    bow_vector = dictionary.doc2bow(tokens)
-    topic_distribution = model.get_document_topics(bow_vector, minimum_probability=0.1)
-    if not topic_distribution: return "Topik Tidak Relevan", "Tidak ada topik yang cocok ditemukan.", 0.0
-    top_topic_index, confidence = sorted(topic_distribution, key=lambda x: x[1], reverse=True)[0]
-    deskripsi_topik = label_topik_map.get(top_topic_index, f"Topik {top_topic_index}")
-    keywords_tuples = model.show_topic(top_topic_index, topn=5)
-    keywords_string = ', '.join([word for word, prop in keywords_tuples])
-    return deskripsi_topik, keywords_string, confidence
-
 def parse_lda_report(report_text):
     """Mem-parsing teks laporan LDA untuk mengekstrak informasi kunci."""
     if not report_text or "File tidak ditemukan" in report_text: return {}
@@ -178,10 +68,8 @@ def parse_lda_report(report_text):
 
 st.set_page_config(page_title="Demo & Evaluasi Model", page_icon="🚀", layout="wide")
 
-# --- Muat Semua Aset di Awal ---
-aset_prep = muat_aset_pra_pemrosesan()
-model_sentimen, tokenizer_sentimen, le_sentimen = muat_model_sentimen()
-model_lda, dictionary_lda = muat_model_lda()
+# --- Mulai Muat Aset di Latar Belakang (tidak menunggu) ---
+pemuat = get_model_loader()
 
 # --- Judul Halaman ---
 st.title("🚀 Demo Interaktif & Evaluasi Model")
@@ -191,9 +79,19 @@ st.markdown("---")
 # --- BAGIAN DEMO INTERAKTIF (TERINTEGRASI) ---
 st.header("🧪🔬 Demo Analisis Terintegrasi")
 
-semua_aset_siap = all([model_sentimen, model_lda, aset_prep[0]])
+if not pemuat.selesai():
+    tampilkan_status_pemuatan(pemuat)
+elif pemuat.siap():
+    import pandas as pd
+    import prediksi
+    from prediksi import prediksi_sentimen, prediksi_topik_lda
+    from aspek import nilai_ulasan_dataframe
+
+    aset_prep = pemuat.hasil('pra_pemrosesan')
+    model_sentimen, tokenizer_sentimen, le_sentimen = pemuat.hasil('sentimen')
+    # Versi model topik yang baru diterbitkan dimuat di latar belakang lalu dipakai otomatis
+    (model_lda, dictionary_lda), versi_lda = pemuat.hasil_berversi('lda')
 
-if semua_aset_siap:
     input_teks = st.text_area(
         "Masukkan ulasan untuk dianalisis sentimen dan topiknya secara bersamaan:",
         "Aplikasinya bagus dan sangat membantu sekali untuk bayar pajak tahunan, jadi tidak usah antri lagi di samsat.",
@@ -204,8 +102,16 @@ if semua_aset_siap:
     if st.button("Analisis Sekarang!", type="primary", key="btn_terintegrasi"):
         if input_teks.strip():
             with st.spinner("Menganalisis sentimen dan topik..."):
-                hasil_sentimen, skor_sentimen = prediksi_sentimen(input_teks, model_sentimen, tokenizer_sentimen, le_sentimen, aset_prep)
-                deskripsi_topik, keywords_topik, _ = prediksi_topik_lda(input_teks, model_lda, dictionary_lda, aset_prep)
+                # Teks cukup dipra-proses sekali untuk kedua model
+                hasil_prep = aset_prep.pipeline.proses(input_teks)
+                # Teks yang pernah dianalisis diambil dari cache hasil prediksi bersama
+                cache = prediksi.cache_prediksi(versi_lda)
+                hasil_sentimen, skor_sentimen = prediksi_sentimen(input_teks, model_sentimen, tokenizer_sentimen, le_sentimen, aset_prep, hasil_prep, cache)
+                deskripsi_topik, keywords_topik, _ = prediksi_topik_lda(input_teks, model_lda, dictionary_lda, aset_prep, hasil_prep, cache)
+                # Semua pecahan kalimat dinilai dalam satu batch untuk rincian aspek
+                df_pecahan, df_ringkasan = nilai_ulasan_dataframe(pd.DataFrame({'id_ulasan': [0], 'ulasan_lengkap': [input_teks]}),
+                                                                  (model_sentimen, tokenizer_sentimen, le_sentimen),
+                                                                  (model_lda, dictionary_lda), aset_prep, cache=cache)
 
             st.subheader("Hasil Analisis Gabungan")
             
@@ -229,9 +135,27 @@ if semua_aset_siap:
                 st.markdown("##### Analisis Topik (LDA)")
                 st.success(f"**{deskripsi_topik}**")
                 st.caption(f"Kata Kunci: {keywords_topik}")
+
+            if len(df_pecahan) > 1:
+                st.markdown("##### Rincian per Kalimat")
+                ringkasan = df_ringkasan.iloc[0]
+                st.caption(f"{ringkasan['jumlah_pecahan']} kalimat · sentimen dominan **{ringkasan['sentimen_dominan']}** · "
+                           f"polaritas {ringkasan['polaritas']:+.2f}"
+                           + (f" · aspek: {ringkasan['aspek']}" if ringkasan['aspek'] else ""))
+                st.dataframe(df_pecahan[['pecahan_kalimat', 'sentimen', 'skor_sentimen', 'deskripsi_topik']]
+                             .rename(columns={'pecahan_kalimat': 'Kalimat', 'sentimen': 'Sentimen',
+                                              'skor_sentimen': 'Skor', 'deskripsi_topik': 'Topik'}),
+                             use_container_width=True, hide_index=True)
+
+            statistik_cache = cache.statistik()
+            st.caption(f"Cache prediksi: {statistik_cache['ukuran']:,} hasil tersimpan · "
+                       f"hit rate {statistik_cache['hit_rate']:.0%} · model topik versi {versi_lda}")
         else:
             st.warning("Mohon masukkan kalimat untuk dianalisis.")
 else:
+    for nama, (status, _, galat) in pemuat.status().items():
+        if galat is not None:
+            st.error(f"{PESAN_GAGAL_ASET[nama]}: {galat}")
     st.error("Satu atau lebih model/aset gagal dimuat. Fitur demo interaktif tidak tersedia.")
 
 st.markdown("---")
@@ -0,0 +1,369 @@
+# pelatihan_lda.py
+"""
+Pelatihan inkremental model LDA dan penerbitan versi model tanpa restart.
+
+Ulasan baru dipra-proses dengan pipeline yang sama seperti saat prediksi lalu
+dimasukkan ke model LDA aktif lewat LdaModel.update (online variational
+Bayes). Model tidak dilatih ulang dari nol sehingga urutan topik, dan
+LABEL_TOPIK yang menamainya, tetap berlaku. Beberapa kandidat hyperparameter
+pembaruan (passes x decay) dilatih paralel di proses terpisah; setiap
+kandidat dinilai dengan koherensi C_v pada sampel dokumen dan kemiripan
+setiap topiknya dengan model induk. Kandidat terbaik diterbitkan sebagai
+direktori versi baru (assets/models/lda/vNNNN) lalu penunjuk versi aktif
+diganti secara atomik. Dashboard, layanan, dan ingesti yang sedang berjalan
+memuat versi baru itu tanpa restart.
+
+    python pelatihan_lda.py perbarui ulasan_baru.csv --passes 1 5 --decay 0.5 0.7 0.9
+    python pelatihan_lda.py daftar
+    python pelatihan_lda.py aktifkan v0002
+
+Dictionary tidak bertambah: kata yang belum ada di dictionary model induk
+diabaikan, seperti saat prediksi.
+"""
+
+import argparse
+import copy
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from berkas import tulis_atomik
+import prediksi
+
+NAMA_METADATA = "metadata.json"
+POLA_VERSI = re.compile(r'^v(\d{4,})$')
+SIMPAN_VERSI = 5
+
+PASSES_DEFAULT = [1, 5]
+DECAY_DEFAULT = [0.5, 0.7, 0.9]
+UKURAN_SAMPEL_KOHERENSI = 2000
+TOPN_KOHERENSI = 10
+# Kemiripan kosinus minimum distribusi kata setiap topik terhadap model induk;
+# di bawahnya topik dianggap bergeser sehingga LABEL_TOPIK tidak lagi cocok
+AMBANG_KEMIRIPAN_TOPIK = 0.75
+# Kandidat terbaik boleh sedikit lebih rendah koherensinya daripada model induk
+TOLERANSI_KOHERENSI = 0.01
+
+# ==============================================================================
+# KORPUS DAN EVALUASI
+# ==============================================================================
+
+def korpus_dari_csv(daftar_path, dictionary, aset_prep, kolom_teks=None, sejak_id=None):
+    """
+    Korpus bag-of-words dari file-file CSV ulasan. Hanya baris dengan id_ulasan
+    > `sejak_id` yang dipakai (jika keduanya ada). Mengembalikan (korpus, token
+    per dokumen, id_ulasan terbesar atau None, jumlah baris dibaca); dokumen
+    tanpa satu pun kata di dictionary dibuang.
+    """
+    korpus, daftar_token = [], []
+    id_maks, jumlah_baris = None, 0
+    for path in daftar_path:
+        df = pd.read_csv(path)
+        kolom = kolom_teks or ('pecahan_kalimat' if 'pecahan_kalimat' in df.columns else 'ulasan_lengkap')
+        if 'id_ulasan' in df.columns:
+            if sejak_id is not None:
+                df = df[df['id_ulasan'] > sejak_id]
+            if len(df):
+                id_maks = max(id_maks or 0, int(df['id_ulasan'].max()))
+        jumlah_baris += len(df)
+        for hasil in aset_prep.pipeline.proses_batch(df[kolom].fillna('').astype(str).tolist()):
+            bow = dictionary.doc2bow(hasil.token_lda)
+            if bow:
+                korpus.append(bow)
+                daftar_token.append(hasil.token_lda)
+    return korpus, daftar_token, id_maks, jumlah_baris
+
+def kemiripan_topik(model_a, model_b):
+    """Kemiripan kosinus distribusi kata topik ke-k model_a dan model_b, untuk setiap k."""
+    a, b = model_a.get_topics(), model_b.get_topics()
+    return (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+def koherensi(model, daftar_token, dictionary, topn=TOPN_KOHERENSI):
+    """
+    Koherensi C_v rata-rata dan jumlah topik yang tidak dapat dinilai. Topik
+    yang kata kuncinya tidak pernah muncul di sampel (mis. frasa bigram dari
+    pelatihan awal) bernilai NaN dan tidak ikut dirata-ratakan.
+    """
+    import warnings
+    from gensim.models import CoherenceModel
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        per_topik = np.array(CoherenceModel(model=model, texts=daftar_token, dictionary=dictionary,
+                                            coherence='c_v', topn=topn, processes=1).get_coherence_per_topic())
+    terdefinisi = ~np.isnan(per_topik)
+    return (float(per_topik[terdefinisi].mean()) if terdefinisi.any() else None), int((~terdefinisi).sum())
+
+# ==============================================================================
+# KANDIDAT (DIJALANKAN DI PROSES PEKERJA)
+# ==============================================================================
+
+# Model induk, korpus baru, dan sampel koherensi milik setiap proses pekerja
+_DASAR = None
+
+def _inisialisasi_pekerja(path_model, path_dictionary, korpus, sampel):
+    global _DASAR
+    import gensim
+
+    _DASAR = (gensim.models.LdaModel.load(path_model), gensim.corpora.Dictionary.load(path_dictionary), korpus, sampel)
+
+def _latih_kandidat(kandidat, dir_keluaran):
+    """Memperbarui salinan model induk dengan satu kombinasi hyperparameter lalu menyimpannya."""
+    model_induk, dictionary, korpus, sampel = _DASAR
+    mulai = time.perf_counter()
+    model = copy.deepcopy(model_induk)
+    model.update(korpus, passes=kandidat['passes'], decay=kandidat['decay'], eval_every=0)
+    nilai, tanpa_nilai = koherensi(model, sampel, dictionary)
+    mirip = kemiripan_topik(model_induk, model)
+
+    os.makedirs(dir_keluaran, exist_ok=True)
+    model.save(os.path.join(dir_keluaran, prediksi.NAMA_FILE_MODEL_LDA))
+    return {'hyperparameter': kandidat, 'koherensi_cv': nilai, 'topik_tanpa_koherensi': tanpa_nilai,
+            'kemiripan_topik_min': float(mirip.min()), 'kemiripan_topik': [round(float(m), 4) for m in mirip],
+            'detik': time.perf_counter() - mulai, 'direktori': dir_keluaran}
+
+def latih_kandidat(versi_induk, korpus, sampel, daftar_kandidat, dir_kerja, pekerja=None):
+    """
+    Melatih semua kandidat, paralel di `pekerja` proses (default: jumlah kandidat,
+    paling banyak jumlah CPU; 1 berarti di proses ini). Mengembalikan list hasil
+    dengan urutan yang sama seperti `daftar_kandidat`.
+    """
+    pekerja = pekerja or min(len(daftar_kandidat), os.cpu_count() or 1)
+    direktori = [os.path.join(dir_kerja, f"kandidat_{i:02d}") for i in range(len(daftar_kandidat))]
+    argumen = (*prediksi.path_model_lda(versi_induk), korpus, sampel)
+    if pekerja <= 1:
+        _inisialisasi_pekerja(*argumen)
+        return [_latih_kandidat(k, d) for k, d in zip(daftar_kandidat, direktori)]
+
+    konteks = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=pekerja, mp_context=konteks, initializer=_inisialisasi_pekerja,
+                             initargs=argumen) as executor:
+        return list(executor.map(_latih_kandidat, daftar_kandidat, direktori))
+
+def pilih_kandidat(hasil, koherensi_induk, ambang_kemiripan=AMBANG_KEMIRIPAN_TOPIK,
+                   toleransi=TOLERANSI_KOHERENSI):
+    """
+    Kandidat dengan koherensi tertinggi di antara yang topiknya tidak bergeser.
+    Mengembalikan (kandidat atau None, alasan jika tidak ada yang layak).
+    """
+    stabil = [h for h in hasil if h['kemiripan_topik_min'] >= ambang_kemiripan]
+    if not stabil:
+        return None, f"semua kandidat menggeser topik (kemiripan minimum < {ambang_kemiripan})"
+    # Koherensi sama: pilih yang paling sedikit menggeser topik
+    terbaik = max(stabil, key=lambda h: (-np.inf if h['koherensi_cv'] is None else h['koherensi_cv'],
+                                         h['kemiripan_topik_min']))
+    if (koherensi_induk is not None and terbaik['koherensi_cv'] is not None
+            and terbaik['koherensi_cv'] < koherensi_induk - toleransi):
+        return None, (f"koherensi terbaik {terbaik['koherensi_cv']:.4f} lebih rendah dari model induk "
+                      f"{koherensi_induk:.4f} (toleransi {toleransi})")
+    return terbaik, None
+
+# ==============================================================================
+# VERSI MODEL
+# ==============================================================================
+
+def _tulis_json_atomik(path, isi):
+    with tulis_atomik(path) as f:
+        json.dump(isi, f, ensure_ascii=False, indent=2)
+
+def _nomor_versi(dir_model):
+    if not os.path.isdir(dir_model):
+        return []
+    return sorted(int(m.group(1)) for m in map(POLA_VERSI.match, os.listdir(dir_model)) if m)
+
+def baca_metadata(versi, dir_model=None):
+    """Metadata versi model; {} untuk versi awal atau jika tidak ada."""
+    if versi == prediksi.VERSI_LDA_AWAL:
+        return {}
+    try:
+        with open(os.path.join(dir_model or prediksi.DIR_MODEL_LDA, versi, NAMA_METADATA), encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def daftar_versi(dir_model=None):
+    """Metadata semua versi yang tersimpan, dari yang terlama."""
+    dir_model = dir_model or prediksi.DIR_MODEL_LDA
+    return [baca_metadata(f"v{n:04d}", dir_model) or {'versi': f"v{n:04d}"} for n in _nomor_versi(dir_model)]
+
+def aktifkan_versi(versi):
+    """Menjadikan `versi` versi aktif dengan mengganti file penunjuk secara atomik."""
+    if versi != prediksi.VERSI_LDA_AWAL:
+        path_model, path_dictionary = prediksi.path_model_lda(versi)
+        if not (os.path.exists(path_model) and os.path.exists(path_dictionary)):
+            raise ValueError(f"Versi model LDA tidak ditemukan: {versi}")
+    os.makedirs(os.path.dirname(prediksi.PATH_LDA_AKTIF) or '.', exist_ok=True)
+    _tulis_json_atomik(prediksi.PATH_LDA_AKTIF, {'versi': versi, 'diaktifkan': datetime.now().isoformat(timespec='seconds')})
+
+def terbitkan_versi(dir_kandidat, path_dictionary, metadata, simpan=SIMPAN_VERSI):
+    """
+    Memindahkan direktori kandidat menjadi versi baru vNNNN (rename direktori,
+    sehingga pembaca tidak pernah melihat versi setengah jadi), mengaktifkannya,
+    lalu menghapus versi lama selain `simpan` versi terbaru (tidak di Windows).
+    Mengembalikan nama versi.
+    """
+    dir_model = prediksi.DIR_MODEL_LDA
+    shutil.copyfile(path_dictionary, os.path.join(dir_kandidat, prediksi.NAMA_FILE_DICTIONARY_LDA))
+    while True:
+        nomor = (_nomor_versi(dir_model) or [0])[-1] + 1
+        versi = f"v{nomor:04d}"
+        _tulis_json_atomik(os.path.join(dir_kandidat, NAMA_METADATA), dict(metadata, versi=versi))
+        try:
+            os.rename(dir_kandidat, os.path.join(dir_model, versi))
+            break
+        except OSError:
+            # Nomor yang sama baru saja diterbitkan oleh proses lain
+            if not os.path.exists(os.path.join(dir_model, versi)):
+                raise
+    aktifkan_versi(versi)
+    _hapus_versi_lama(simpan)
+    return versi
+
+def _hapus_versi_lama(simpan):
+    # Proses yang memuat versi lama tidak terpengaruh: file yang sudah di-mmap tetap
+    # dapat dibaca setelah dihapus (Linux/macOS). Di Windows file yang di-mmap tidak
+    # dapat dihapus, dan rmtree akan meninggalkan versi setengah terhapus.
+    if os.name == 'nt':
+        return
+    dir_model = prediksi.DIR_MODEL_LDA
+    aktif = prediksi.versi_lda_aktif()
+    for nomor in _nomor_versi(dir_model)[:-simpan]:
+        if f"v{nomor:04d}" != aktif:
+            shutil.rmtree(os.path.join(dir_model, f"v{nomor:04d}"), ignore_errors=True)
+
+# ==============================================================================
+# CLI
+# ==============================================================================
+
+def perbarui(args):
+    versi_induk = prediksi.versi_lda_aktif()
+    metadata_induk = baca_metadata(versi_induk)
+    sejak_id = args.sejak_id if args.sejak_id is not None else (None if args.semua else metadata_induk.get('id_ulasan_maks'))
+
+    mulai = time.perf_counter()
+    aset_prep = prediksi.muat_aset_pra_pemrosesan()
+    model_induk, dictionary = prediksi.muat_model_lda(versi_induk)
+    korpus, daftar_token, id_maks, jumlah_baris = korpus_dari_csv(args.input, dictionary, aset_prep,
+                                                                 args.kolom_teks, sejak_id)
+    print(f"Model induk: {versi_induk}. {jumlah_baris:,} baris baru"
+          + (f" (id_ulasan > {sejak_id})" if sejak_id is not None else "") + f", {len(korpus):,} dokumen dipakai.")
+    if not korpus:
+        print("Tidak ada dokumen baru untuk memperbarui model.")
+        return 0
+
+    sampel = random.Random(args.seed).sample(daftar_token, min(args.ukuran_sampel, len(daftar_token)))
+    koherensi_induk, _ = koherensi(model_induk, sampel, dictionary)
+    print(f"Koherensi C_v model induk pada {len(sampel):,} dokumen sampel: "
+          + (f"{koherensi_induk:.4f}" if koherensi_induk is not None else "tidak terdefinisi"))
+
+    daftar_kandidat = [{'passes': p, 'decay': d} for p, d in itertools.product(args.passes, args.decay)]
+    dir_kerja = os.path.join(prediksi.DIR_MODEL_LDA, f".kerja-{os.getpid()}")
+    os.makedirs(dir_kerja, exist_ok=True)
+    try:
+        hasil = latih_kandidat(versi_induk, korpus, sampel, daftar_kandidat, dir_kerja, args.pekerja)
+        for h in hasil:
+            nilai = f"{h['koherensi_cv']:.4f}" if h['koherensi_cv'] is not None else "   -  "
+            print(f"  passes={h['hyperparameter']['passes']:<3} decay={h['hyperparameter']['decay']:<5} "
+                  f"C_v={nilai}  kemiripan_min={h['kemiripan_topik_min']:.3f}  ({h['detik']:.1f} detik)")
+
+        terbaik, alasan = pilih_kandidat(hasil, koherensi_induk, args.ambang_kemiripan, args.toleransi)
+        if terbaik is None and args.paksa:
+            terbaik = max(hasil, key=lambda h: h['kemiripan_topik_min'])
+        if terbaik is None:
+            print(f"Tidak ada versi yang diterbitkan: {alasan}.", file=sys.stderr)
+            return 1
+        if args.tanpa_terbit:
+            print(f"Kandidat terbaik: {terbaik['hyperparameter']} (tidak diterbitkan).")
+            return 0
+
+        metadata = {
+            'induk': versi_induk,
+            'dibuat': datetime.now().isoformat(timespec='seconds'),
+            'hyperparameter': terbaik['hyperparameter'],
+            'koherensi_cv': terbaik['koherensi_cv'],
+            'koherensi_cv_induk': koherensi_induk,
+            'topik_tanpa_koherensi': terbaik['topik_tanpa_koherensi'],
+            'ukuran_sampel_koherensi': len(sampel),
+            'kemiripan_topik_min': terbaik['kemiripan_topik_min'],
+            'kemiripan_topik': terbaik['kemiripan_topik'],
+            'jumlah_dokumen': len(korpus),
+            'id_ulasan_maks': id_maks if id_maks is not None else sejak_id,
+            'sumber': [os.path.abspath(p) for p in args.input],
+            'kandidat': [{k: v for k, v in h.items() if k != 'direktori'} for h in hasil],
+        }
+        versi = terbitkan_versi(terbaik['direktori'], prediksi.path_model_lda(versi_induk)[1], metadata, args.simpan)
+    finally:
+        shutil.rmtree(dir_kerja, ignore_errors=True)
+    print(f"Versi {versi} diterbitkan dan diaktifkan ({time.perf_counter() - mulai:.1f} detik).")
+    return 0
+
+def tampilkan_daftar(args):
+    aktif = prediksi.versi_lda_aktif()
+    print(f"{'*' if aktif == prediksi.VERSI_LDA_AWAL else ' '} {prediksi.VERSI_LDA_AWAL:<6} {prediksi.PATH_MODEL_LDA}")
+    for m in daftar_versi():
+        nilai = f"C_v={m['koherensi_cv']:.4f}" if m.get('koherensi_cv') is not None else "C_v=-"
+        print(f"{'*' if m['versi'] == aktif else ' '} {m['versi']:<6} induk={m.get('induk', '-'):<6} {m.get('dibuat', '-')} "
+              f"{nilai} kemiripan_min={m.get('kemiripan_topik_min', float('nan')):.3f} "
+              f"dokumen={m.get('jumlah_dokumen', 0):,} {m.get('hyperparameter', '')}")
+    return 0
+
+def aktifkan(args):
+    try:
+        aktifkan_versi(args.versi)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Versi {args.versi} diaktifkan.")
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pelatihan inkremental dan pengelolaan versi model LDA.")
+    sub = parser.add_subparsers(dest='perintah', required=True)
+
+    p = sub.add_parser('perbarui', help="Memperbarui model aktif dengan ulasan baru lalu menerbitkan versi baru.")
+    p.add_argument("input", nargs='+', help="File CSV ulasan baru.")
+    p.add_argument("--kolom-teks", default=None,
+                   help="Kolom teks (default: 'pecahan_kalimat' jika ada, selain itu 'ulasan_lengkap').")
+    p.add_argument("--sejak-id", type=int, default=None,
+                   help="Hanya pakai id_ulasan > nilai ini (default: id_ulasan terbesar yang dipakai versi aktif).")
+    p.add_argument("--semua", action="store_true", help="Pakai semua baris, abaikan id_ulasan versi aktif.")
+    p.add_argument("--passes", type=int, nargs='+', default=PASSES_DEFAULT, help="Kandidat jumlah passes.")
+    p.add_argument("--decay", type=float, nargs='+', default=DECAY_DEFAULT,
+                   help="Kandidat decay (0.5-1.0; makin besar makin kecil bobot dokumen baru).")
+    p.add_argument("--pekerja", type=int, default=None, help="Jumlah proses pelatihan kandidat.")
+    p.add_argument("--ukuran-sampel", type=int, default=UKURAN_SAMPEL_KOHERENSI,
+                   help="Jumlah dokumen sampel untuk koherensi C_v.")
+    p.add_argument("--seed", type=int, default=0, help="Seed pengambilan sampel koherensi.")
+    p.add_argument("--ambang-kemiripan", type=float, default=AMBANG_KEMIRIPAN_TOPIK,
+                   help="Kemiripan topik minimum terhadap model induk.")
+    p.add_argument("--toleransi", type=float, default=TOLERANSI_KOHERENSI,
+                   help="Penurunan koherensi maksimal terhadap model induk.")
+    p.add_argument("--paksa", action="store_true",
+                   help="Terbitkan kandidat paling stabil walaupun tidak lolos pemeriksaan.")
+    p.add_argument("--tanpa-terbit", action="store_true", help="Hanya latih dan nilai kandidat.")
+    p.add_argument("--simpan", type=int, default=SIMPAN_VERSI, help="Jumlah versi terbaru yang disimpan (di Windows versi lama tidak dihapus).")
+    p.set_defaults(fungsi=perbarui)
+
+    p = sub.add_parser('daftar', help="Menampilkan versi model yang tersimpan (* = aktif).")
+    p.set_defaults(fungsi=tampilkan_daftar)
+
+    p = sub.add_parser('aktifkan', help="Mengaktifkan versi tertentu (mis. untuk rollback).")
+    p.add_argument("versi", help=f"Nama versi (vNNNN atau '{prediksi.VERSI_LDA_AWAL}').")
+    p.set_defaults(fungsi=aktifkan)
+
+    args = parser.parse_args(argv)
+    sys.exit(args.fungsi(args))
+
+if __name__ == "__main__":
+    main()
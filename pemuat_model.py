@@ -0,0 +1,187 @@
+# pemuat_model.py
+"""
+Pemuatan aset model di thread latar belakang.
+
+Aset pra-pemrosesan, model sentimen (TensorFlow), dan model LDA (gensim)
+dimuat bersamaan di thread terpisah sehingga halaman tidak perlu menunggu
+sebelum dirender. Status setiap aset (belum dimuat / memuat / siap / gagal)
+dapat dibaca kapan saja. Setelah semuanya siap, satu prediksi contoh
+dijalankan agar pemanggilan pertama model tidak lambat.
+
+Aset berversi (model LDA, lihat pelatihan_lda.py) diperiksa berkala saat
+hasilnya diambil. Jika versi aktif di disk berubah, versi baru dimuat di
+latar belakang lalu ditukar; sampai saat itu versi lama tetap dipakai.
+"""
+
+import sys
+import threading
+import time
+
+BELUM = 'belum dimuat'
+MEMUAT = 'memuat'
+SIAP = 'siap'
+GAGAL = 'gagal'
+
+# Nama aset -> nama fungsi pemuat di modul prediksi
+ASET_MODEL = {
+    'pra_pemrosesan': 'muat_aset_pra_pemrosesan',
+    'sentimen': 'muat_model_sentimen',
+    'lda': 'muat_model_lda',
+}
+# Nama aset -> nama fungsi di modul prediksi yang mengembalikan versi aktifnya.
+# Fungsi pemuat aset berversi menerima versi sebagai argumen.
+VERSI_ASET = {
+    'lda': 'versi_lda_aktif',
+}
+INTERVAL_CEK_VERSI = 5.0
+
+class PemuatModel:
+    """Memuat semua aset model di latar belakang dan mencatat statusnya."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._status = {nama: BELUM for nama in ASET_MODEL}
+        self._hasil = {}
+        self._galat = {}
+        self._durasi = {}
+        self._versi = {}
+        self._galat_pembaruan = {}
+        self._memuat_ulang = set()
+        self._cek_terakhir = 0.0
+        self._thread = []
+        self._hangat = threading.Event()
+
+    def mulai(self):
+        """Memulai pemuatan (sekali saja); langsung kembali tanpa menunggu."""
+        with self._lock:
+            if self._thread:
+                return self
+            for nama in ASET_MODEL:
+                self._status[nama] = MEMUAT
+                thread = threading.Thread(target=self._muat, args=(nama,), name=f"pemuat-{nama}", daemon=True)
+                self._thread.append(thread)
+            for thread in self._thread:
+                thread.start()
+        threading.Thread(target=self._hangatkan, name="pemuat-hangatkan", daemon=True).start()
+        return self
+
+    def _muat(self, nama):
+        mulai = time.perf_counter()
+        try:
+            import prediksi
+            if nama in VERSI_ASET:
+                versi = getattr(prediksi, VERSI_ASET[nama])()
+                hasil = getattr(prediksi, ASET_MODEL[nama])(versi)
+            else:
+                versi, hasil = None, getattr(prediksi, ASET_MODEL[nama])()
+        except Exception as e:
+            with self._lock:
+                self._status[nama] = GAGAL
+                self._galat[nama] = e
+        else:
+            with self._lock:
+                self._hasil[nama] = hasil
+                self._versi[nama] = versi
+                self._status[nama] = SIAP
+        finally:
+            with self._lock:
+                self._durasi[nama] = time.perf_counter() - mulai
+
+    def periksa_pembaruan(self, paksa=False):
+        """
+        Memulai pemuatan ulang di latar belakang untuk aset berversi yang versi
+        aktifnya berubah. Paling sering sekali setiap INTERVAL_CEK_VERSI detik
+        kecuali `paksa`; langsung kembali tanpa menunggu.
+        """
+        sekarang = time.monotonic()
+        with self._lock:
+            if not paksa and sekarang - self._cek_terakhir < INTERVAL_CEK_VERSI:
+                return
+            self._cek_terakhir = sekarang
+            dimuat = {nama: self._versi[nama] for nama in VERSI_ASET
+                      if self._status[nama] == SIAP and nama not in self._memuat_ulang}
+        import prediksi
+        for nama, versi_lama in dimuat.items():
+            try:
+                versi = getattr(prediksi, VERSI_ASET[nama])()
+            except Exception as e:
+                with self._lock:
+                    self._galat_pembaruan[nama] = e
+                continue
+            if versi == versi_lama:
+                continue
+            with self._lock:
+                if nama in self._memuat_ulang:
+                    continue
+                self._memuat_ulang.add(nama)
+            threading.Thread(target=self._muat_ulang, args=(nama, versi), name=f"pemuat-ulang-{nama}",
+                             daemon=True).start()
+
+    def _muat_ulang(self, nama, versi):
+        try:
+            import prediksi
+            hasil = getattr(prediksi, ASET_MODEL[nama])(versi)
+        except Exception as e:
+            # Versi lama tetap dipakai; pemuatan dicoba lagi pada pemeriksaan berikutnya
+            print(f"Gagal memuat {nama} versi {versi}: {e}", file=sys.stderr)
+            with self._lock:
+                self._galat_pembaruan[nama] = e
+                self._memuat_ulang.discard(nama)
+        else:
+            with self._lock:
+                self._hasil[nama] = hasil
+                self._versi[nama] = versi
+                self._galat_pembaruan.pop(nama, None)
+                self._memuat_ulang.discard(nama)
+
+    def _hangatkan(self):
+        # Prediksi contoh agar graf TensorFlow sudah terbentuk sebelum dipakai pengguna
+        for thread in list(self._thread):
+            thread.join()
+        try:
+            if self.siap():
+                import prediksi
+                aset_prep = self.hasil('pra_pemrosesan')
+                model, tokenizer, label_encoder = self.hasil('sentimen')
+                prediksi.prediksi_sentimen("aplikasi membantu", model, tokenizer, label_encoder, aset_prep)
+        except Exception:
+            pass  # Kegagalan pemanasan tidak memengaruhi status aset
+        finally:
+            self._hangat.set()
+
+    def status(self):
+        """{nama_aset: (status, detik_pemuatan atau None, pesan galat atau None)}."""
+        with self._lock:
+            return {nama: (self._status[nama], self._durasi.get(nama),
+                           str(self._galat[nama]) if nama in self._galat else None) for nama in ASET_MODEL}
+
+    def siap(self):
+        """True jika semua aset berhasil dimuat."""
+        with self._lock:
+            return all(status == SIAP for status in self._status.values())
+
+    def selesai(self):
+        """True jika pemuatan semua aset sudah selesai (berhasil maupun gagal)."""
+        with self._lock:
+            return all(status in (SIAP, GAGAL) for status in self._status.values())
+
+    def hasil(self, nama):
+        """Aset yang sudah dimuat; None jika belum siap atau gagal."""
+        return self.hasil_berversi(nama)[0]
+
+    def hasil_berversi(self, nama):
+        """(aset, versi) yang dimuat bersamaan; versi None untuk aset tanpa versi."""
+        if nama in VERSI_ASET:
+            self.periksa_pembaruan()
+        with self._lock:
+            return self._hasil.get(nama), self._versi.get(nama)
+
+    def galat_pembaruan(self, nama):
+        """Pesan galat pemuatan ulang terakhir untuk aset berversi, atau None."""
+        with self._lock:
+            return str(self._galat_pembaruan[nama]) if nama in self._galat_pembaruan else None
+
+    def tunggu(self, timeout=None):
+        """Menunggu sampai pemuatan dan pemanasan selesai. True jika semua aset siap."""
+        self._hangat.wait(timeout)
+        return self.siap()
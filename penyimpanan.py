@@ -0,0 +1,235 @@
+# penyimpanan.py
+"""
+Penyimpanan kolumnar (Parquet) untuk dataset ulasan dashboard.
+
+CSV hasil analisis tetap menjadi sumber data. Versi Parquet menyimpan kolom
+berkardinalitas rendah sebagai categorical, 'confidence_score' sebagai float32,
+dan kolom turunan (mis. 'Topik_Gabungan') yang sudah dihitung, sehingga
+pemuatan ulang jauh lebih cepat dan hemat memori. Modul ini juga berisi
+fungsi ekspor CSV/XLSX bertahap (per chunk) untuk tabel ulasan.
+
+Mengonversi CSV ke Parquet:
+
+    python penyimpanan.py hasil_terstruktur_diperbaiki.csv
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from berkas import path_atomik
+from instrumentasi import ukur
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow opsional; tanpa pyarrow data selalu dibaca dari CSV
+    pa = pq = None
+
+DIR_CACHE = "assets/cache"
+KOLOM_KATEGORI = ['sentimen', 'deskripsi_topik', 'detail_topik', 'Topik_Gabungan']
+KUNCI_METADATA = b'sumber_csv'
+
+def path_parquet_untuk(path_csv):
+    """Lokasi default file Parquet untuk sebuah file CSV."""
+    nama = os.path.splitext(os.path.basename(path_csv))[0]
+    return os.path.join(DIR_CACHE, f"{nama}.parquet")
+
+def _sidik_sumber(path_csv):
+    # Ukuran dan waktu modifikasi cukup untuk mendeteksi CSV yang berubah
+    # tanpa harus membaca ulang seluruh isinya.
+    info = os.stat(path_csv)
+    return {'ukuran': info.st_size, 'mtime_ns': info.st_mtime_ns}
+
+def versi_dataset(path_csv):
+    """Penanda singkat versi file CSV, dipakai sebagai kunci cache turunan dataset."""
+    return hashlib.sha1(json.dumps(_sidik_sumber(path_csv), sort_keys=True).encode()).hexdigest()[:12]
+
+def siapkan_dataframe(df):
+    """
+    Menyeragamkan skema dataframe hasil analisis: nama kolom, kolom turunan,
+    dan tipe data yang hemat memori.
+    """
+    # Ganti nama 'skor_sentimen' menjadi 'confidence_score' untuk konsistensi internal
+    if 'skor_sentimen' in df.columns:
+        df = df.rename(columns={'skor_sentimen': 'confidence_score'})
+
+    df['Topik_Gabungan'] = df['deskripsi_topik'].astype(str) + ", " + df['detail_topik'].astype(str)
+    if 'pecahan_kalimat' not in df.columns:
+        df['pecahan_kalimat'] = df['ulasan_lengkap']
+
+    for kolom in KOLOM_KATEGORI:
+        if kolom in df.columns:
+            df[kolom] = df[kolom].astype('category')
+    if 'confidence_score' in df.columns:
+        df['confidence_score'] = df['confidence_score'].astype('float32')
+    return df
+
+def konversi_ke_parquet(path_csv, path_parquet=None):
+    """Membaca CSV, menyiapkan skemanya, lalu menyimpannya sebagai Parquet."""
+    if pq is None:
+        raise ImportError("pyarrow dibutuhkan untuk menyimpan data dalam format Parquet.")
+    path_parquet = path_parquet or path_parquet_untuk(path_csv)
+    sidik = _sidik_sumber(path_csv)
+    df = siapkan_dataframe(pd.read_csv(path_csv))
+
+    tabel = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(tabel.schema.metadata or {})
+    metadata[KUNCI_METADATA] = json.dumps(sidik).encode()
+    tabel = tabel.replace_schema_metadata(metadata)
+
+    with path_atomik(path_parquet) as sementara:
+        pq.write_table(tabel, sementara)
+    return df
+
+def parquet_masih_baru(path_csv, path_parquet):
+    """True jika file Parquet ada dan dibuat dari versi CSV yang sama."""
+    if pq is None or not os.path.exists(path_parquet):
+        return False
+    try:
+        metadata = pq.read_schema(path_parquet).metadata or {}
+        return json.loads(metadata.get(KUNCI_METADATA, b'null')) == _sidik_sumber(path_csv)
+    except (OSError, ValueError, pa.ArrowException):
+        return False
+
+@ukur('muat_data')
+def baca_data(path_csv, path_parquet=None, tulis_cache=True):
+    """
+    Membaca dataset ulasan. File Parquet dipakai jika masih baru; jika tidak,
+    CSV dibaca dan (bila memungkinkan) file Parquet dibuat ulang.
+    """
+    path_parquet = path_parquet or path_parquet_untuk(path_csv)
+    if parquet_masih_baru(path_csv, path_parquet):
+        return pd.read_parquet(path_parquet)
+    if tulis_cache and pq is not None:
+        try:
+            return konversi_ke_parquet(path_csv, path_parquet)
+        except OSError:
+            pass  # Direktori cache tidak dapat ditulis; cukup baca dari CSV
+    return siapkan_dataframe(pd.read_csv(path_csv))
+
+def _akhir_rekaman(data, dalam_kutip=False):
+    """
+    Mengembalikan (jumlah byte `data` sampai akhir rekaman CSV lengkap terakhir,
+    status tanda kutip di akhir `data`). Baris baru di dalam field ber-kutip
+    bukan akhir rekaman; `dalam_kutip` adalah status kutip di awal `data`.
+    """
+    byte = np.frombuffer(data, dtype=np.uint8)
+    if not len(byte):
+        return 0, dalam_kutip
+    # '""' (kutip yang di-escape) menambah dua sehingga paritasnya tidak berubah
+    paritas = (np.cumsum(byte == ord('"')) + dalam_kutip) % 2
+    baris = np.flatnonzero((byte == ord('\n')) & (paritas == 0))
+    akhir = int(baris[-1]) + 1 if len(baris) else 0
+    return akhir, bool(paritas[-1])
+
+def awal_baris(path_csv, offset):
+    """
+    Posisi byte awal rekaman CSV yang memuat byte `offset - 1`; sama dengan
+    `offset` jika posisi itu sudah tepat di awal rekaman. File dibaca dari
+    awal agar field ber-kutip yang berisi baris baru tidak terpotong.
+    """
+    awal, posisi, dalam_kutip = 0, 0, False
+    with open(path_csv, 'rb') as f:
+        while posisi < offset:
+            blok = f.read(min(1 << 20, offset - posisi))
+            if not blok:
+                break
+            akhir, dalam_kutip = _akhir_rekaman(blok, dalam_kutip)
+            if akhir:
+                awal = posisi + akhir
+            posisi += len(blok)
+    return awal
+
+def baca_baris_baru(path_csv, offset, kolom):
+    """
+    Membaca rekaman lengkap yang ditambahkan ke CSV setelah posisi byte `offset`
+    (harus awal rekaman). Mengembalikan (dataframe yang sudah disiapkan atau
+    None, offset baru). Rekaman terakhir yang belum selesai ditulis, termasuk
+    field ber-kutip yang belum ditutup, dibiarkan untuk pembacaan berikutnya.
+    """
+    with open(path_csv, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    akhir, _ = _akhir_rekaman(data)
+    if akhir == 0:
+        return None, offset
+    df = pd.read_csv(io.BytesIO(data[:akhir]), header=None, names=list(kolom))
+    return siapkan_dataframe(df), offset + akhir
+
+def gabung_baris(df, df_baru):
+    """
+    Menambahkan baris `df_baru` (hasil siapkan_dataframe) ke akhir `df`.
+    Kategori kolom categorical diselaraskan lebih dulu agar hasilnya tetap
+    categorical; `df` sendiri tidak diubah.
+    """
+    df = df.copy(deep=False)
+    df_baru = df_baru.reindex(columns=df.columns)
+    for kolom in KOLOM_KATEGORI:
+        if kolom in df.columns and isinstance(df[kolom].dtype, pd.CategoricalDtype):
+            lama = df[kolom].cat.categories
+            baru = pd.Index(df_baru[kolom].dropna().astype(str).unique())
+            df[kolom] = df[kolom].cat.add_categories(baru.difference(lama, sort=False))
+            df_baru[kolom] = pd.Categorical(df_baru[kolom].astype(object), categories=df[kolom].cat.categories)
+    return pd.concat([df, df_baru], ignore_index=True)
+
+UKURAN_CHUNK_EKSPOR = 5000
+
+def _chunk_posisi(posisi, ukuran_chunk):
+    for i in range(0, len(posisi), ukuran_chunk):
+        yield posisi[i:i + ukuran_chunk]
+
+def ekspor_csv(df, posisi, kolom, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    """
+    Menulis baris `posisi` (kolom `kolom`) dari `df` sebagai CSV. Baris diambil
+    per chunk sehingga tidak ada salinan dataframe hasil filter, tetapi isi file
+    tetap dibangun utuh di memori karena st.download_button membutuhkan seluruh
+    payload. Mengembalikan io.BytesIO yang sudah di-rewind.
+    """
+    berkas = io.BytesIO()
+    berkas.write(pd.DataFrame(columns=kolom).to_csv(index=False).encode('utf-8'))
+    for chunk in _chunk_posisi(posisi, ukuran_chunk):
+        berkas.write(df.iloc[chunk][kolom].to_csv(index=False, header=False).encode('utf-8'))
+    berkas.seek(0)
+    return berkas
+
+def ekspor_xlsx(df, posisi, kolom, ukuran_chunk=UKURAN_CHUNK_EKSPOR):
+    """
+    Seperti ekspor_csv, tetapi dalam format XLSX. Workbook ditulis dengan mode
+    write-only openpyxl sehingga baris tidak ditahan sebagai sel; file XLSX
+    hasilnya tetap utuh di memori.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Ulasan")
+    sheet.append(list(kolom))
+    for chunk in _chunk_posisi(posisi, ukuran_chunk):
+        bagian = df.iloc[chunk][kolom]
+        # float32 ditulis sebagai float64 yang dibulatkan agar tidak muncul angka seperti 0.99199998
+        bagian = bagian.astype({k: 'float64' for k in kolom if bagian[k].dtype == 'float32'}).round(6).astype(object)
+        for baris in bagian.where(bagian.notna(), None).itertuples(index=False, name=None):
+            sheet.append(baris)
+    berkas = io.BytesIO()
+    workbook.save(berkas)
+    berkas.seek(0)
+    return berkas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mengonversi CSV hasil analisis ke format Parquet.")
+    parser.add_argument("csv", help="File CSV hasil analisis.")
+    parser.add_argument("-o", "--output", help=f"File Parquet tujuan (default: {DIR_CACHE}/<nama>.parquet).")
+    args = parser.parse_args(argv)
+
+    path_parquet = args.output or path_parquet_untuk(args.csv)
+    df = konversi_ke_parquet(args.csv, path_parquet)
+    print(f"{len(df):,} baris -> {path_parquet} "
+          f"({os.path.getsize(path_parquet) / 1e6:.2f} MB, {df.memory_usage(deep=True).sum() / 1e6:.2f} MB di memori)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# pipeline_paralel.py
+"""
+Pipeline penilaian paralel untuk model sentimen (LSTM) dan topik (LDA).
+
+Tahap 1 (pra-pemrosesan: normalisasi kamus dan stemming Sastrawi, murni
+Python) dijalankan oleh sekumpulan proses pekerja per chunk. Tahap 2 (model)
+dijalankan oleh satu tahap tunggal di proses utama: prediksi LSTM secara
+batch dan inferensi LDA batch. Jumlah chunk yang sedang diproses dibatasi
+(antrean terbatas) sehingga pembacaan input tidak berlari jauh di depan
+tahap model, dan hasil selalu ditulis sesuai urutan input.
+
+    python pipeline_paralel.py ulasan.csv -o hasil.csv --pekerja 8 --mode semua
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from pra_pemrosesan import buat_pipeline
+
+UKURAN_CHUNK_DEFAULT = 2000
+
+# Pipeline pra-pemrosesan milik setiap proses pekerja
+_PIPELINE = None
+
+def _inisialisasi_pekerja(path_kamus, custom_stopwords):
+    global _PIPELINE
+    _PIPELINE = buat_pipeline(path_kamus, custom_stopwords)
+
+def _praproses_chunk(daftar_teks):
+    """Dijalankan di proses pekerja: pra-pemrosesan satu chunk untuk kedua model."""
+    return _PIPELINE.proses_batch(daftar_teks)
+
+def nilai_paralel(chunks, sentimen=True, topik=True, pekerja=None, maks_antrean=None,
+                  kolom_teks='pecahan_kalimat', ukuran_batch=None, cache=None):
+    """
+    Menilai iterable berisi dataframe (chunk) secara paralel dan menghasilkan
+    (yield) dataframe hasil dengan urutan yang sama seperti input.
+
+    `pekerja` adalah jumlah proses pra-pemrosesan (default: jumlah CPU) dan
+    `maks_antrean` adalah jumlah chunk maksimal yang sedang diproses sekaligus
+    (default: 2 x pekerja). `cache` (CachePrediksi) dipakai di tahap model.
+    """
+    # Diimpor di sini agar proses pekerja tidak ikut memuat TensorFlow/gensim
+    import prediksi
+
+    pekerja = pekerja or os.cpu_count() or 1
+    maks_antrean = maks_antrean or 2 * pekerja
+    ukuran_batch = ukuran_batch or prediksi.UKURAN_BATCH_DEFAULT
+    if sentimen:
+        model, tokenizer, label_encoder = prediksi.muat_model_sentimen()
+    if topik:
+        model_lda, dictionary_lda = prediksi.muat_model_lda()
+
+    konteks = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=pekerja, mp_context=konteks, initializer=_inisialisasi_pekerja,
+                             initargs=(prediksi.PATH_KAMUS, prediksi.CUSTOM_STOPWORDS)) as executor:
+        antrean = deque()
+        chunks = iter(chunks)
+        habis = False
+        while antrean or not habis:
+            # Isi antrean sampai batasnya; chunk berikutnya baru dibaca saat ada tempat
+            while not habis and len(antrean) < maks_antrean:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    habis = True
+                    break
+                teks = chunk[kolom_teks].fillna('').astype(str).tolist()
+                antrean.append((chunk, executor.submit(_praproses_chunk, teks)))
+            if not antrean:
+                break
+
+            # Tahap model: selalu chunk tertua lebih dulu agar urutan output deterministik
+            chunk, future = antrean.popleft()
+            hasil_prep = future.result()
+            chunk = chunk.copy()
+            if topik:
+                hasil_topik = prediksi.prediksi_topik_token([p.token_lda for p in hasil_prep], model_lda,
+                                                            dictionary_lda, prediksi.LABEL_TOPIK, cache)
+                chunk['deskripsi_topik'] = [deskripsi for deskripsi, _, _ in hasil_topik]
+                chunk['detail_topik'] = [detail for _, detail, _ in hasil_topik]
+            if sentimen:
+                hasil_sentimen = []
+                for i in range(0, len(hasil_prep), ukuran_batch):
+                    teks_bersih = [p.teks_lstm for p in hasil_prep[i:i + ukuran_batch]]
+                    hasil_sentimen.extend(prediksi.prediksi_sentimen_teks_bersih(
+                        teks_bersih, model, tokenizer, label_encoder, ukuran_batch, cache))
+                chunk['sentimen'] = [label for label, _ in hasil_sentimen]
+                chunk['skor_sentimen'] = [round(skor, 3) for _, skor in hasil_sentimen]
+            yield chunk
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menilai sentimen dan topik ulasan CSV secara paralel.")
+    parser.add_argument("input", help="File CSV berisi ulasan.")
+    parser.add_argument("-o", "--output", help="File CSV hasil (default: <input>_dinilai.csv).")
+    parser.add_argument("--kolom-teks", default=None,
+                        help="Kolom teks yang dinilai (default: 'pecahan_kalimat' jika ada, selain itu 'ulasan_lengkap').")
+    parser.add_argument("--mode", choices=['sentimen', 'topik', 'semua'], default='semua',
+                        help="Kolom yang dinilai ulang: sentimen, topik, atau keduanya.")
+    parser.add_argument("--pekerja", type=int, default=None, help="Jumlah proses pra-pemrosesan (default: jumlah CPU).")
+    parser.add_argument("--maks-antrean", type=int, default=None,
+                        help="Jumlah chunk maksimal yang diproses bersamaan (default: 2 x pekerja).")
+    parser.add_argument("--ukuran-chunk", type=int, default=UKURAN_CHUNK_DEFAULT, help="Jumlah baris per chunk.")
+    parser.add_argument("--tanpa-cache", action="store_true",
+                        help="Nilai semua teks dengan model tanpa memakai cache hasil prediksi.")
+    args = parser.parse_args(argv)
+
+    import prediksi
+    cache = None if args.tanpa_cache else prediksi.cache_prediksi()
+
+    path_output = args.output or f"{os.path.splitext(args.input)[0]}_dinilai.csv"
+    kolom_teks = args.kolom_teks
+    if kolom_teks is None:
+        kolom = pd.read_csv(args.input, nrows=0).columns
+        kolom_teks = 'pecahan_kalimat' if 'pecahan_kalimat' in kolom else 'ulasan_lengkap'
+
+    chunks = pd.read_csv(args.input, chunksize=args.ukuran_chunk)
+    hasil = nilai_paralel(chunks, sentimen=args.mode in ('sentimen', 'semua'), topik=args.mode in ('topik', 'semua'),
+                          pekerja=args.pekerja, maks_antrean=args.maks_antrean, kolom_teks=kolom_teks, cache=cache)
+
+    jumlah_baris = 0
+    mulai = time.perf_counter()
+    for i, chunk in enumerate(hasil):
+        chunk.to_csv(path_output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        jumlah_baris += len(chunk)
+        durasi = time.perf_counter() - mulai
+        print(f"{jumlah_baris:,} baris dinilai ({jumlah_baris / durasi:,.1f} baris/detik)", file=sys.stderr)
+    durasi = time.perf_counter() - mulai
+    print(f"Selesai: {jumlah_baris:,} baris dalam {durasi:.1f} detik "
+          f"({jumlah_baris / max(durasi, 1e-9):,.1f} baris/detik) -> {path_output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+# pra_pemrosesan.py
+"""
+Pipeline pra-pemrosesan teks bersama untuk model sentimen (LSTM) dan model topik (LDA).
+
+Teks cukup di-tokenisasi dan dinormalisasi satu kali; hasilnya dipakai oleh kedua
+model. Stemming Sastrawi dilakukan per token melalui cache LRU berukuran terbatas,
+sehingga kata yang sering muncul hanya di-stem sekali. Cache tersebut dapat
+didukung oleh cache SQLite di disk agar tetap hangat setelah aplikasi di-restart.
+Kamus normalisasi dibaca dari versi terkompilasi (pickle) alih-alih file Excel.
+
+Mengompilasi kamus dan menghangatkan cache disk dari korpus yang sudah ada:
+
+    python pra_pemrosesan.py hasil_terstruktur_diperbaiki.csv
+"""
+
+import argparse
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from collections import namedtuple
+from functools import lru_cache
+from importlib.metadata import version, PackageNotFoundError
+
+import pandas as pd
+from Sastrawi.Stemmer.Filter import TextNormalizer
+from Sastrawi.Stemmer.StemmerFactory import StemmerFactory
+from Sastrawi.StopWordRemover.StopWordRemoverFactory import StopWordRemoverFactory
+
+from berkas import tulis_atomik
+from instrumentasi import daftarkan_cache, ukur
+
+UKURAN_CACHE_STEM = 50000
+PATH_CACHE_STEM = "assets/cache/stem_cache.sqlite"
+PATH_KAMUS_KOMPILASI = "assets/cache/kamuskatabaku.pkl"
+VERSI_FORMAT_KAMUS = 1
+
+HasilPraPemrosesan = namedtuple('HasilPraPemrosesan', ['teks_lstm', 'token_lda'])
+
+def percepat_kamus_sastrawi(stemmer):
+    """
+    Mengganti daftar kata dasar Sastrawi (list, dicek secara linear) dengan set.
+    Hasil stemming tidak berubah, hanya pencarian kata dasar yang menjadi O(1).
+    """
+    dictionary = getattr(stemmer, 'delegatedStemmer', stemmer).get_dictionary()
+    dictionary.words = set(dictionary.words)
+    return stemmer
+
+def buat_stemmer():
+    """Membuat stemmer Sastrawi dengan pencarian kata dasar berbasis set."""
+    return percepat_kamus_sastrawi(StemmerFactory().create_stemmer())
+
+def _hash_file(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def sidik_aset(*paths):
+    """
+    Sidik jari (hash) isi file aset dan versi Sastrawi.
+    Dipakai untuk mendeteksi cache yang sudah usang.
+    """
+    h = hashlib.sha1()
+    for path in paths:
+        h.update(_hash_file(path).encode())
+    try:
+        h.update(version('Sastrawi').encode())
+    except PackageNotFoundError:
+        pass
+    return h.hexdigest()
+
+def kompilasi_kamus(path_xlsx, path_kompilasi=PATH_KAMUS_KOMPILASI):
+    """
+    Membaca kamus normalisasi dari file Excel dan menyimpannya sebagai pickle
+    beserta hash file sumbernya. Mengembalikan dict kamus.
+    """
+    kamus_df = pd.read_excel(path_xlsx)
+    kamus_norm = dict(zip(kamus_df['tidak_baku'], kamus_df['kata_baku']))
+
+    with tulis_atomik(path_kompilasi, 'wb') as f:
+        pickle.dump({'versi': VERSI_FORMAT_KAMUS, 'sidik': _hash_file(path_xlsx), 'kamus': kamus_norm},
+                    f, protocol=pickle.HIGHEST_PROTOCOL)
+    return kamus_norm
+
+def muat_kamus_norm(path_xlsx, path_kompilasi=PATH_KAMUS_KOMPILASI):
+    """
+    Memuat kamus normalisasi dari versi terkompilasi. File Excel hanya dibaca
+    (dan versi terkompilasi dibuat ulang) jika file kompilasi belum ada atau usang.
+    """
+    try:
+        with open(path_kompilasi, 'rb') as f:
+            data = pickle.load(f)
+        if data.get('versi') == VERSI_FORMAT_KAMUS and data.get('sidik') == _hash_file(path_xlsx):
+            return data['kamus']
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    return kompilasi_kamus(path_xlsx, path_kompilasi)
+
+class CacheStemPersisten:
+    """
+    Cache stem per token yang disimpan di file SQLite.
+
+    Koneksi baru dibuka saat pertama kali dibutuhkan. Jika sidik jari aset
+    (kamus normalisasi dan versi Sastrawi) berbeda dari yang tersimpan, isi
+    cache dikosongkan. Stem baru ditampung di memori lalu ditulis sekaligus
+    lewat simpan().
+    """
+
+    def __init__(self, path, sidik):
+        self.path = path
+        self.sidik = sidik
+        self._conn = None
+        self._tertunda = {}
+        self._lock = threading.Lock()
+
+    def _koneksi(self):
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (kunci TEXT PRIMARY KEY, nilai TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS stem (token TEXT PRIMARY KEY, hasil TEXT NOT NULL)")
+            baris = conn.execute("SELECT nilai FROM meta WHERE kunci = 'sidik'").fetchone()
+            if baris is None or baris[0] != self.sidik:
+                conn.execute("DELETE FROM stem")
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('sidik', ?)", (self.sidik,))
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, token):
+        """Mengembalikan stem token dari disk, atau None jika belum ada."""
+        with self._lock:
+            if token in self._tertunda:
+                return self._tertunda[token]
+            baris = self._koneksi().execute("SELECT hasil FROM stem WHERE token = ?", (token,)).fetchone()
+        return baris[0] if baris else None
+
+    def set(self, token, hasil):
+        with self._lock:
+            self._tertunda[token] = hasil
+
+    def simpan(self):
+        """Menulis stem yang masih tertunda ke disk dalam satu transaksi."""
+        with self._lock:
+            if not self._tertunda:
+                return
+            conn = self._koneksi()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO stem VALUES (?, ?)", self._tertunda.items())
+            self._tertunda.clear()
+
+    def __len__(self):
+        with self._lock:
+            return self._koneksi().execute("SELECT COUNT(*) FROM stem").fetchone()[0]
+
+class PipelinePraPemrosesan:
+    """
+    Tokenisasi, normalisasi kamus, penghapusan stopword, dan stemming bersama.
+
+    Hasilnya identik dengan pra_pemrosesan_lstm/pra_pemrosesan_lda versi lama,
+    tetapi stopword dicek dengan set dan stem setiap token disimpan di cache LRU.
+    """
+
+    def __init__(self, stemmer, stopword_remover, kamus_norm, custom_stopwords,
+                 ukuran_cache=UKURAN_CACHE_STEM, cache_persisten=None):
+        # Stemmer bawaan Sastrawi (CachedStemmer) menyimpan cache tanpa batas;
+        # di sini dipakai stemmer dasarnya dan cache dikelola sendiri.
+        self.stemmer = getattr(stemmer, 'delegatedStemmer', stemmer)
+        self.stopword_remover = stopword_remover
+        self.kamus_norm = kamus_norm
+        self.stopwords_lstm = frozenset(stopword_remover.get_dictionary().words)
+        self.stopwords_lda = frozenset(custom_stopwords)
+        self.cache_persisten = cache_persisten
+        self.stem_token = lru_cache(maxsize=ukuran_cache)(self._stem_token)
+
+    def _stem_token(self, token):
+        """Stem satu token; token bisa terpecah menjadi beberapa kata setelah dinormalisasi Sastrawi."""
+        if self.cache_persisten is not None:
+            hasil = self.cache_persisten.get(token)
+            if hasil is not None:
+                return hasil
+        kata = TextNormalizer.normalize_text(token).split(' ')
+        hasil = ' '.join(self.stemmer.stem_word(k) for k in kata if k)
+        if self.cache_persisten is not None:
+            self.cache_persisten.set(token, hasil)
+        return hasil
+
+    def statistik_cache(self):
+        """Mengembalikan statistik cache stem: hits, misses, ukuran, dan hit rate."""
+        info = self.stem_token.cache_info()
+        total = info.hits + info.misses
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'ukuran': info.currsize,
+            'ukuran_maks': info.maxsize,
+            'hit_rate': info.hits / total if total else 0.0,
+        }
+
+    @ukur('normalisasi')
+    def normalisasi_batch(self, daftar_teks):
+        """
+        Lowercase, split, dan normalisasi kamus untuk satu batch teks.
+        Setiap kata unik dalam batch hanya dicari satu kali di kamus.
+        """
+        daftar_kata = [str(teks).lower().split() for teks in daftar_teks]
+        kosakata = {kata for kata_teks in daftar_kata for kata in kata_teks}
+        peta = {kata: self.kamus_norm.get(kata, kata).split() for kata in kosakata}
+        return [[hasil for kata in kata_teks for hasil in peta[kata]] for kata_teks in daftar_kata]
+
+    def _hapus_stopword_lstm(self, tokens):
+        # Meniru StopWordRemover.remove Sastrawi apa adanya (termasuk perilakunya yang
+        # melewati kata setelah kata yang dihapus) agar input LSTM sama seperti saat pelatihan.
+        words = list(tokens)
+        for word in words:
+            if word in self.stopwords_lstm:
+                words.remove(word)
+        return words
+
+    def _stem_tokens(self, tokens):
+        return ' '.join(stem for stem in map(self.stem_token, tokens) if stem)
+
+    def untuk_lstm(self, tokens):
+        """Teks bersih untuk model LSTM dari token yang sudah dinormalisasi."""
+        return self._stem_tokens(self._hapus_stopword_lstm(tokens))
+
+    def untuk_lda(self, tokens):
+        """Daftar token bersih untuk model LDA dari token yang sudah dinormalisasi."""
+        teks = self._stem_tokens([word for word in tokens if word not in self.stopwords_lda])
+        return teks.split()
+
+    @ukur('pra_pemrosesan')
+    def proses_batch(self, daftar_teks):
+        """Pra-pemrosesan satu batch teks untuk kedua model sekaligus."""
+        hasil = [HasilPraPemrosesan(self.untuk_lstm(tokens), self.untuk_lda(tokens))
+                 for tokens in self.normalisasi_batch(daftar_teks)]
+        if self.cache_persisten is not None:
+            self.cache_persisten.simpan()
+        return hasil
+
+    def proses(self, teks):
+        """Pra-pemrosesan satu teks untuk kedua model sekaligus."""
+        return self.proses_batch([teks])[0]
+
+def buat_pipeline(path_kamus, custom_stopwords, path_cache_stem=PATH_CACHE_STEM):
+    """
+    Membuat pipeline lengkap: stemmer dan stopword Sastrawi, kamus normalisasi
+    terkompilasi, dan cache stem di disk (dikosongkan otomatis jika kamus atau
+    versi Sastrawi berubah). Tidak memuat model apa pun, sehingga murah untuk
+    dipanggil di proses pekerja.
+    """
+    stemmer = buat_stemmer()
+    stopword_remover = StopWordRemoverFactory().create_stop_word_remover()
+    kamus_norm = muat_kamus_norm(path_kamus)
+    cache_persisten = None
+    if path_cache_stem:
+        cache_persisten = CacheStemPersisten(path_cache_stem, sidik_aset(path_kamus))
+    pipeline = PipelinePraPemrosesan(stemmer, stopword_remover, kamus_norm, custom_stopwords,
+                                     cache_persisten=cache_persisten)
+    daftarkan_cache('stem', pipeline.statistik_cache)
+    return pipeline
+
+def hangatkan_cache(pipeline, daftar_teks, ukuran_batch=1000):
+    """Menjalankan pipeline atas seluruh teks agar semua token tersimpan di cache."""
+    daftar_teks = list(daftar_teks)
+    for i in range(0, len(daftar_teks), ukuran_batch):
+        pipeline.proses_batch(daftar_teks[i:i + ukuran_batch])
+    return pipeline.statistik_cache()
+
+def main(argv=None):
+    # Impor di sini untuk menghindari impor melingkar (prediksi mengimpor modul ini)
+    from prediksi import PATH_KAMUS, muat_aset_pra_pemrosesan
+
+    parser = argparse.ArgumentParser(
+        description="Mengompilasi kamus normalisasi dan menghangatkan cache stem di disk dari korpus CSV.")
+    parser.add_argument("csv", nargs='*', help="File CSV berisi ulasan.")
+    parser.add_argument("--kolom-teks", default='ulasan_lengkap', help="Kolom teks yang diproses.")
+    args = parser.parse_args(argv)
+
+    kamus_norm = kompilasi_kamus(PATH_KAMUS)
+    print(f"Kamus normalisasi: {len(kamus_norm):,} entri -> {PATH_KAMUS_KOMPILASI}")
+
+    aset_prep = muat_aset_pra_pemrosesan()
+    for path in args.csv:
+        teks = pd.read_csv(path, usecols=[args.kolom_teks])[args.kolom_teks].dropna().astype(str).unique()
+        statistik = hangatkan_cache(aset_prep.pipeline, teks)
+        print(f"{path}: {len(teks):,} teks unik diproses, {statistik['misses']:,} token baru di-stem")
+    print(f"Cache berisi {len(aset_prep.pipeline.cache_persisten):,} token -> {aset_prep.pipeline.cache_persisten.path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+# prediksi.py
+"""
+Fungsi-fungsi pemuatan aset, pra-pemrosesan, dan prediksi untuk model
+sentimen (Stacked Bi-LSTM) dan model topik (LDA 12 topik).
+
+Modul ini dipakai oleh halaman "Demo & Evaluasi" dan juga bisa dijalankan
+langsung dari command line untuk menilai ulang seluruh file CSV secara batch:
+
+    python prediksi.py hasil_terstruktur_diperbaiki.csv -o hasil_baru.csv
+    python prediksi.py ulasan_baru.csv --mode semua
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import sys
+import time
+import weakref
+from collections import namedtuple
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from pra_pemrosesan import buat_pipeline
+from cache_prediksi import CachePrediksi, PATH_CACHE_PREDIKSI, hasil_dengan_cache, sidik_file
+from enkoder_teks import EnkoderTeks, muat_enkoder
+from instrumentasi import daftarkan_cache, ukur
+
+# ==============================================================================
+# KONSTANTA ASET
+# ==============================================================================
+
+PATH_KAMUS = "assets/kamuskatabaku.xlsx"
+PATH_MODEL_SENTIMEN = "assets/models/model_sentimen_lstm.h5"
+PATH_TOKENIZER = "assets/models/tokenizer.pkl"
+PATH_ENKODER_TEKS = "assets/models/tokenizer_enkoder.json"
+PATH_LABEL_ENCODER = "assets/models/label_encoder.pkl"
+PATH_MODEL_LDA = "assets/models/model_lda_terbaik_12topik.model"
+PATH_DICTIONARY_LDA = "assets/models/model_lda_terbaik_12topik.dict"
+PATH_MODEL_SENTIMEN_NUMPY = "assets/models/model_sentimen_lstm_numpy"
+
+# Versi model LDA hasil pelatihan inkremental (lihat pelatihan_lda.py). Setiap
+# versi adalah direktori DIR_MODEL_LDA/vNNNN; versi aktif ditunjuk oleh
+# PATH_LDA_AKTIF. Tanpa file itu dipakai model awal di atas (versi 'awal').
+DIR_MODEL_LDA = "assets/models/lda"
+PATH_LDA_AKTIF = os.path.join(DIR_MODEL_LDA, "aktif.json")
+NAMA_FILE_MODEL_LDA = "model_lda.model"
+NAMA_FILE_DICTIONARY_LDA = "model_lda.dict"
+VERSI_LDA_AWAL = 'awal'
+
+# Backend inferensi sentimen: 'keras', 'numpy' (lihat lstm_numpy.py), atau 'otomatis'
+# (NumPy jika hasil konversi model .h5 yang sama tersedia, selain itu Keras)
+BACKEND_SENTIMEN = os.environ.get('BACKEND_SENTIMEN', 'otomatis').lower()
+
+# Bobot model NumPy dan matriks topik-kata LDA (*.npy) dibuka dengan mmap read-only,
+# sehingga beberapa proses pekerja berbagi satu salinan di page cache OS.
+# Model Keras (.h5) selalu dimuat penuh ke memori setiap proses.
+MMAP_MODEL = os.environ.get('MMAP_MODEL', '1').lower() not in ('0', 'false', 'tidak')
+
+UKURAN_BATCH_DEFAULT = 256
+UKURAN_BATCH_LDA_DEFAULT = 2048
+PROBABILITAS_MINIMUM_TOPIK = 0.1
+# Hasil untuk teks tanpa topik dominan, sama untuk prediksi satu teks dan batch
+TOPIK_TIDAK_RELEVAN = "Topik Tidak Relevan"
+DETAIL_TEKS_KOSONG = "Teks kosong setelah pra-pemrosesan."
+DETAIL_TANPA_TOPIK = "Tidak ada topik yang cocok ditemukan."
+
+AsetPraPemrosesan = namedtuple('AsetPraPemrosesan', [
+    'stemmer', 'stopword_remover', 'kamus_norm', 'custom_stopwords', 'label_topik', 'pipeline'
+])
+
+# Custom Stopwords untuk LDA
+CUSTOM_STOPWORDS = [
+    'aman', 'aneh', 'bagus', 'baik', 'bingung', 'buruk', 'cepat', 'cocok', 'enak', 'efisien',
+    'gagal', 'gercep', 'hebat', 'hemat', 'jelek', 'jelas', 'kecewa', 'keren', 'lancar',
+    'lambat', 'lemot', 'lumayan', 'mahal', 'malas', 'mantap', 'mantul', 'membantu',
+    'mending', 'mudah', 'nyaman', 'ok', 'paham', 'parah', 'praktis', 'puas', 'pusing',
+    'repot', 'ribet', 'rumit', 'salah', 'sesuai', 'sip', 'sukses', 'sulit', 'super',
+    'susah', 'takut', 'terbantu', 'top', 'admin', 'anda', 'bro', 'gan', 'kak', 'kakak',
+    'kamu', 'min', 'saya', 'sis', 'aja', 'banget', 'bolak', 'coba', 'deh', 'dgn', 'dll',
+    'dong', 'ga', 'gak', 'gk', 'enggak', 'kalo', 'kalau', 'kah', 'kayak', 'kok', 'krn',
+    'line', 'nggak', 'nih', 'on', 'sih', 'yg', 'alhamdulillah', 'app', 'aplikasi', 'apk',
+    'jadi', 'kesah', 'mohon', 'moga', 'semoga', 'terima_kasih', 'thanks', 'tolong', 'ulang',
+    'amanah', 'simpel', 'banyak', 'hasil', 'metode', 'terima', 'kasih'
+]
+
+# Kamus Label Topik Deskriptif
+LABEL_TOPIK = {
+    0: "Keluhan Lamanya Proses Aplikasi", 1: "Urusan di Kantor Samsat",
+    2: "Layanan dari Rumah (Anti Antri)", 3: "Pembayaran Pajak Kendaraan",
+    4: "Pilihan Metode Layanan (Online/Pos)", 5: "Pengiriman Dokumen Fisik",
+    6: "Lama Proses & Layanan Antar Kota", 7: "Fitur Cetak Bukti & Notifikasi",
+    8: "Bantuan Pendaftaran Akun", 9: "Perpanjang STNK (Luar Daerah)",
+    10: "Urusan Kendaraan & Saran Pengguna", 11: "Bantuan CS & Live Chat"
+}
+
+# ==============================================================================
+# FUNGSI-FUNGSI UNTUK MEMUAT ASET
+# ==============================================================================
+# Fungsi di bawah ini tidak bergantung pada Streamlit dan akan melempar
+# exception jika gagal; halaman Streamlit membungkusnya dengan cache dan
+# pesan error masing-masing. TensorFlow, gensim, dan SciPy baru diimpor saat
+# dibutuhkan, sehingga mengimpor modul ini tetap murah.
+
+def muat_aset_pra_pemrosesan():
+    """Memuat semua komponen yang dibutuhkan untuk pra-pemrosesan teks."""
+    # Sastrawi, kamus normalisasi (versi terkompilasi), dan cache stem di disk
+    pipeline = buat_pipeline(PATH_KAMUS, CUSTOM_STOPWORDS)
+    return AsetPraPemrosesan(pipeline.stemmer, pipeline.stopword_remover, pipeline.kamus_norm,
+                             CUSTOM_STOPWORDS, LABEL_TOPIK, pipeline)
+
+def _backend_numpy_tersedia():
+    """True jika model NumPy ada dan dikonversi dari file .h5 yang sekarang (atau .h5 tidak ada)."""
+    from lstm_numpy import NAMA_SPESIFIKASI, baca_spesifikasi
+
+    if not os.path.exists(os.path.join(PATH_MODEL_SENTIMEN_NUMPY, NAMA_SPESIFIKASI)):
+        return False
+    if not os.path.exists(PATH_MODEL_SENTIMEN):
+        return True
+    return baca_spesifikasi(PATH_MODEL_SENTIMEN_NUMPY).get('sidik_sumber') == sidik_file(PATH_MODEL_SENTIMEN)
+
+@ukur('muat_model_sentimen')
+def muat_model_sentimen(backend=None, path_model=None):
+    """
+    Memuat model sentimen, tokenizer, dan label encoder. `backend` ('keras',
+    'numpy', atau 'otomatis') default-nya BACKEND_SENTIMEN; model NumPy
+    dipakai tanpa mengimpor TensorFlow.
+    """
+    backend = backend or BACKEND_SENTIMEN
+    if backend not in ('keras', 'numpy', 'otomatis'):
+        raise ValueError(f"Backend sentimen tidak dikenal: {backend}")
+    if backend == 'numpy' or (backend == 'otomatis' and path_model is None and _backend_numpy_tersedia()):
+        from lstm_numpy import muat_model_numpy
+        model = muat_model_numpy(PATH_MODEL_SENTIMEN_NUMPY, mmap=MMAP_MODEL)
+    else:
+        from tensorflow.keras.models import load_model
+        model = load_model(path_model or PATH_MODEL_SENTIMEN)
+    tokenizer = muat_enkoder_teks()
+    with open(PATH_LABEL_ENCODER, 'rb') as f: label_encoder = pickle.load(f)
+    return model, tokenizer, label_encoder
+
+def muat_enkoder_teks():
+    """
+    Enkoder teks model sentimen. Memakai hasil ekspor JSON (lihat enkoder_teks.py)
+    jika dibuat dari tokenizer.pkl yang sekarang, sehingga Keras tidak diimpor;
+    selain itu dibangun langsung dari Tokenizer Keras hasil unpickle.
+    """
+    if os.path.exists(PATH_ENKODER_TEKS):
+        enkoder = muat_enkoder(PATH_ENKODER_TEKS)
+        if not os.path.exists(PATH_TOKENIZER) or enkoder.sidik_sumber == sidik_file(PATH_TOKENIZER):
+            return enkoder
+    with open(PATH_TOKENIZER, 'rb') as f:
+        return EnkoderTeks.dari_tokenizer_keras(pickle.load(f), sidik_file(PATH_TOKENIZER))
+
+def versi_lda_aktif():
+    """Nama versi model LDA yang sedang aktif ('awal' jika belum pernah ada versi yang diterbitkan)."""
+    try:
+        with open(PATH_LDA_AKTIF, encoding='utf-8') as f:
+            return json.load(f)['versi']
+    except FileNotFoundError:
+        return VERSI_LDA_AWAL
+
+def path_model_lda(versi=None):
+    """(path model, path dictionary) untuk `versi` model LDA (default: versi aktif)."""
+    versi = versi or versi_lda_aktif()
+    if versi == VERSI_LDA_AWAL:
+        return PATH_MODEL_LDA, PATH_DICTIONARY_LDA
+    direktori = os.path.join(DIR_MODEL_LDA, versi)
+    return os.path.join(direktori, NAMA_FILE_MODEL_LDA), os.path.join(direktori, NAMA_FILE_DICTIONARY_LDA)
+
+@ukur('muat_model_lda')
+def muat_model_lda(versi=None):
+    """Memuat model LDA dan dictionary 12 topik untuk `versi` (default: versi aktif)."""
+    import gensim
+
+    path_model, path_dictionary = path_model_lda(versi)
+    # Hanya array yang disimpan terpisah (model.expElogbeta.npy) yang di-mmap
+    model = gensim.models.LdaModel.load(path_model, mmap='r' if MMAP_MODEL else None)
+    dictionary = gensim.corpora.Dictionary.load(path_dictionary)
+    return model, dictionary
+
+def cache_prediksi(versi_lda=None):
+    """
+    Cache hasil prediksi bersama milik proses (LRU di memori + SQLite di disk).
+    Versi model dihitung dari isi file aset, sehingga cache otomatis tidak
+    terpakai lagi jika model, tokenizer, dictionary, atau label topik berubah.
+    `versi_lda` adalah versi model LDA yang hasilnya disimpan (default: versi
+    aktif); proses yang memegang model lama selama pergantian versi memberikan
+    versinya sendiri agar hasilnya tidak tercatat sebagai hasil model baru.
+    """
+    return _cache_prediksi(versi_lda or versi_lda_aktif())
+
+@lru_cache(maxsize=2)
+def _cache_prediksi(versi_lda):
+    path_model, path_dictionary = path_model_lda(versi_lda)
+    versi_sentimen = sidik_file(PATH_MODEL_SENTIMEN, PATH_TOKENIZER, PATH_LABEL_ENCODER)
+    versi_topik = sidik_file(path_model, f"{path_model}.expElogbeta.npy", f"{path_model}.state", path_dictionary)
+    # Label dan ambang topik ikut menentukan hasil yang disimpan
+    label = json.dumps([LABEL_TOPIK, PROBABILITAS_MINIMUM_TOPIK, TOPIK_TIDAK_RELEVAN,
+                        DETAIL_TEKS_KOSONG, DETAIL_TANPA_TOPIK], sort_keys=True)
+    versi_topik += '-' + hashlib.sha1(label.encode()).hexdigest()[:8]
+    cache = CachePrediksi({'sentimen': versi_sentimen, 'topik': versi_topik, 'topik_gensim': versi_topik},
+                          path=PATH_CACHE_PREDIKSI)
+    daftarkan_cache('prediksi', cache.statistik)
+    return cache
+
+# ==============================================================================
+# FUNGSI-FUNGSI PEMROSESAN DAN PREDIKSI
+# ==============================================================================
+
+def _potong_batch(iterable, ukuran):
+    """Membagi iterable menjadi list-list berukuran maksimal `ukuran`."""
+    it = iter(iterable)
+    while True:
+        batch = list(islice(it, ukuran))
+        if not batch:
+            return
+        yield batch
+
+def prediksi_sentimen_teks_bersih(teks_bersih, model, tokenizer, label_encoder, ukuran_batch, cache=None):
+    """
+    Menilai satu batch teks yang sudah dipra-proses (maksimal `ukuran_batch` teks)
+    dengan satu kali pemanggilan model. Jika `cache` (CachePrediksi) diberikan,
+    hanya teks unik yang belum ada di cache yang dinilai model.
+    """
+    return hasil_dengan_cache(cache, 'sentimen', teks_bersih, str,
+                              lambda teks: _hitung_sentimen(teks, model, tokenizer, label_encoder, ukuran_batch))
+
+@ukur('model_sentimen')
+def _hitung_sentimen(teks_bersih, model, tokenizer, label_encoder, ukuran_batch):
+    maxlen = model.input_shape[1]
+    terisi = [i for i, teks in enumerate(teks_bersih) if teks]
+
+    # Kembalikan skor netral jika teks kosong
+    hasil = [("Netral", 0.5)] * len(teks_bersih)
+    if terisi:
+        # Batch selalu berukuran `ukuran_batch` agar bentuk input model tetap sama
+        padded = np.zeros((ukuran_batch, maxlen), dtype=np.int32)
+        tokenizer.enkode_batch([teks_bersih[i] for i in terisi], maxlen, out=padded)
+
+        prediksi_prob = np.asarray(model.predict_on_batch(padded))[:len(terisi)]
+        skor_keyakinan = prediksi_prob.max(axis=1)
+        label_prediksi = label_encoder.inverse_transform(prediksi_prob.argmax(axis=1))
+        for i, label, skor in zip(terisi, label_prediksi, skor_keyakinan):
+            hasil[i] = (label, float(skor))
+    return hasil
+
+@ukur('prediksi_sentimen_batch')
+def prediksi_sentimen_batch(daftar_teks, model, tokenizer, label_encoder, aset_prep,
+                            ukuran_batch=UKURAN_BATCH_DEFAULT, cache=None):
+    """
+    Memprediksi sentimen untuk banyak teks sekaligus.
+    Teks dipra-proses, di-padding ke batch berukuran tetap, lalu setiap batch
+    dinilai dengan satu kali pemanggilan model. Mengembalikan list berisi
+    pasangan (label, skor_keyakinan) dengan urutan yang sama seperti input.
+    """
+    hasil = []
+    for batch in _potong_batch(daftar_teks, ukuran_batch):
+        teks_bersih = [prep.teks_lstm for prep in aset_prep.pipeline.proses_batch(batch)]
+        hasil.extend(prediksi_sentimen_teks_bersih(teks_bersih, model, tokenizer, label_encoder, ukuran_batch, cache))
+    return hasil
+
+@ukur('prediksi_sentimen')
+def prediksi_sentimen(teks, model, tokenizer, label_encoder, aset_prep, hasil_prep=None, cache=None):
+    """
+    Memprediksi sentimen dan mengembalikan label beserta skor keyakinannya.
+    `hasil_prep` (dari pipeline.proses) dapat diberikan agar teks tidak dipra-proses ulang.
+    """
+    if hasil_prep is None:
+        hasil_prep = aset_prep.pipeline.proses(teks)
+    return prediksi_sentimen_teks_bersih([hasil_prep.teks_lstm], model, tokenizer, label_encoder, 1, cache)[0]
+
+# Kata kunci per objek model LDA; entri ikut hilang saat model lama dilepas setelah hot-swap
+_KATA_KUNCI_TOPIK = weakref.WeakKeyDictionary()
+
+def kata_kunci_semua_topik(model, topn=5):
+    """String kata kunci (top-`topn`) untuk setiap topik; dihitung sekali per model."""
+    per_model = _KATA_KUNCI_TOPIK.setdefault(model, {})
+    if topn not in per_model:
+        per_model[topn] = [', '.join(word for word, _ in model.show_topic(k, topn=topn))
+                           for k in range(model.num_topics)]
+    return per_model[topn]
+
+@ukur('prediksi_topik_lda')
+def prediksi_topik_lda(teks, model, dictionary, aset_prep, hasil_prep=None, cache=None):
+    if hasil_prep is None:
+        hasil_prep = aset_prep.pipeline.proses(teks)
+    return hasil_dengan_cache(cache, 'topik_gensim', [hasil_prep.token_lda], _kunci_token,
+                              lambda daftar: [_hitung_topik_lda(daftar[0], model, dictionary, aset_prep)])[0]
+
+def _hitung_topik_lda(tokens, model, dictionary, aset_prep):
+    if not tokens: return TOPIK_TIDAK_RELEVAN, DETAIL_TEKS_KOSONG, 0.0
+    bow_vector = dictionary.doc2bow(tokens)
+    topic_distribution = model.get_document_topics(bow_vector, minimum_probability=PROBABILITAS_MINIMUM_TOPIK)
+    if not topic_distribution: return TOPIK_TIDAK_RELEVAN, DETAIL_TANPA_TOPIK, 0.0
+    top_topic_index, confidence = sorted(topic_distribution, key=lambda x: x[1], reverse=True)[0]
+    deskripsi_topik = aset_prep.label_topik.get(top_topic_index, f"Topik {top_topic_index}")
+    keywords_string = kata_kunci_semua_topik(model)[top_topic_index]
+    return deskripsi_topik, keywords_string, float(confidence)
+
+def matriks_dokumen_kata(daftar_token, dictionary):
+    """Matriks dokumen x kata (CSR, berisi jumlah kemunculan) dari daftar token per dokumen."""
+    from scipy.sparse import csr_matrix
+
+    token2id = dictionary.token2id
+    baris, kolom = [], []
+    for i, tokens in enumerate(daftar_token):
+        for token in tokens:
+            j = token2id.get(token)
+            if j is not None:
+                baris.append(i)
+                kolom.append(j)
+    return csr_matrix((np.ones(len(baris)), (baris, kolom)), shape=(len(daftar_token), len(dictionary)))
+
+def inferensi_topik_batch(matriks, model):
+    """
+    Distribusi topik (dokumen x topik) untuk satu batch dokumen sekaligus.
+
+    Ini adalah langkah-E variational LdaModel.inference milik gensim yang
+    divektorisasi atas seluruh batch memakai expElogbeta dan alpha tersimpan.
+    Setiap dokumen berhenti diperbarui begitu konvergen (gamma_threshold),
+    maksimal `model.iterations` iterasi. Berbeda dengan gensim, gamma awal
+    tidak diacak sehingga hasilnya deterministik.
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.special import psi
+
+    exp_elog_beta = np.asarray(model.expElogbeta, dtype=np.float64)
+    alpha = np.asarray(model.alpha, dtype=np.float64)
+    epsilon = np.finfo(np.float64).eps
+
+    coo = matriks.tocoo()
+    baris, kolom, jumlah = coo.row, coo.col, coo.data
+    beta_nonzero = exp_elog_beta[:, kolom].T
+
+    gamma = np.ones((matriks.shape[0], model.num_topics))
+    aktif = np.ones(matriks.shape[0], dtype=bool)
+    for _ in range(model.iterations):
+        exp_elog_theta = np.exp(psi(gamma) - psi(gamma.sum(axis=1))[:, np.newaxis])
+        phinorm = np.einsum('nk,nk->n', exp_elog_theta[baris], beta_nonzero) + epsilon
+        rasio = csr_matrix((jumlah / phinorm, (baris, kolom)), shape=matriks.shape)
+        gamma_baru = alpha + exp_elog_theta * (rasio @ exp_elog_beta.T)
+
+        perubahan = np.abs(gamma_baru - gamma).mean(axis=1)
+        gamma[aktif] = gamma_baru[aktif]
+        aktif &= perubahan >= model.gamma_threshold
+        if not aktif.any():
+            break
+
+    return gamma / gamma.sum(axis=1, keepdims=True)
+
+def _kunci_token(tokens):
+    # Model topik bersifat bag-of-words: urutan token tidak memengaruhi hasil
+    return ' '.join(sorted(tokens))
+
+def prediksi_topik_token(daftar_token, model, dictionary, label_topik, cache=None):
+    """
+    Topik dominan untuk daftar token yang sudah dipra-proses (satu batch).
+    Mengembalikan list (deskripsi_topik, detail_topik, keyakinan), sama seperti
+    prediksi_topik_lda untuk setiap teks: token kosong atau tanpa topik dominan
+    diberi TOPIK_TIDAK_RELEVAN dengan DETAIL_TEKS_KOSONG / DETAIL_TANPA_TOPIK.
+    Jika `cache` diberikan, hanya dokumen yang belum ada di cache yang diinferensi.
+    """
+    return hasil_dengan_cache(cache, 'topik', daftar_token, _kunci_token,
+                              lambda daftar: _hitung_topik_token(daftar, model, dictionary, label_topik))
+
+@ukur('model_topik')
+def _hitung_topik_token(daftar_token, model, dictionary, label_topik):
+    kata_kunci = kata_kunci_semua_topik(model)
+    theta = inferensi_topik_batch(matriks_dokumen_kata(daftar_token, dictionary), model)
+    topik = theta.argmax(axis=1)
+    keyakinan = theta[np.arange(len(topik)), topik]
+    hasil = []
+    for tokens, k, p in zip(daftar_token, topik, keyakinan):
+        if not tokens:
+            hasil.append((TOPIK_TIDAK_RELEVAN, DETAIL_TEKS_KOSONG, 0.0))
+        elif p < PROBABILITAS_MINIMUM_TOPIK:
+            hasil.append((TOPIK_TIDAK_RELEVAN, DETAIL_TANPA_TOPIK, 0.0))
+        else:
+            hasil.append((label_topik.get(k, f"Topik {k}"), kata_kunci[k], float(p)))
+    return hasil
+
+@ukur('prediksi_topik_batch')
+def prediksi_topik_batch(daftar_teks, model, dictionary, aset_prep, ukuran_batch=UKURAN_BATCH_LDA_DEFAULT, cache=None):
+    """Memprediksi topik dominan untuk banyak teks sekaligus (lihat prediksi_topik_token)."""
+    hasil = []
+    for batch in _potong_batch(daftar_teks, ukuran_batch):
+        daftar_token = [prep.token_lda for prep in aset_prep.pipeline.proses_batch(batch)]
+        hasil.extend(prediksi_topik_token(daftar_token, model, dictionary, aset_prep.label_topik, cache))
+    return hasil
+
+# ==============================================================================
+# PENILAIAN BATCH UNTUK FILE CSV
+# ==============================================================================
+
+def nilai_sentimen_dataframe(df, model, tokenizer, label_encoder, aset_prep,
+                             kolom_teks='pecahan_kalimat', ukuran_batch=UKURAN_BATCH_DEFAULT, cache=None):
+    """
+    Menambahkan/menimpa kolom 'sentimen' dan 'skor_sentimen' pada dataframe,
+    mengikuti skema yang dibaca oleh utils.load_data.
+    """
+    teks = df[kolom_teks].fillna('').astype(str)
+    hasil = prediksi_sentimen_batch(teks, model, tokenizer, label_encoder, aset_prep, ukuran_batch, cache)
+    df = df.copy()
+    df['sentimen'] = [label for label, _ in hasil]
+    df['skor_sentimen'] = np.round([skor for _, skor in hasil], 3)
+    return df
+
+def nilai_topik_dataframe(df, model, dictionary, aset_prep,
+                          kolom_teks='pecahan_kalimat', ukuran_batch=UKURAN_BATCH_LDA_DEFAULT, cache=None):
+    """
+    Menambahkan/menimpa kolom 'deskripsi_topik' dan 'detail_topik' pada dataframe,
+    mengikuti skema yang dibaca oleh utils.load_data.
+    """
+    teks = df[kolom_teks].fillna('').astype(str)
+    hasil = prediksi_topik_batch(teks, model, dictionary, aset_prep, ukuran_batch, cache)
+    df = df.copy()
+    df['deskripsi_topik'] = [deskripsi for deskripsi, _, _ in hasil]
+    df['detail_topik'] = [detail for _, detail, _ in hasil]
+    return df
+
+def nilai_csv(path_input, path_output, kolom_teks=None, sentimen=True, topik=False,
+              ukuran_batch=UKURAN_BATCH_DEFAULT, ukuran_chunk=10000, cache=None):
+    """
+    Menilai ulang sentimen dan/atau topik seluruh baris pada file CSV secara
+    bertahap (per chunk) dan menulis hasilnya ke `path_output`.
+    Mengembalikan (jumlah_baris, detik).
+    """
+    aset_prep = muat_aset_pra_pemrosesan()
+    if sentimen:
+        model, tokenizer, label_encoder = muat_model_sentimen()
+    if topik:
+        model_lda, dictionary_lda = muat_model_lda()
+
+    jumlah_baris = 0
+    mulai = time.perf_counter()
+    for i, chunk in enumerate(pd.read_csv(path_input, chunksize=ukuran_chunk)):
+        if kolom_teks is None:
+            kolom_teks = 'pecahan_kalimat' if 'pecahan_kalimat' in chunk.columns else 'ulasan_lengkap'
+        if topik:
+            chunk = nilai_topik_dataframe(chunk, model_lda, dictionary_lda, aset_prep, kolom_teks=kolom_teks,
+                                          cache=cache)
+        if sentimen:
+            chunk = nilai_sentimen_dataframe(chunk, model, tokenizer, label_encoder, aset_prep,
+                                             kolom_teks=kolom_teks, ukuran_batch=ukuran_batch, cache=cache)
+        chunk.to_csv(path_output, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        jumlah_baris += len(chunk)
+        durasi = time.perf_counter() - mulai
+        print(f"{jumlah_baris:,} baris dinilai ({jumlah_baris / durasi:,.1f} baris/detik)", file=sys.stderr)
+
+    return jumlah_baris, time.perf_counter() - mulai
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Menilai sentimen dan/atau topik ulasan pada file CSV secara batch.")
+    parser.add_argument("input", help="File CSV berisi ulasan.")
+    parser.add_argument("-o", "--output", help="File CSV hasil (default: <input>_dinilai.csv).")
+    parser.add_argument("--kolom-teks", default=None,
+                        help="Kolom teks yang dinilai (default: 'pecahan_kalimat' jika ada, selain itu 'ulasan_lengkap').")
+    parser.add_argument("--mode", choices=['sentimen', 'topik', 'semua'], default='sentimen',
+                        help="Kolom yang dinilai ulang: sentimen, topik, atau keduanya.")
+    parser.add_argument("--ukuran-batch", type=int, default=UKURAN_BATCH_DEFAULT,
+                        help="Jumlah teks per pemanggilan model sentimen.")
+    parser.add_argument("--tanpa-cache", action="store_true",
+                        help="Nilai semua teks dengan model tanpa memakai cache hasil prediksi.")
+    args = parser.parse_args(argv)
+
+    cache = None if args.tanpa_cache else cache_prediksi()
+
+    path_output = args.output or f"{os.path.splitext(args.input)[0]}_dinilai.csv"
+    jumlah_baris, durasi = nilai_csv(args.input, path_output, args.kolom_teks,
+                                     sentimen=args.mode in ('sentimen', 'semua'),
+                                     topik=args.mode in ('topik', 'semua'),
+                                     ukuran_batch=args.ukuran_batch, cache=cache)
+    print(f"Selesai: {jumlah_baris:,} baris dalam {durasi:.1f} detik "
+          f"({jumlah_baris / max(durasi, 1e-9):,.1f} baris/detik) -> {path_output}")
+    if cache is not None:
+        statistik = cache.statistik()
+        print(f"Cache prediksi: {statistik['hits']:,} hit, {statistik['misses']:,} miss "
+              f"(hit rate {statistik['hit_rate']:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+import os
+import sys
+
+import pytest
+
+DIR_REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DIR_REPO)
+
+@pytest.fixture(autouse=True)
+def _direktori_repo(monkeypatch):
+    # Path aset di modul aplikasi relatif terhadap root repo
+    monkeypatch.chdir(DIR_REPO)
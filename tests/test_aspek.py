@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+from aspek import TOPIK_TIDAK_RELEVAN, URUTAN_SENTIMEN, pecah_dataframe, pecah_kalimat, ringkasan_aspek, ringkasan_ulasan
+
+def _df_nilai(baris):
+    """df_nilai sintetis dari tuple (id_ulasan, sentimen, skor_sentimen, deskripsi_topik)."""
+    df = pd.DataFrame(baris, columns=['id_ulasan', 'sentimen', 'skor_sentimen', 'deskripsi_topik'])
+    df['ulasan_lengkap'] = 'ulasan ' + df['id_ulasan'].astype(str)
+    return df
+
+def test_pecah_kalimat():
+    assert pecah_kalimat("Aplikasi bagus.. Tapi, sering error!") == ["Aplikasi bagus.", "Tapi sering error"]
+    assert pecah_kalimat("Alhamdulillah sangat mempermudah Skali.") == ["Alhamdulillah sangat mempermudah Skali."]
+    # Contoh dari hasil_terstruktur_diperbaiki.csv: titik di dalam kata/angka bukan akhir kalimat
+    assert pecah_kalimat("sangat membantu.mantap") == ["sangat membantu.mantap"]
+    assert pecah_kalimat("biaya sampai 20.000 belum termasuk ongkir. gini amat") == \
+        ["biaya sampai 20.000 belum termasuk ongkir.", "gini amat"]
+    assert pecah_kalimat("pas pembayaran tidak bisa . bri, mandiri udah saya coba") == \
+        ["pas pembayaran tidak bisa .", "bri mandiri udah saya coba"]
+    assert pecah_kalimat("ngantri...terimakasih signal..best") == ["ngantri.", "terimakasih signal.", "best"]
+
+def test_pecah_dataframe():
+    df = pd.DataFrame({'id_ulasan': [7, 8, 9], 'ulasan_lengkap': ["a. b. c", None, "d"]})
+
+    hasil = pecah_dataframe(df)
+
+    assert hasil['id_ulasan'].tolist() == [7, 7, 7, 9]
+    assert hasil['pecahan_kalimat'].tolist() == ["a.", "b.", "c", "d"]
+    assert hasil['urutan_pecahan'].tolist() == [0, 1, 2, 0]
+
+def test_semua_topik_tidak_relevan():
+    df = _df_nilai([(1, 'Positif', 0.9, TOPIK_TIDAK_RELEVAN),
+                    (1, 'Netral', 0.8, TOPIK_TIDAK_RELEVAN),
+                    (2, 'Negatif', 0.7, TOPIK_TIDAK_RELEVAN)])
+
+    assert ringkasan_aspek(df).empty
+    hasil = ringkasan_ulasan(df)
+
+    assert hasil['id_ulasan'].tolist() == [1, 2]
+    assert hasil['topik_utama'].tolist() == [TOPIK_TIDAK_RELEVAN] * 2
+    assert hasil['jumlah_topik'].tolist() == [0, 0]
+    assert hasil['aspek'].tolist() == ['', '']
+    assert hasil['sentimen_dominan'].tolist() == ['Positif', 'Negatif']
+
+def test_ringkasan_ulasan():
+    df = _df_nilai([(1, 'Positif', 0.9, 'Login'),
+                    (1, 'Negatif', 0.6, 'Pembayaran'),
+                    (1, 'Negatif', 0.8, 'Pembayaran'),
+                    (1, 'Netral', 0.5, TOPIK_TIDAK_RELEVAN),
+                    (2, 'Positif', 0.7, TOPIK_TIDAK_RELEVAN)])
+
+    hasil = ringkasan_ulasan(df).set_index('id_ulasan')
+
+    assert hasil.loc[1, 'sentimen_dominan'] == 'Negatif'
+    assert hasil.loc[1, 'proporsi_negatif'] == 0.5
+    assert hasil.loc[1, 'polaritas'] == -0.25
+    assert hasil.loc[1, 'topik_utama'] == 'Pembayaran'
+    assert hasil.loc[1, 'aspek'] == 'Pembayaran (Negatif); Login (Positif)'
+    assert hasil.loc[2, 'aspek'] == ''
+
+def test_seri_diputus_dengan_skor():
+    df = _df_nilai([(1, 'Positif', 0.6, 'Login'), (1, 'Negatif', 0.9, 'Login'),
+                    (2, 'Positif', 0.9, 'Login'), (2, 'Negatif', 0.6, 'Login')])
+
+    assert ringkasan_aspek(df)['sentimen'].tolist() == ['Negatif', 'Positif']
+    assert ringkasan_ulasan(df)['sentimen_dominan'].tolist() == ['Negatif', 'Positif']
+
+def test_sama_dengan_groupby_pada_dataset():
+    df = pd.read_csv('hasil_terstruktur_diperbaiki.csv')
+
+    hasil = ringkasan_ulasan(df).set_index('id_ulasan')
+
+    per_sentimen = df.groupby(['id_ulasan', 'sentimen'])['skor_sentimen']
+    jumlah = per_sentimen.size().unstack(fill_value=0)[URUTAN_SENTIMEN]
+    skor = per_sentimen.sum().unstack(fill_value=0.0)[URUTAN_SENTIMEN]
+    # Sentimen terbanyak; seri diputus dengan total skor terbesar, lalu URUTAN_SENTIMEN
+    harapan = (jumlah * 1e6 + skor).idxmax(axis=1)
+    assert (hasil['sentimen_dominan'] == harapan.reindex(hasil.index)).all()
+    np.testing.assert_array_equal(hasil['jumlah_pecahan'], df.groupby('id_ulasan').size().reindex(hasil.index))
+    relevan = df[df['deskripsi_topik'] != TOPIK_TIDAK_RELEVAN]
+    jumlah_topik = relevan.groupby('id_ulasan')['deskripsi_topik'].nunique().reindex(hasil.index, fill_value=0)
+    np.testing.assert_array_equal(hasil['jumlah_topik'], jumlah_topik)
+    assert ((hasil['aspek'] == '') == (jumlah_topik == 0)).all()
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from berkas import path_atomik, tulis_atomik
+
+def test_tulis_atomik_mengganti_file(tmp_path):
+    path = str(tmp_path / "sub" / "data.json")
+    with tulis_atomik(path) as f:
+        f.write("lama")
+    with tulis_atomik(path) as f:
+        f.write("baru")
+
+    assert open(path, encoding='utf-8').read() == "baru"
+    assert os.listdir(tmp_path / "sub") == ["data.json"]
+
+def test_galat_tidak_mengubah_tujuan(tmp_path):
+    path = str(tmp_path / "data.bin")
+    with tulis_atomik(path, 'wb') as f:
+        f.write(b"lama")
+
+    with pytest.raises(RuntimeError):
+        with tulis_atomik(path, 'wb') as f:
+            f.write(b"setengah")
+            raise RuntimeError("gagal")
+
+    assert open(path, 'rb').read() == b"lama"
+    assert os.listdir(tmp_path) == ["data.bin"]
+
+def test_direktori_diganti_utuh(tmp_path):
+    direktori = str(tmp_path / "model")
+    for isi in ("a", "b"):
+        with path_atomik(direktori) as sementara:
+            os.makedirs(sementara)
+            with open(os.path.join(sementara, isi), 'w') as f:
+                f.write(isi)
+
+    assert os.listdir(direktori) == ["b"]
+    assert os.listdir(tmp_path) == ["model"]
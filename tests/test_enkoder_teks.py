@@ -0,0 +1,82 @@
+import copy
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("keras")
+from keras.src.legacy.preprocessing.text import Tokenizer
+
+import prediksi
+from enkoder_teks import EnkoderTeks, _teks_uji, cek_identitas, muat_enkoder, simpan_enkoder
+
+KORPUS = [
+    "aplikasi sangat membantu bayar pajak",
+    "Aplikasi sering error saat login, tolong diperbaiki!!",
+    "bayar pajak kendaraan jadi mudah dan cepat",
+    "login gagal terus; OTP tidak masuk",
+    "mantap, pelayanan cepat",
+]
+TEKS_UJI = KORPUS + [
+    "", "   ", "!!!", "kata_tak_dikenal_xyz zzz", "APLIKASI Error\tLOGIN\nbaris baru", "a,b.c;d",
+    "pajak " * 20, "mantap qwerty mantap asdf pajak",
+]
+
+def _tokenizer(**kwargs):
+    tokenizer = Tokenizer(**kwargs)
+    tokenizer.fit_on_texts(KORPUS)
+    return tokenizer
+
+@pytest.mark.parametrize("oov_token", ["<OOV>", None])
+@pytest.mark.parametrize("num_words", [None, 6])
+@pytest.mark.parametrize("maxlen", [3, 50])
+def test_identik_dengan_keras(oov_token, num_words, maxlen):
+    tokenizer = _tokenizer(num_words=num_words, oov_token=oov_token)
+    enkoder = EnkoderTeks.dari_tokenizer_keras(tokenizer)
+
+    assert enkoder.texts_to_sequences(TEKS_UJI) == tokenizer.texts_to_sequences(TEKS_UJI)
+    assert cek_identitas(tokenizer, enkoder, TEKS_UJI, maxlen) == (0, None)
+
+def test_oov_dan_num_words():
+    tokenizer = _tokenizer(num_words=6, oov_token="<OOV>")
+    enkoder = EnkoderTeks.dari_tokenizer_keras(tokenizer)
+    oov = tokenizer.word_index["<OOV>"]
+
+    kode = enkoder.texts_to_sequences(["pajak zzz " + " ".join(tokenizer.word_index)])[0]
+
+    assert kode[:2] == [tokenizer.word_index["pajak"], oov]
+    assert max(kode) < 6 and kode.count(oov) > 1
+
+def test_tokenizer_aplikasi():
+    with open(prediksi.PATH_TOKENIZER, 'rb') as f:
+        tokenizer = pickle.load(f)
+    tokenizer_kecil = copy.copy(tokenizer)
+    tokenizer_kecil.num_words = 100
+    teks = _teks_uji(tokenizer)
+
+    for tok in (tokenizer, tokenizer_kecil):
+        enkoder = EnkoderTeks.dari_tokenizer_keras(tok)
+        for maxlen in (100, 5):
+            assert cek_identitas(tok, enkoder, teks, maxlen) == (0, None)
+
+def test_out_ditimpa_sebagian():
+    enkoder = EnkoderTeks.dari_tokenizer_keras(_tokenizer(oov_token="<OOV>"))
+    out = np.full((4, 5), 7, dtype=np.int32)
+
+    hasil = enkoder.enkode_batch(KORPUS[:2], 5, out=out)
+
+    assert hasil is out
+    np.testing.assert_array_equal(out[:2], enkoder.enkode_batch(KORPUS[:2], 5))
+    assert (out[2:] == 7).all()
+    with pytest.raises(ValueError):
+        enkoder.enkode_batch(KORPUS, 5, out=out)
+
+def test_simpan_dan_muat(tmp_path):
+    enkoder = EnkoderTeks.dari_tokenizer_keras(_tokenizer(num_words=6, oov_token="<OOV>"), sidik_sumber="abc")
+    path = str(tmp_path / "enkoder.json")
+    simpan_enkoder(enkoder, path)
+
+    dimuat = muat_enkoder(path)
+
+    assert dimuat.konfigurasi() == enkoder.konfigurasi()
+    np.testing.assert_array_equal(dimuat.enkode_batch(TEKS_UJI, 8), enkoder.enkode_batch(TEKS_UJI, 8))
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+keras = pytest.importorskip("keras")
+
+from lstm_numpy import (TOLERANSI_PARITAS, ModelLSTMNumpy, cek_paritas, konversi_model_keras,
+                        muat_model_numpy, simpan_model_numpy)
+
+MAXLEN = 12
+JUMLAH_KATA = 50
+
+def _model_keras(mask_zero, seed=0):
+    keras.utils.set_random_seed(seed)
+    model = keras.Sequential([
+        keras.Input(shape=(MAXLEN,)),
+        keras.layers.Embedding(JUMLAH_KATA, 8, mask_zero=mask_zero),
+        keras.layers.Bidirectional(keras.layers.LSTM(6, return_sequences=True)),
+        keras.layers.Dropout(0.2),
+        keras.layers.Bidirectional(keras.layers.LSTM(5)),
+        keras.layers.Dense(3, activation='softmax'),
+    ])
+    # Derau pada semua bobot (termasuk bias yang awalnya nol) agar keluaran antarinput cukup berbeda
+    rng = np.random.default_rng(seed)
+    model.set_weights([w + rng.normal(0, 0.3, w.shape).astype(w.dtype) for w in model.get_weights()])
+    return model
+
+def _input_acak(jumlah=64, seed=0):
+    """Sekuens ber-padding di akhir, termasuk panjang 0 dan panjang maksimum."""
+    rng = np.random.default_rng(seed)
+    panjang = rng.integers(0, MAXLEN + 1, jumlah)
+    panjang[:2] = [0, MAXLEN]
+    x = np.zeros((jumlah, MAXLEN), dtype=np.int32)
+    for i, n in enumerate(panjang):
+        x[i, :n] = rng.integers(1, JUMLAH_KATA, n)
+    return x
+
+@pytest.mark.parametrize("mask_zero", [True, False])
+def test_paritas_dengan_keras(mask_zero):
+    model = _model_keras(mask_zero)
+    model_numpy = ModelLSTMNumpy(*konversi_model_keras(model))
+
+    hasil = cek_paritas(model, model_numpy, _input_acak(), ukuran_batch=16)
+
+    assert hasil['selisih_maks'] < TOLERANSI_PARITAS
+    assert hasil['label_sama'] == 1.0
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_simpan_dan_muat(tmp_path, mmap):
+    model = _model_keras(mask_zero=True)
+    spesifikasi, bobot = konversi_model_keras(model)
+    direktori = str(tmp_path / "model_numpy")
+    simpan_model_numpy(spesifikasi, bobot, direktori)
+
+    model_numpy = muat_model_numpy(direktori, mmap=mmap)
+
+    x = _input_acak()
+    np.testing.assert_array_equal(model_numpy.predict_on_batch(x),
+                                  ModelLSTMNumpy(spesifikasi, bobot).predict_on_batch(x))
+    assert all(isinstance(w, np.memmap) == mmap for lapisan in model_numpy.bobot for w in lapisan)
+    assert cek_paritas(model, model_numpy, x)['selisih_maks'] < TOLERANSI_PARITAS
+
+def test_lapisan_tidak_didukung():
+    model = keras.Sequential([keras.Input(shape=(MAXLEN,)), keras.layers.Embedding(JUMLAH_KATA, 4),
+                              keras.layers.GRU(4), keras.layers.Dense(3)])
+    with pytest.raises(ValueError, match="GRU"):
+        konversi_model_keras(model)
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+keras = pytest.importorskip("keras")
+
+import prediksi
+from lstm_numpy import konversi_model_keras, simpan_model_numpy
+from memori_model import cek_berbagi, ukur_pekerja
+
+pytestmark = pytest.mark.skipif(not os.path.exists('/proc/self/smaps'), reason="membutuhkan /proc/self/smaps")
+
+@pytest.fixture(scope="module")
+def path_model_numpy(tmp_path_factory):
+    # Embedding mencakup semua indeks tokenizer aplikasi; keluaran 3 kelas seperti label encoder
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(20,)),
+        keras.layers.Embedding(prediksi.muat_enkoder_teks().num_words, 16, mask_zero=True),
+        keras.layers.Bidirectional(keras.layers.LSTM(8)),
+        keras.layers.Dense(3, activation='softmax'),
+    ])
+    direktori = str(tmp_path_factory.mktemp("model") / "model_numpy")
+    simpan_model_numpy(*konversi_model_keras(model), direktori)
+    return direktori
+
+def test_bobot_terbagi_dengan_mmap(path_model_numpy):
+    hasil = ukur_pekerja(2, mmap=True, path_model_numpy=path_model_numpy, backend='numpy')
+
+    assert [h['backend'] for h in hasil] == ['ModelLSTMNumpy'] * 2
+    # Semua bobot yang disentuh berasal dari halaman file yang di-mmap
+    assert all(h['rss_model'] >= h['ukuran_bobot'] for h in hasil)
+    assert cek_berbagi(hasil)
+
+def test_bobot_tidak_terbagi_tanpa_mmap(path_model_numpy):
+    hasil = ukur_pekerja(2, mmap=False, path_model_numpy=path_model_numpy, backend='numpy')
+
+    assert all(h['rss_model'] == 0 for h in hasil)
+    assert not cek_berbagi(hasil)
@@ -0,0 +1,31 @@
+import pandas as pd
+
+from penyimpanan import awal_baris, baca_baris_baru
+
+KOLOM = ['id', 'ulasan_lengkap', 'sentimen', 'deskripsi_topik', 'detail_topik']
+
+def _rekaman(id_, ulasan):
+    return pd.DataFrame([[id_, ulasan, 'Positif', 'Topik A', 'detail']], columns=KOLOM)
+
+def test_ulasan_multibaris_tidak_terpotong(tmp_path):
+    path = str(tmp_path / "ulasan.csv")
+    pd.DataFrame(columns=KOLOM).to_csv(path, index=False)
+    offset = awal_baris(path, len(open(path, 'rb').read()))
+
+    _rekaman(1, 'baris satu\nbaris "dua"').to_csv(path, mode='a', header=False, index=False)
+    teks_kedua = _rekaman(2, 'awal\nakhir').to_csv(header=False, index=False).encode()
+    with open(path, 'ab') as f:
+        f.write(teks_kedua[:teks_kedua.index(b'\n') + 1])  # berhenti di dalam field ber-kutip
+
+    # Rekaman kedua belum lengkap: hanya rekaman pertama yang dibaca, utuh
+    df, offset = baca_baris_baru(path, offset, KOLOM)
+    assert df['ulasan_lengkap'].tolist() == ['baris satu\nbaris "dua"']
+    assert awal_baris(path, len(open(path, 'rb').read())) == offset
+    assert baca_baris_baru(path, offset, KOLOM) == (None, offset)
+
+    with open(path, 'ab') as f:
+        f.write(teks_kedua[teks_kedua.index(b'\n') + 1:])
+    df, offset = baca_baris_baru(path, offset, KOLOM)
+    assert df['id'].tolist() == [2]
+    assert df['ulasan_lengkap'].tolist() == ['awal\nakhir']
+    assert offset == len(open(path, 'rb').read())
@@ -0,0 +1,31 @@
+import gc
+import weakref
+
+import prediksi
+
+def test_kata_kunci_tidak_menahan_model_lama():
+    lda, _ = prediksi.muat_model_lda()
+    kata_kunci = prediksi.kata_kunci_semua_topik(lda)
+
+    assert len(kata_kunci) == lda.num_topics
+    assert prediksi.kata_kunci_semua_topik(lda) is kata_kunci
+    assert len(prediksi.kata_kunci_semua_topik(lda, topn=2)[0].split(', ')) == 2
+
+    ref = weakref.ref(lda)
+    del lda, _
+    gc.collect()
+    assert ref() is None
+
+def test_topik_batch_sama_dengan_satu_teks():
+    aset_prep = prediksi.muat_aset_pra_pemrosesan()
+    lda, dictionary = prediksi.muat_model_lda()
+    # Kosong setelah pra-pemrosesan, tanpa kata yang dikenal model, dan satu teks bertopik jelas
+    daftar_teks = ['', '!!!', 'yang dan di', 'xyzzy qwerty', 'bayar pajak kendaraan online lewat aplikasi']
+
+    batch = prediksi.prediksi_topik_batch(daftar_teks, lda, dictionary, aset_prep)
+    satu_per_satu = [prediksi.prediksi_topik_lda(teks, lda, dictionary, aset_prep) for teks in daftar_teks]
+
+    assert [h[:2] for h in batch] == [h[:2] for h in satu_per_satu]
+    assert batch[0][:2] == (prediksi.TOPIK_TIDAK_RELEVAN, prediksi.DETAIL_TEKS_KOSONG)
+    assert batch[3][:2] == (prediksi.TOPIK_TIDAK_RELEVAN, prediksi.DETAIL_TANPA_TOPIK)
+    assert batch[4][0] != prediksi.TOPIK_TIDAK_RELEVAN
@@ -0,0 +1,52 @@
+import shutil
+
+import pandas as pd
+import pytest
+
+import utils
+from visualisasi import frekuensi_kata_per_topik
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    """Salinan dataset sebagai dataset bersama; mengembalikan fungsi untuk menambah baris."""
+    path = str(tmp_path / "ulasan.csv")
+    shutil.copy('hasil_terstruktur_diperbaiki.csv', path)
+    monkeypatch.setattr(utils, 'DATA_PATH', path)
+    monkeypatch.setattr(utils, 'REFRESH_INTERVAL_SECONDS', 0)
+    utils._live_dataset.clear()
+    monkeypatch.setattr(utils._run, 'version', None, raising=False)
+    utils.get_data()
+
+    def tambah(df_baru):
+        df_baru.to_csv(path, mode='a', header=False, index=False)
+        return utils._live_dataset(path).refresh()
+
+    yield tambah
+    utils._live_dataset.clear()
+
+def _baris_baru(topik, jumlah=5):
+    df = pd.read_csv('hasil_terstruktur_diperbaiki.csv')
+    df = df[df['deskripsi_topik'] == topik].tail(jumlah).copy()
+    df['id'] += 10**7
+    return df
+
+def test_versi_lama_tetap_terbaca(dataset):
+    versi_lama = utils.get_dataset_version()
+    topik = utils.get_aggregates().jumlah_topik().index[0]
+    total_lama = utils.get_aggregates().total
+    frekuensi_lama = dict(utils._live_dataset(utils.DATA_PATH).topic_frequency_table(versi_lama)[topik])
+
+    assert dataset(_baris_baru(topik))
+
+    # Rerun yang masih memakai versi lama melihat kubus dan frekuensi versi lama
+    assert utils.get_dataset_version() == versi_lama
+    assert utils.get_aggregates().total == total_lama
+    state = utils._live_dataset(utils.DATA_PATH)
+    assert state.topic_frequency_table(versi_lama)[topik] == frekuensi_lama
+
+    utils.get_data()
+    versi_baru = utils.get_dataset_version()
+    assert versi_baru != versi_lama
+    assert utils.get_aggregates().total == total_lama + 5
+    assert state.topic_frequency_table(versi_baru)[topik] == \
+        frekuensi_kata_per_topik(utils._frame(utils.DATA_PATH, versi_baru))[topik]
@@ -2,13 +2,35 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import json
 import os
+import sys
+import threading
+import time
+from penyimpanan import baca_data, versi_dataset, awal_baris, baca_baris_baru, gabung_baris
+from agregat import KubusAgregat, RingkasanSkor
+from indeks import IndeksTeks, IndeksFaset
+from visualisasi import frekuensi_kata_per_topik, render_wordcloud_png
+import instrumentasi
+from instrumentasi import ukur
+
+DATA_PATH = 'hasil_terstruktur_diperbaiki.csv'
+
+# Jarak minimal (detik) antara dua pemeriksaan baris baru pada file data
+REFRESH_INTERVAL_SECONDS = 5
+
+# Dataframe dibagi bersama oleh semua sesi. Dengan Copy-on-Write (selalu aktif
+# sejak pandas 3.0) salinan dangkal tidak menyalin data, dan perubahan pada
+# salinan tersebut tidak pernah menyentuh dataframe bersama.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
 
-@st.cache_data
 def load_data(filepath):
     """
-    Memuat dan memproses data dari file CSV.
-    Fungsi ini dijalankan sekali dan hasilnya di-cache.
+    Memuat dan memproses data dari file CSV (melalui cache Parquet bila tersedia).
+    Dipanggil sekali per proses oleh _live_dataset; hasilnya dipakai bersama
+    oleh semua sesi dan tidak boleh diubah secara langsung.
     """
     abs_path = os.path.abspath(filepath)
     if not os.path.exists(filepath):
@@ -18,28 +40,355 @@ def load_data(filepath):
         return None
 
     try:
-        df = pd.read_csv(filepath)
-        # Ganti nama 'skor_sentimen' menjadi 'confidence_score' untuk konsistensi internal
-        if 'skor_sentimen' in df.columns:
-            df.rename(columns={'skor_sentimen': 'confidence_score'}, inplace=True)
-
-        df['Topik_Gabungan'] = df['deskripsi_topik'].astype(str) + ", " + df['detail_topik'].astype(str)
-        if 'pecahan_kalimat' not in df.columns:
-            df['pecahan_kalimat'] = df['ulasan_lengkap']
-        return df
+        # Dibaca dari cache Parquet jika masih sesuai dengan CSV; kolom turunan
+        # dan tipe data (categorical/float32) disiapkan oleh penyimpanan.siapkan_dataframe
+        return baca_data(filepath)
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memuat atau memproses data: {e}")
         return None
 
+class _LiveDataset:
+    """
+    Dataset bersama milik proses yang dapat bertambah.
+
+    Baris yang ditambahkan ke akhir CSV (mis. oleh ingesti.py) dibaca secara
+    bertahap mulai dari posisi byte terakhir. Kubus agregat dan frekuensi kata
+    diperbarui hanya dengan baris baru; indeks lain dibangun ulang per versi
+    saat pertama kali dibutuhkan. Setiap penambahan menghasilkan versi baru;
+    dataframe, kubus, dan frekuensi kata versi lama tetap utuh untuk sesi yang
+    sedang memakainya.
+    """
+
+    KEPT_VERSIONS = 3
+
+    def __init__(self, filepath, df, offset):
+        self.filepath = filepath
+        self.lock = threading.Lock()
+        self.base_version = versi_dataset(filepath)
+        self.generation = 0
+        self.frames = {self.base_version: df}
+        self.version = self.base_version
+        self.columns = list(pd.read_csv(filepath, nrows=0).columns)
+        self.offset = awal_baris(filepath, offset)
+        self.last_id = int(df['id'].max()) if 'id' in df.columns and len(df) else None
+        self.cubes = {self.base_version: KubusAgregat.dari_dataframe(df)}
+        self.topic_frequencies = {}
+        self.replaced = False
+        self.checked_at = time.monotonic()
+
+    @property
+    def df(self):
+        return self.frames[self.version]
+
+    def topic_frequency_table(self, version=None):
+        """
+        Tabel frekuensi kata per topik untuk `version` (default versi terbaru),
+        dibangun saat pertama kali dibutuhkan.
+        """
+        with self.lock:
+            if version not in self.frames:
+                version = self.version
+            if version not in self.topic_frequencies:
+                self.topic_frequencies[version] = frekuensi_kata_per_topik(self.frames[version])
+            return self.topic_frequencies[version]
+
+    def refresh(self):
+        """
+        Membaca baris yang ditambahkan ke CSV sejak pemeriksaan terakhir (paling
+        sering sekali per REFRESH_INTERVAL_SECONDS). True jika ada data baru.
+        """
+        if time.monotonic() - self.checked_at < REFRESH_INTERVAL_SECONDS:
+            return False
+        with self.lock:
+            if time.monotonic() - self.checked_at < REFRESH_INTERVAL_SECONDS:
+                return False
+            self.checked_at = time.monotonic()
+            try:
+                size = os.path.getsize(self.filepath)
+                if size < self.offset:
+                    # File ditulis ulang (bukan ditambah): perlu dimuat ulang penuh
+                    self.replaced = True
+                    return False
+                if size == self.offset:
+                    return False
+                new_rows, self.offset = baca_baris_baru(self.filepath, self.offset, self.columns)
+            except (OSError, ValueError):
+                return False  # File sedang ditulis atau tidak dapat dibaca; coba lagi nanti
+            if new_rows is not None and self.last_id is not None and 'id' in new_rows.columns:
+                new_rows = new_rows[new_rows['id'] > self.last_id]
+            if new_rows is None or new_rows.empty:
+                return False
+
+            df = gabung_baris(self.df, new_rows)
+            cube = self.cubes[self.version].salin().tambah(new_rows)
+            frequencies = self.topic_frequencies.get(self.version)
+            if 'id' in df.columns:
+                self.last_id = int(df['id'].max())
+
+            self.generation += 1
+            version = f"{self.base_version}.{self.generation}"
+            self.frames[version] = df
+            self.cubes[version] = cube
+            if frequencies is not None:
+                self.topic_frequencies[version] = frekuensi_kata_per_topik(new_rows, awal=frequencies)
+            self.version = version
+            while len(self.frames) > self.KEPT_VERSIONS:
+                oldest = next(iter(self.frames))
+                self.cubes.pop(oldest)
+                self.topic_frequencies.pop(oldest, None)
+                self.frames.pop(oldest)
+            return True
+
+@st.cache_resource
+def _live_dataset(filepath):
+    # Ukuran file dicatat sebelum dibaca; baris yang ditambahkan selama
+    # pembacaan akan dibaca lagi lalu disaring berdasarkan kolom 'id'.
+    offset = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+    df = load_data(filepath)
+    return None if df is None else _LiveDataset(filepath, df, offset)
+
+# Versi dataset yang dipakai oleh rerun halaman pada thread ini, agar data,
+# indeks, dan urutan dalam satu rerun selalu berasal dari versi yang sama.
+_run = threading.local()
+
+def _current_version(state):
+    version = getattr(_run, 'version', None)
+    return version if version in state.frames else state.version
+
+def _frame(filepath, version):
+    state = _live_dataset(filepath)
+    return None if state is None else state.frames.get(version, state.df)
+
+@ukur('get_data')
 def get_data():
     """
     Fungsi andal untuk mendapatkan data.
-    Memuat data menggunakan load_data() dan menyimpannya di st.session_state.
-    Ini memastikan data hanya dimuat sekali per sesi.
+    Mengembalikan salinan dangkal (tanpa menyalin data) dari dataframe bersama
+    milik proses, sehingga setiap sesi tidak menyimpan salinannya sendiri.
+    Baris baru yang ditambahkan ke file data ikut dibaca (secara bertahap).
+    """
+    state = _live_dataset(DATA_PATH)
+    if state is not None:
+        state.refresh()
+        if state.replaced:
+            _live_dataset.clear()
+            state = _live_dataset(DATA_PATH)
+    if state is None:
+        return None
+    version = state.version
+    _run.version = version
+    return state.frames[version].copy(deep=False)
+
+@st.fragment(run_every=REFRESH_INTERVAL_SECONDS)
+def _watch_dataset(version):
+    state = _live_dataset(DATA_PATH)
+    if state is not None:
+        state.refresh()
+        if state.version != version or state.replaced:
+            st.rerun()
+
+def follow_dataset_updates():
+    """
+    Memeriksa baris baru pada file data secara berkala dan menjalankan ulang
+    halaman jika dataset bertambah, sehingga halaman yang sedang dibuka ikut
+    menampilkan data terbaru.
+    """
+    state = _live_dataset(DATA_PATH)
+    if state is not None:
+        _watch_dataset(_current_version(state))
+
+def get_dataset_version():
+    """Penanda versi dataset bersama, untuk kunci cache turunan (gambar, dsb.)."""
+    state = _live_dataset(DATA_PATH)
+    return None if state is None else _current_version(state)
+
+def get_aggregates():
+    """
+    Mengembalikan kubus agregat (sentimen x topik x bucket skor kepercayaan)
+    untuk versi dataset yang sedang dipakai rerun ini. Kubus dibangun sekali
+    per proses dan diperbarui hanya dengan baris baru saat dataset bertambah.
+    """
+    state = _live_dataset(DATA_PATH)
+    return None if state is None else state.cubes[_current_version(state)]
+
+@st.cache_resource
+def _stemmer():
+    # Dipakai bersama oleh indeks setiap versi agar cache stem tidak hilang.
+    # Sastrawi baru diimpor saat pencarian pertama kali dipakai.
+    from pra_pemrosesan import buat_stemmer
+    return buat_stemmer()
+
+@st.cache_resource(max_entries=_LiveDataset.KEPT_VERSIONS)
+@ukur('bangun_indeks_cari')
+def _build_search_index(filepath, version):
+    df = _frame(filepath, version)
+    if df is None:
+        return None
+    # Stemmer Sastrawi hanya dipakai jika pencarian bentuk dasar kata diminta
+    return IndeksTeks(df['ulasan_lengkap'], fungsi_stem=_stemmer().stem)
+
+def get_search_index():
+    """Mengembalikan indeks terbalik kolom 'ulasan_lengkap' untuk dataset bersama."""
+    state = _live_dataset(DATA_PATH)
+    return None if state is None else _build_search_index(DATA_PATH, _current_version(state))
+
+@st.cache_data(max_entries=32)
+@ukur('render_wordcloud')
+def get_wordcloud_png(topic, dataset_version, width=800, height=400):
     """
-    if 'reviews_data' not in st.session_state:
-        st.session_state.reviews_data = load_data('hasil_terstruktur_diperbaiki.csv')
-    return st.session_state.reviews_data
+    PNG word cloud untuk sebuah topik pada versi dataset `dataset_version`.
+    Di-cache per (topik, versi dataset, ukuran) dengan batas 32 gambar; gambar
+    yang paling lama tidak dipakai dibuang lebih dulu. Mengembalikan None jika
+    topik tidak memiliki kata kunci.
+    """
+    state = _live_dataset(DATA_PATH)
+    frequencies = None if state is None else state.topic_frequency_table(dataset_version).get(topic)
+    if not frequencies:
+        return None
+    return render_wordcloud_png(frequencies, width, height)
+
+FACET_COLUMNS = ['sentimen', 'deskripsi_topik']
+
+@st.cache_resource(max_entries=_LiveDataset.KEPT_VERSIONS)
+def _build_facet_index(filepath, version):
+    df = _frame(filepath, version)
+    return None if df is None else IndeksFaset(df, FACET_COLUMNS)
+
+def get_facet_index():
+    """Mengembalikan indeks faset (bitmap per nilai sentimen/topik) untuk dataset bersama."""
+    state = _live_dataset(DATA_PATH)
+    return None if state is None else _build_facet_index(DATA_PATH, _current_version(state))
+
+@st.cache_resource(max_entries=_LiveDataset.KEPT_VERSIONS)
+@ukur('ringkasan_skor')
+def _build_score_summary(filepath, version):
+    df = _frame(filepath, version)
+    if df is None or 'confidence_score' not in df.columns:
+        return None
+    return RingkasanSkor.dari_dataframe(df)
+
+def get_score_summary():
+    """
+    Mengembalikan histogram dan kuantil skor kepercayaan per sentimen untuk
+    dataset bersama (dihitung sekali per versi dataset); None jika kolom
+    'confidence_score' tidak tersedia.
+    """
+    state = _live_dataset(DATA_PATH)
+    return None if state is None else _build_score_summary(DATA_PATH, _current_version(state))
+
+@st.cache_resource(max_entries=16)
+def _build_sort_rank(filepath, column, version):
+    df = _frame(filepath, version)
+    values = df[column]
+    order = np.argsort(values.cat.codes.to_numpy() if isinstance(values.dtype, pd.CategoricalDtype)
+                       else values.to_numpy(), kind='stable')
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank
+
+def sort_rows(rows, column, ascending=True):
+    """
+    Mengurutkan posisi baris `rows` berdasarkan `column` dataset bersama.
+    Peringkat setiap kolom dihitung sekali, sehingga pengurutan hanya
+    melibatkan baris yang terpilih.
+    """
+    version = _current_version(_live_dataset(DATA_PATH))
+    rank = _build_sort_rank(DATA_PATH, column, version)[rows]
+    order = np.argsort(rank if ascending else -rank, kind='stable')
+    return rows[order]
+
+@st.cache_resource(max_entries=_LiveDataset.KEPT_VERSIONS)
+def _dataset_memory_bytes(filepath, version):
+    df = _frame(filepath, version)
+    return 0 if df is None else int(df.memory_usage(deep=True).sum())
+
+def _object_memory_bytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    return sys.getsizeof(obj)
+
+def memory_usage_report(*extra_objects):
+    """
+    Ringkasan pemakaian memori: dataset bersama (sekali per proses) dan
+    objek milik sesi ini (isi st.session_state ditambah objek tambahan).
+    """
+    session_bytes = sum(_object_memory_bytes(v) for v in st.session_state.to_dict().values())
+    session_bytes += sum(_object_memory_bytes(obj) for obj in extra_objects)
+    state = _live_dataset(DATA_PATH)
+    shared_bytes = 0 if state is None else _dataset_memory_bytes(DATA_PATH, _current_version(state))
+    return {'shared_bytes': shared_bytes, 'session_bytes': session_bytes}
+
+def show_memory_usage(*extra_objects):
+    """Menampilkan ringkasan pemakaian memori di sidebar."""
+    report = memory_usage_report(*extra_objects)
+    st.sidebar.caption(
+        f"Memori dataset bersama: {report['shared_bytes'] / 1e6:.1f} MB (sekali per proses) · "
+        f"memori sesi ini: {report['session_bytes'] / 1e3:.1f} KB"
+    )
+
+def show_diagnostics():
+    """
+    Tampilan diagnostik tersembunyi (About.py?diagnostik=1): latensi per tahap,
+    jumlah pemanggilan, hit rate cache, dan RSS proses dari modul instrumentasi.
+    """
+    st.title("Diagnostik")
+    enabled = st.toggle("Instrumentasi aktif", value=instrumentasi.aktif(),
+                        help="Berlaku untuk seluruh proses Streamlit, termasuk sesi pengguna lain.")
+    if enabled != instrumentasi.aktif():
+        instrumentasi.aktifkan(enabled)
+
+    data = instrumentasi.ringkasan()
+    col1, col2 = st.columns(2)
+    col1.metric("RSS proses", f"{data['rss_byte'] / 1e6:.0f} MB" if data['rss_byte'] else "-")
+    col2.metric("RSS puncak", f"{data['rss_puncak_byte'] / 1e6:.0f} MB" if data['rss_puncak_byte'] else "-")
+
+    st.subheader("Latensi per tahap")
+    if data['tahap']:
+        rows = [{'tahap': name, 'jumlah': stage['jumlah'],
+                 **{f"{key} (ms)": stage[f"{key}_detik"] * 1000
+                    for key in ('rata_rata', 'p50', 'p90', 'p99', 'maks')},
+                 'total (detik)': stage['total_detik']}
+                for name, stage in data['tahap'].items()]
+        st.dataframe(pd.DataFrame(rows).sort_values('total (detik)', ascending=False), hide_index=True)
+    else:
+        st.info("Belum ada pengukuran. Aktifkan instrumentasi lalu buka halaman lain atau jalankan demo.")
+
+    st.subheader("Cache")
+    if data['cache']:
+        st.dataframe(pd.DataFrame.from_dict(data['cache'], orient='index'))
+    else:
+        st.caption("Belum ada cache yang terdaftar di proses ini.")
+
+    col1, col2, col3 = st.columns(3)
+    col1.download_button("Unduh JSON", json.dumps(data, indent=2), file_name="diagnostik.json",
+                         mime="application/json")
+    col2.download_button("Unduh Prometheus", instrumentasi.format_prometheus(data), file_name="diagnostik.prom",
+                         mime="text/plain")
+    if col3.button("Reset histogram"):
+        instrumentasi.reset()
+        st.rerun()
+
+# Dengan PREWARM_MODEL=1, model demo mulai dimuat di latar belakang begitu
+# sesi pertama dibuka, bukan saat halaman demo pertama kali dikunjungi.
+PREWARM_MODELS = os.environ.get('PREWARM_MODEL', '').lower() in ('1', 'true', 'ya')
+
+@st.cache_resource
+def get_model_loader():
+    """
+    Pemuat model latar belakang bersama milik proses. Pemuatan dimulai saat
+    fungsi ini pertama kali dipanggil dan tidak pernah memblokir halaman.
+    """
+    from pemuat_model import PemuatModel
+    return PemuatModel().mulai()
+
+def prewarm_models():
+    """Memulai pemuatan model di latar belakang jika PREWARM_MODEL diaktifkan."""
+    if PREWARM_MODELS:
+        get_model_loader()
 
 def get_sentiment_badge(sentiment):
     """Mengembalikan warna badge untuk sentimen."""
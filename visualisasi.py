@@ -0,0 +1,72 @@
+# visualisasi.py
+"""
+Fungsi bantu visualisasi dashboard yang tidak bergantung pada Streamlit.
+
+Word cloud dibuat dari tabel frekuensi kata per topik yang dihitung sekali
+per versi dataset, lalu dirender langsung menjadi PNG (tanpa figure
+matplotlib) agar bisa di-cache dan dikirim apa adanya ke halaman.
+Distribusi skor kepercayaan digambar dari histogram dan kuantil yang sudah
+dihitung di server (agregat.RingkasanSkor), bukan dari baris mentah.
+"""
+
+import io
+from collections import Counter
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from wordcloud import WordCloud
+
+def frekuensi_kata_per_topik(df, kolom_topik='deskripsi_topik', kolom_teks='Topik_Gabungan', awal=None):
+    """
+    Tabel frekuensi kata untuk setiap topik: {topik: {kata: jumlah}}.
+    Setiap teks unik hanya diproses sekali (dengan aturan tokenisasi dan
+    stopword WordCloud) lalu dikalikan dengan jumlah kemunculannya.
+    Jika `awal` diberikan, frekuensi dari `df` ditambahkan ke tabel tersebut
+    (tabel `awal` sendiri tidak diubah).
+    """
+    pemroses = WordCloud(collocations=False)
+    pasangan = df.groupby([kolom_topik, kolom_teks], observed=True, sort=False).size()
+
+    frekuensi = {topik: Counter(kata) for topik, kata in (awal or {}).items()}
+    for (topik, teks), jumlah in pasangan.items():
+        kata_topik = frekuensi.setdefault(topik, Counter())
+        for kata, n in pemroses.process_text(str(teks)).items():
+            kata_topik[kata] += n * int(jumlah)
+    return {topik: dict(kata) for topik, kata in frekuensi.items()}
+
+def render_wordcloud_png(frekuensi, width=800, height=400):
+    """Merender word cloud dari tabel frekuensi menjadi bytes PNG."""
+    wordcloud = WordCloud(width=width, height=height, background_color='white', colormap='viridis',
+                          collocations=False).generate_from_frequencies(frekuensi)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG', optimize=True)
+    return buffer.getvalue()
+
+def figur_distribusi_skor(ringkasan, warna=None, judul=None):
+    """
+    Histogram bertumpuk skor kepercayaan per sentimen dengan box plot di atasnya,
+    setara px.histogram(..., color='sentimen', marginal='box'), dari RingkasanSkor.
+    Whisker box plot menjangkau nilai minimum dan maksimum.
+    """
+    warna = warna or {}
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.25, 0.75], vertical_spacing=0.03)
+    tengah = (ringkasan.batas_bin[:-1] + ringkasan.batas_bin[1:]) / 2
+    lebar = np.diff(ringkasan.batas_bin)
+    for sentimen, jumlah, (minimum, q1, median, q3, maksimum) in zip(ringkasan.sentimen, ringkasan.jumlah,
+                                                                      ringkasan.kuantil):
+        if np.isnan(median):
+            continue
+        fig.add_trace(go.Box(name=str(sentimen), y=[str(sentimen)], q1=[q1], median=[median], q3=[q3],
+                             lowerfence=[minimum], upperfence=[maksimum], orientation='h',
+                             marker_color=warna.get(sentimen), legendgroup=str(sentimen), showlegend=False),
+                      row=1, col=1)
+        fig.add_trace(go.Bar(name=str(sentimen), x=tengah, y=jumlah, width=lebar, marker_color=warna.get(sentimen),
+                             legendgroup=str(sentimen), customdata=np.c_[ringkasan.batas_bin[:-1], ringkasan.batas_bin[1:]],
+                             hovertemplate="%{customdata[0]:.2f}–%{customdata[1]:.2f}: %{y}<extra>%{fullData.name}</extra>"),
+                      row=2, col=1)
+    fig.update_layout(title=judul, barmode='relative', bargap=0, legend_title_text='sentimen')
+    fig.update_xaxes(title_text='confidence_score', row=2, col=1)
+    fig.update_yaxes(title_text='count', row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    return fig